@@ -35,6 +35,8 @@ from shared.saq import suggestions as suggestions_worker
 from shared.saq import user_notifications as suggestions_user_notifications_worker
 from shared.saq import error_propagation as error_propagation_worker
 from shared.saq import aggregate_command_invokes as aggregate_command_invokes_worker
+from shared.utils import caching, http
+from shared.utils.ntfy import NTFY_NOTIFIER
 from web.admin_portal import configure_piccolo_admin
 from web.constants import IS_PRODUCTION
 from web.controllers import (
@@ -86,6 +88,28 @@ async def configure_rest_client_close():
         await constants.DISCORD_REST_CLIENT.close()
 
 
+async def start_cache_invalidation_listener():
+    if "PYTEST_CURRENT_TEST" not in os.environ:
+        caching.start_invalidation_listener()
+
+
+async def stop_cache_invalidation_listener():
+    if "PYTEST_CURRENT_TEST" not in os.environ:
+        await caching.stop_invalidation_listener()
+
+
+async def start_ntfy_notifier():
+    NTFY_NOTIFIER.start()
+
+
+async def stop_ntfy_notifier():
+    await NTFY_NOTIFIER.stop()
+
+
+async def close_shared_http_clients():
+    await http.close_http_clients()
+
+
 async def open_database_connection_pool():
     try:
         engine = engine_finder()
@@ -188,6 +212,8 @@ saq = SAQPlugin(
                     suggestions_worker.queue_suggestion_edit,
                     suggestions_worker.edit_suggestion_message,
                     suggestions_worker.populate_sid_autocomplete,
+                    suggestions_worker.sync_autocomplete_changes,
+                    suggestions_worker.repair_suggestion_vote_counts,
                     suggestions_worker.test_message_send,
                     suggestions_user_notifications_worker.suggestion_resolved_notifications,
                     suggestions_user_notifications_worker.notify_users_of_new_suggestion,
@@ -224,9 +250,21 @@ saq = SAQPlugin(
                     #     timeout=saq_worker.SAQ_TIMEOUT,
                     #     retries=1,
                     # ),
+                    CronJob(
+                        suggestions_worker.sync_autocomplete_changes,
+                        cron="* * * * *",  # Every minute
+                        timeout=saq_worker.SAQ_TIMEOUT,
+                        retries=1,
+                    ),
                     CronJob(
                         suggestions_worker.populate_sid_autocomplete,
-                        cron="0 */2 * * *",  # Every second hour
+                        cron="0 4 * * 0",  # Weekly consistency check
+                        timeout=saq_worker.SAQ_TIMEOUT,
+                        retries=1,
+                    ),
+                    CronJob(
+                        suggestions_worker.repair_suggestion_vote_counts,
+                        cron="30 3 * * *",  # Once per day, outside peak hours
                         timeout=saq_worker.SAQ_TIMEOUT,
                         retries=1,
                     ),
@@ -350,8 +388,19 @@ app = Litestar(
     static_files_config=[
         StaticFilesConfig(directories=["web/static"], path="/static/"),
     ],
-    on_startup=[open_database_connection_pool, configure_rest_client_start],
-    on_shutdown=[close_database_connection_pool, configure_rest_client_close],
+    on_startup=[
+        open_database_connection_pool,
+        configure_rest_client_start,
+        start_cache_invalidation_listener,
+        start_ntfy_notifier,
+    ],
+    on_shutdown=[
+        close_database_connection_pool,
+        configure_rest_client_close,
+        stop_cache_invalidation_listener,
+        stop_ntfy_notifier,
+        close_shared_http_clients,
+    ],
     debug=not IS_PRODUCTION,
     openapi_config=OpenAPIConfig(
         title=constants.SITE_NAME.rstrip() + " API",
@@ -0,0 +1,190 @@
+"""Compare custom id routing against the previous chains of startswith checks.
+
+The corpus mirrors the custom ids the bot currently emits, weighted
+towards vote buttons as they make up the vast majority of clicks.
+
+Every user interacting with a message clicks the same custom ids, so
+suggestion ids are drawn from a pool of active suggestions. Link and
+paginator ids are unique per custom id, which understates how often
+the same config menu or paginator button is clicked again.
+
+The router is measured from an empty resolve cache and after it has
+already resolved a different corpus clicking on the same suggestions,
+as it runs in the bot.
+
+    uv run python -m benchmarks.custom_id_router
+"""
+
+import random
+import timeit
+
+from bot.bot import COMPONENT_ROUTER
+from shared.tables import SuggestionsVoteTypeEnum
+
+CORPUS_SIZE = 10_000
+ITERATIONS = 20
+ACTIVE_SUGGESTIONS = 500
+
+WEIGHTED_FORMATS = [
+    ("v4_suggestions_up_vote:{sid}", 40),
+    ("v4_suggestions_down_vote:{sid}", 25),
+    ("suggestion_up_vote:{sid}", 5),
+    ("suggestion_down_vote|{sid}", 3),
+    ("SuggestionUpVote\t|{sid}", 2),
+    ("gcm:{link}:suggestions_channel_id", 4),
+    ("ucm:{link}:primary_language", 2),
+    ("v4_suggest_button", 8),
+    ("v4_queue:next:{pid}::{link}", 5),
+    ("v4_queue:approve:{pid}:{sid}:{link}", 3),
+    ("v4_queued_suggestion:approve:{sid}", 2),
+    ("queue_approve\u200b", 1),
+]
+
+
+def build_corpus(seed: int) -> list[str]:
+    sids_rng = random.Random(0)
+    sids = [
+        f"{sids_rng.randrange(16**5):05x}-{sids_rng.randrange(16**5):05x}"
+        for _ in range(ACTIVE_SUGGESTIONS)
+    ]
+    rng = random.Random(seed)
+    formats, weights = zip(*WEIGHTED_FORMATS, strict=True)
+    return [
+        template.format(
+            sid=rng.choice(sids),
+            link=f"{rng.getrandbits(64):016x}",
+            pid=f"{rng.getrandbits(32):08x}",
+        )
+        for template in rng.choices(formats, weights=weights, k=CORPUS_SIZE)
+    ]
+
+
+def previous_dispatch(custom_id: str) -> tuple[str, tuple]:  # noqa: C901, PLR0912
+    """The two startswith chains the router replaced.
+
+    The first derived the span name and values, the second picked
+    the handler to call with them.
+    """
+    if custom_id.startswith("gcm"):
+        _, link_id, setting = custom_id.split(":", maxsplit=2)
+        component_key = f"editing guild setting '{setting}'"
+
+    elif custom_id.startswith("ucm"):
+        _, link_id, setting = custom_id.split(":", maxsplit=2)
+        component_key = f"editing user setting '{setting}'"
+
+    elif custom_id.startswith("v4_suggest_button"):
+        component_key = "creating suggestion from button"
+
+    elif custom_id.startswith(("queue_approve", "queue_reject")):
+        if not custom_id.endswith("e") or not custom_id.endswith("t"):
+            custom_id = custom_id[:-1]
+
+        component_key = custom_id.replace("_", " ")
+        queued_suggestion_id = None
+        to_approve = custom_id.startswith("queue_approve")
+
+    elif custom_id.startswith("v4_queued_suggestion"):
+        _, approve, queued_suggestion_id = custom_id.split(":", maxsplit=2)
+        to_approve = approve == "approve"
+        component_key = f"queue {approve}"
+
+    elif custom_id.startswith("v4_queue:"):
+        _, action, pid, queued_suggestion_id, link_id = custom_id.split(":", maxsplit=4)
+        queued_suggestion_id = queued_suggestion_id or None
+        component_key = f"queue paginator {action}"
+
+    elif custom_id.startswith(("suggestion_up_vote", "suggestion_down_vote")):
+        sep = ":" if ":" in custom_id else "|"
+        custom_id, suggestion_id = custom_id.split(sep, maxsplit=2)
+        if not custom_id.endswith("e"):
+            custom_id = custom_id[:-1]
+
+        vote_enum = (
+            SuggestionsVoteTypeEnum.UpVote
+            if custom_id == "suggestion_up_vote"
+            else SuggestionsVoteTypeEnum.DownVote
+        )
+        component_key = f"suggestion {vote_enum.value}"
+
+    elif custom_id.startswith(("SuggestionUpVote", "SuggestionDownVote")):
+        custom_id, suggestion_id = custom_id.split("|", maxsplit=2)
+        if not custom_id.endswith("e"):
+            custom_id = custom_id[:-1]
+
+        vote_enum = (
+            SuggestionsVoteTypeEnum.UpVote
+            if custom_id in ("SuggestionsUpVote", "SuggestionUpVote")
+            else SuggestionsVoteTypeEnum.DownVote
+        )
+        component_key = f"suggestion {vote_enum.value}"
+
+    elif custom_id.startswith(("v4_suggestions_up_vote", "v4_suggestions_down_vote")):
+        custom_id, suggestion_id = custom_id.split(":", maxsplit=2)
+        vote_enum = (
+            SuggestionsVoteTypeEnum.UpVote
+            if custom_id == "v4_suggestions_up_vote"
+            else SuggestionsVoteTypeEnum.DownVote
+        )
+        component_key = f"suggestion {vote_enum.value}"
+
+    else:
+        component_key = f"component {custom_id}"
+
+    if custom_id.startswith("gcm"):
+        _, link_id, setting = custom_id.split(":", maxsplit=2)
+        return "guild config menu", (setting, link_id)
+
+    if custom_id.startswith("ucm"):
+        _, link_id, setting = custom_id.split(":", maxsplit=2)
+        return "user config menu", (setting, link_id)
+
+    if custom_id.startswith("v4_suggest_button"):
+        return "suggest button", ()
+
+    if custom_id.startswith("v4_queue:"):
+        return "queue paginator", (pid, action, queued_suggestion_id)
+
+    if component_key in ("queue approve", "queue reject"):
+        return "queue decision", (queued_suggestion_id, to_approve)
+
+    if component_key in ("suggestion UpVote", "suggestion DownVote"):
+        return "vote", (suggestion_id, vote_enum)
+
+    return "unknown", (component_key,)
+
+
+def main():
+    corpus = build_corpus(1)
+    earlier_clicks = build_corpus(2)
+
+    def warm_cache() -> None:
+        COMPONENT_ROUTER._cached_resolve.cache_clear()
+        for entry in earlier_clicks:
+            COMPONENT_ROUTER.resolve(entry)
+
+    unrouted = [entry for entry in corpus if COMPONENT_ROUTER.resolve(entry) is None]
+    assert not unrouted, f"Corpus contains unrouted custom ids: {unrouted[:5]}"
+
+    for name, function, setup in (
+        ("previous startswith chains", previous_dispatch, "pass"),
+        (
+            "router resolve, empty cache",
+            COMPONENT_ROUTER.resolve,
+            COMPONENT_ROUTER._cached_resolve.cache_clear,
+        ),
+        ("router resolve, warm cache", COMPONENT_ROUTER.resolve, warm_cache),
+    ):
+        best = min(
+            timeit.repeat(
+                lambda function=function: [function(entry) for entry in corpus],
+                setup=setup,
+                number=1,
+                repeat=ITERATIONS,
+            )
+        )
+        print(f"{name}: {best / CORPUS_SIZE * 1_000_000_000:.0f}ns per custom id")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Compare suggestion rendering with precompiled and per call localisation.
+
+The previous implementation is kept here as LegacyLocalisation, it looked
+up the fallback on every miss, built a fresh Template for every string and
+expanded the entire guild config whether or not the string used it.
+
+Suggestions are built in memory and their authors avatars pre-resolved,
+so only rendering is measured and no database or network is needed.
+
+    uv run python -m benchmarks.localisation
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from string import Template
+
+import hikari
+
+from bot.constants import LOCALISATIONS
+from bot.exceptions import MissingTranslation
+from bot.localisation import Localisation
+from bot.utils import users
+from shared.tables import GuildConfigs, Suggestions, SuggestionStateEnum, UserConfigs
+from shared.tables.mixins.audit import utc_now
+
+RENDERS = 2_000
+ITERATIONS = 5
+LOCALES = (hikari.Locale.EN_GB, hikari.Locale.FR, hikari.Locale.DE)
+
+
+class LegacyLocalisation(Localisation):
+    def get_locale(self, key: str, locale: hikari.Locale) -> str:
+        try:
+            return self.lightbulb_provider.localizations[locale][key]
+        except KeyError as e:
+            fallback_value = self.lightbulb_provider.localizations[
+                hikari.Locale.EN_GB
+            ].get(key, None)
+            if fallback_value is None:
+                raise MissingTranslation(key) from e
+
+            return fallback_value
+
+    def get_localized_string(
+        self,
+        key: str,
+        locale: hikari.Locale | str,
+        *,
+        extras: dict | None = None,
+        guild_config: GuildConfigs | None = None,
+    ) -> str:
+        if not isinstance(locale, hikari.Locale):
+            locale = hikari.Locale(locale)
+
+        base_config = {}
+        if extras is not None:
+            base_config = {**base_config, **extras}
+
+        if guild_config is not None:
+            guild_data = {}
+            for k, v in guild_config.to_dict().items():
+                guild_data[f"GUILD_CONFIG_{k.upper()}"] = v
+
+            base_config = {**base_config, **guild_data}
+
+        return Template(self.get_locale(key, locale)).safe_substitute(base_config)
+
+
+def build_suggestions(guild_config: GuildConfigs) -> list[Suggestions]:
+    suggestions = []
+    for index, state in enumerate(
+        (SuggestionStateEnum.PENDING, SuggestionStateEnum.APPROVED)
+    ):
+        suggestion = Suggestions(
+            sID=f"abcde-{index:05d}",
+            suggestion="Add a channel for sharing pictures of pets " * 4,
+            guild_configuration=guild_config,
+            user_configuration=UserConfigs(user_id=1000 + index),
+            state_raw=state.value,
+            author_display_name="Anonymous",
+            moderator_note="Looks good to me",
+            moderator_note_added_by_display_text="<@1>",
+        )
+        if state is not SuggestionStateEnum.PENDING:
+            suggestion.resolved_note = "Added in #pets"
+            suggestion.resolved_by_display_text = "<@1>"
+            suggestion.resolved_at = utc_now()
+
+        # Skip avatar lookups, they aren't what is being measured
+        users._RESOLVED_AVATARS.set(suggestion.author_id, None)
+        suggestions.append(suggestion)
+
+    return suggestions
+
+
+async def render_all(
+    suggestions: list[Suggestions],
+    localisations: Localisation,
+    guild_config: GuildConfigs,
+) -> None:
+    for index in range(RENDERS):
+        suggestion = suggestions[index % len(suggestions)]
+        await suggestion.as_components(
+            rest=None,  # ty:ignore[invalid-argument-type]
+            locale=LOCALES[index % len(LOCALES)],
+            localisations=localisations,
+            guild_config=guild_config,
+            as_resolved=suggestion.state is not SuggestionStateEnum.PENDING,
+        )
+
+
+async def main():
+    guild_config = GuildConfigs(guild_id=1)
+    suggestions = build_suggestions(guild_config)
+    legacy = LegacyLocalisation(base_path=Path("bot"))
+    for name, localisations in (("per call", legacy), ("precompiled", LOCALISATIONS)):
+        best = float("inf")
+        for _ in range(ITERATIONS):
+            started_at = time.perf_counter()
+            await render_all(suggestions, localisations, guild_config)
+            best = min(best, time.perf_counter() - started_at)
+
+        print(f"{name}: {best / RENDERS * 1_000_000:.1f}us per as_components call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
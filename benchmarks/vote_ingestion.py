@@ -0,0 +1,183 @@
+"""Compare direct vote writes against batched vote ingestion.
+
+Simulates a burst of concurrent votes on a single suggestion and reports
+acknowledgement latency alongside the database statements issued per vote.
+
+Run against a disposable database as it creates its own rows:
+    PICCOLO_CONF=piccolo_conf_test uv run python -m benchmarks.vote_ingestion
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from humanize import intcomma
+from piccolo.engine import engine_finder
+
+from bot.menus.suggestion_menu import SuggestionMenu
+from bot.utils.vote_ingestion import VoteIngestionBuffer
+from shared.tables import (
+    Suggestions,
+    SuggestionStateEnum,
+    SuggestionsVoteTypeEnum,
+    SuggestionVotes,
+)
+from shared.utils import configs
+
+TOTAL_VOTES = 5_000
+UNIQUE_VOTERS = 1_500
+CONCURRENCY = 50
+
+
+class StatementCounter:
+    """Counts statements and transactions issued through the engine."""
+
+    def __init__(self, engine) -> None:
+        self.statements: int = 0
+        self.transactions: int = 0
+        # Engines use slots, so the methods are wrapped on the class
+        engine_class = type(engine)
+        original_run_querystring = engine_class.run_querystring
+        original_transaction = engine_class.transaction
+
+        async def run_querystring(engine, *args, **kwargs):
+            self.statements += 1
+            return await original_run_querystring(engine, *args, **kwargs)
+
+        def transaction(engine, *args, **kwargs):
+            self.transactions += 1
+            return original_transaction(engine, *args, **kwargs)
+
+        engine_class.run_querystring = run_querystring
+        engine_class.transaction = transaction
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.transactions = 0
+
+    @property
+    def round_trips(self) -> int:
+        # BEGIN and COMMIT are a round trip each
+        return self.statements + self.transactions * 2
+
+
+async def create_suggestion() -> Suggestions:
+    guild_config = await configs.ensure_guild_config(1)
+    user_config = await configs.ensure_user_config(1)
+    suggestion = Suggestions(
+        suggestion="Benchmark",
+        guild_configuration=guild_config,
+        user_configuration=user_config,
+        state_raw=SuggestionStateEnum.PENDING.value,
+        author_display_name="Benchmark",
+    )
+    await suggestion.save()
+    return suggestion
+
+
+def generate_votes(seed: int) -> list[tuple[int, SuggestionsVoteTypeEnum]]:
+    rng = random.Random(seed)
+    return [
+        (
+            rng.randrange(UNIQUE_VOTERS),
+            rng.choice(
+                [SuggestionsVoteTypeEnum.UpVote, SuggestionsVoteTypeEnum.DownVote]
+            ),
+        )
+        for _ in range(TOTAL_VOTES)
+    ]
+
+
+async def run_votes(votes, cast_vote) -> list[float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def timed(user_id: int, vote: SuggestionsVoteTypeEnum) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await cast_vote(user_id, vote)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed(user_id, vote) for user_id, vote in votes))
+    return latencies
+
+
+def report(name: str, latencies: list[float], counter: StatementCounter, total: float):
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name}\n"
+        f"\tp50 {quantiles[49] * 1000:.2f}ms, p99 {quantiles[98] * 1000:.2f}ms\n"
+        f"\t{counter.statements / len(latencies):.3f} statements per vote, "
+        f"{counter.round_trips / len(latencies):.3f} round trips per vote\n"
+        f"\t{total:.2f}s total including the final flush"
+    )
+
+
+async def verify_counters(suggestion: Suggestions) -> None:
+    expected_up = await SuggestionVotes.count().where(
+        (SuggestionVotes.suggestion == suggestion.id)
+        & (SuggestionVotes.vote_type == SuggestionsVoteTypeEnum.UpVote)
+    )
+    expected_down = await SuggestionVotes.count().where(
+        (SuggestionVotes.suggestion == suggestion.id)
+        & (SuggestionVotes.vote_type == SuggestionsVoteTypeEnum.DownVote)
+    )
+    row = await Suggestions.objects().get(Suggestions.id == suggestion.id)
+    assert (row.up_votes, row.down_votes) == (expected_up, expected_down), (
+        f"Counters drifted: {(row.up_votes, row.down_votes)} "
+        f"!= {(expected_up, expected_down)}"
+    )
+
+
+async def main():
+    engine = engine_finder()
+    await engine.start_connection_pool(max_size=CONCURRENCY)
+    counter = StatementCounter(engine)
+    print(
+        f"{intcomma(TOTAL_VOTES)} votes from {intcomma(UNIQUE_VOTERS)} voters, "
+        f"{CONCURRENCY} at a time"
+    )
+
+    suggestion = await create_suggestion()
+
+    async def cast_direct(user_id: int, vote: SuggestionsVoteTypeEnum) -> None:
+        await SuggestionMenu.store_vote(
+            suggestion, vote, user_id=user_id, voter_display_name="Benchmark"
+        )
+
+    counter.reset()
+    start = time.perf_counter()
+    latencies = await run_votes(generate_votes(1), cast_direct)
+    report("Direct", latencies, counter, time.perf_counter() - start)
+    await verify_counters(suggestion)
+
+    suggestion = await create_suggestion()
+    buffer = VoteIngestionBuffer(
+        flush_interval=timedelta(milliseconds=250),
+        max_buffered_votes=500,
+        max_pending_votes=5_000,
+    )
+
+    async def cast_buffered(user_id: int, vote: SuggestionsVoteTypeEnum) -> None:
+        await buffer.add(
+            suggestion_id=suggestion.id,
+            user_id=user_id,
+            vote=vote,
+            voter_display_name="Benchmark",
+        )
+
+    counter.reset()
+    start = time.perf_counter()
+    buffer.start()
+    latencies = await run_votes(generate_votes(1), cast_buffered)
+    await buffer.stop()
+    report("Batched", latencies, counter, time.perf_counter() - start)
+    await verify_counters(suggestion)
+
+    await engine.close_connection_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
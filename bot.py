@@ -21,10 +21,14 @@ from bot.constants import (
     BLOCKLIST_GROUP,
     TOTAL_SHARDS,
     SHARDS_PER_CLUSTER,
+    BATCHED_VOTE_INGESTION,
 )
 from bot.extensions.resolve import ResolveMessageCommand
+from bot.utils.command_invoke_writer import COMMAND_INVOKE_WRITER
+from bot.utils.vote_ingestion import VOTE_BUFFER
 from shared.tables import GuildConfigs
-from shared.utils.ntfy import notify_ethan_of_something
+from shared.utils import caching, http
+from shared.utils.ntfy import NTFY_NOTIFIER, notify_ethan_of_something
 from web import constants as t_constants
 
 load_dotenv()
@@ -91,6 +95,11 @@ async def main():
             "bot.extensions.setup",
             "bot.tasks.store_guilds_in_redis",
         )
+        caching.start_invalidation_listener()
+        COMMAND_INVOKE_WRITER.start()
+        NTFY_NOTIFIER.start()
+        if BATCHED_VOTE_INGESTION:
+            VOTE_BUFFER.start()
 
         if IS_PRODUCTION:
             await notify_ethan_of_something(
@@ -101,6 +110,15 @@ async def main():
 
         await client.start()
 
+    @bot.listen(hikari.StoppingEvent)
+    async def on_stopping(_: hikari.StoppingEvent) -> None:
+        # Don't lose votes which have been acknowledged but not written
+        await VOTE_BUFFER.stop()
+        await COMMAND_INVOKE_WRITER.stop()
+        await caching.stop_invalidation_listener()
+        await NTFY_NOTIFIER.stop()
+        await http.close_http_clients()
+
     if IS_PRODUCTION:
         offset = CLUSTER_ID - 1
         shard_ids = [
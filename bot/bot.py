@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from typing import cast, Literal, TYPE_CHECKING
 
 import commons
@@ -20,11 +21,13 @@ from bot.menus import (
     GuildPremiumMenu,
 )
 from bot.tables import InternalErrors
+from bot.utils import CustomIdRouter, ParsedCustomId
 from shared.tables import (
     GuildConfigs,
     UserConfigs,
     Suggestions,
     SuggestionStateEnum,
+    SuggestionsVoteTypeEnum,
     QueuedSuggestions,
 )
 from shared.utils import configs
@@ -49,6 +52,395 @@ async def create_user_config(ctx: lightbulb.Context) -> UserConfigs:
     return await configs.ensure_user_config(ctx.user.id, locale=ctx.interaction.locale)
 
 
+type ComponentHandler = Callable[
+    [
+        ParsedCustomId,
+        lightbulb.components.MenuContext,
+        hikari.ComponentInteractionCreateEvent,
+    ],
+    Awaitable[None],
+]
+type ModalHandler = Callable[
+    [
+        ParsedCustomId,
+        lightbulb.components.MenuContext,
+        hikari.ModalInteractionCreateEvent,
+        GuildConfigs,
+        UserConfigs,
+    ],
+    Awaitable[None],
+]
+
+
+def _config_menu_parser(kind: str) -> Callable[[str], ParsedCustomId]:
+    def parser(remainder: str) -> ParsedCustomId:
+        link_id, setting = remainder.split(":", maxsplit=1)
+        return ParsedCustomId(
+            f"editing {kind} setting '{setting}'",
+            link_id,
+            {"setting": setting},
+        )
+
+    return parser
+
+
+def _queue_decision_parser(
+    *, to_approve: bool, has_id: bool
+) -> Callable[[str], ParsedCustomId]:
+    def parser(remainder: str) -> ParsedCustomId:
+        return ParsedCustomId(
+            "queue approve" if to_approve else "queue reject",
+            None,
+            {
+                # Legacy physical queue buttons may have a trailing character
+                "queued_suggestion_id": remainder if has_id else None,
+                "to_approve": to_approve,
+            },
+        )
+
+    return parser
+
+
+def _parse_queue_paginator(remainder: str) -> ParsedCustomId:
+    action, pid, queued_suggestion_id, link_id = remainder.split(":", maxsplit=3)
+    return ParsedCustomId(
+        f"queue paginator {action}",
+        link_id,
+        {
+            "action": action,
+            "paginator_id": pid,
+            "queued_suggestion_id": queued_suggestion_id or None,
+        },
+    )
+
+
+def _vote_parser(vote: SuggestionsVoteTypeEnum) -> Callable[[str], ParsedCustomId]:
+    component_key = f"suggestion {vote.value}"
+
+    def parser(remainder: str) -> ParsedCustomId:
+        # Legacy buttons used either separator and may have a
+        # trailing character before it, "SuggestionUpVote\t|1234abcd"
+        sep = ":" if ":" in remainder else "|"
+        _, suggestion_id = remainder.split(sep, maxsplit=1)
+        return ParsedCustomId(
+            component_key, None, {"suggestion_id": suggestion_id, "vote": vote}
+        )
+
+    return parser
+
+
+def _parse_link_and_suggestion_id(component_key: str) -> Callable[[str], ParsedCustomId]:
+    def parser(remainder: str) -> ParsedCustomId:
+        link_id, suggestion_id = remainder.split(":", maxsplit=1)
+        return ParsedCustomId(component_key, link_id, {"suggestion_id": suggestion_id})
+
+    return parser
+
+
+def _parse_guild_premium_modal(remainder: str) -> ParsedCustomId:
+    link_id, modal_type = remainder.split(":", maxsplit=1)
+    return ParsedCustomId(
+        f"guild premium {modal_type.replace('_', ' ')} modal",
+        link_id,
+        {"modal_type": modal_type},
+    )
+
+
+async def _handle_guild_config_menu(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ComponentInteractionCreateEvent,
+) -> None:
+    await GuildConfigurationMenus.handle_interaction(
+        parsed.values["setting"],
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+        event=event,
+        link_id=cast("str", parsed.link_id),
+    )
+
+
+async def _handle_user_config_menu(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ComponentInteractionCreateEvent,
+) -> None:
+    await UserConfigurationMenus.handle_interaction(
+        parsed.values["setting"],
+        ctx=ctx,
+        event=event,
+        link_id=cast("str", parsed.link_id),
+    )
+
+
+async def _handle_suggest_button(
+    _: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    __: hikari.ComponentInteractionCreateEvent,
+) -> None:
+    await SuggestionMenu.handle_embedded_button(
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+    )
+
+
+async def _handle_queue_paginator(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ComponentInteractionCreateEvent,
+) -> None:
+    await SuggestionsQueueViewerMenu.handle_paginator_interaction(
+        queue_id=parsed.values["paginator_id"],
+        action=cast(
+            "Literal['back', 'next', 'stop', 'approve', 'reject']",
+            parsed.values["action"],
+        ),
+        queued_suggestion_id=parsed.values["queued_suggestion_id"],
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+        event=event,
+    )
+
+
+async def _handle_queue_decision(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ComponentInteractionCreateEvent,
+) -> None:
+    await SuggestionsQueueMenu.handle_physical_interaction(
+        parsed.values["queued_suggestion_id"],
+        parsed.values["to_approve"],
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+        event=event,
+    )
+
+
+async def _handle_vote(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    _: hikari.ComponentInteractionCreateEvent,
+) -> None:
+    await SuggestionMenu.handle_vote(
+        parsed.values["suggestion_id"],
+        parsed.values["vote"],
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+    )
+
+
+async def _handle_suggest_modal(
+    _: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ModalInteractionCreateEvent,
+    guild_config: GuildConfigs,
+    user_config: UserConfigs,
+) -> None:
+    await SuggestionMenu.handle_interaction(
+        event.interaction.components,
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+        event=event,
+        guild_config=guild_config,
+        user_config=user_config,
+    )
+
+
+async def _handle_guild_premium_modal(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ModalInteractionCreateEvent,
+    guild_config: GuildConfigs,
+    user_config: UserConfigs,
+) -> None:
+    await GuildPremiumMenu.handle_modal_interaction(
+        parsed.values["modal_type"],
+        ctx=ctx,
+        localisations=constants.LOCALISATIONS,
+        event=event,
+        guild_config=guild_config,
+        user_config=user_config,
+    )
+
+
+async def _handle_queue_resolve_modal(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ModalInteractionCreateEvent,
+    guild_config: GuildConfigs,
+    _: UserConfigs,
+) -> None:
+    resolution_state_raw: str
+    response: str | None = None
+    anonymously: bool = False
+    thread_name = None
+    for entry in event.interaction.components:
+        if entry.component.custom_id == "state":
+            entry.component = cast(
+                "TextSelectMenuInteractionComponent",
+                entry.component,
+            )
+            resolution_state_raw: str = entry.component.values[0]
+
+        elif entry.component.custom_id == "response":
+            entry.component = cast(
+                "TextInputInteractionComponent",
+                entry.component,
+            )
+            response = entry.component.value
+
+        elif entry.component.custom_id == "thread_name":
+            entry.component = cast(
+                "TextInputInteractionComponent",
+                entry.component,
+            )
+            if entry.component.value:
+                thread_name = entry.component.value
+
+        elif entry.component.custom_id == "anonymously":
+            entry.component = cast(
+                "TextSelectMenuInteractionComponent",
+                entry.component,
+            )
+            if entry.component.values:
+                # anon by default unless you provide the value
+                anonymously = commons.value_to_bool(entry.component.values[0])
+
+    await SuggestionsQueueMenu.handle_modal_interaction(
+        queued_suggestion_id=parsed.values["suggestion_id"],
+        to_approve=resolution_state_raw == "approve",
+        anonymously=anonymously,
+        ctx=ctx,
+        guild_config=guild_config,
+        localisations=LOCALISATIONS,
+        event=event,
+        reason=response,
+        thread_name=thread_name,
+    )
+
+
+async def _handle_resolve_modal(
+    parsed: ParsedCustomId,
+    ctx: lightbulb.components.MenuContext,
+    event: hikari.ModalInteractionCreateEvent,
+    guild_config: GuildConfigs,
+    user_config: UserConfigs,
+) -> None:
+    suggestion: Suggestions | None = await Suggestions.fetch_suggestion(
+        parsed.values["suggestion_id"],
+        guild_config.guild_id,  # noqa
+    )
+    resolution_state_raw: str
+    response: str | None = None
+    anonymously: bool = False
+    for entry in event.interaction.components:
+        if entry.component.custom_id == "resolution_state_raw":
+            entry.component = cast(
+                "FileUploadInteractionComponent",
+                entry.component,
+            )
+            resolution_state_raw: str = entry.component.values[0]
+        elif entry.component.custom_id == "response":
+            entry.component = cast(
+                "TextInputInteractionComponent",
+                entry.component,
+            )
+            response = entry.component.value
+
+        elif entry.component.custom_id == "anonymously":
+            entry.component = cast(
+                "FileUploadInteractionComponent",
+                entry.component,
+            )
+            if entry.component.values:
+                # anon by default unless you provide the value
+                anonymously = commons.value_to_bool(entry.component.values[0])
+
+    # We know by here this is always true
+    suggestion: Suggestions = cast("Suggestions", suggestion)
+    await resolve_suggestion(
+        suggestion,
+        response,
+        anonymously,
+        SuggestionStateEnum(resolution_state_raw),
+        ctx,
+        guild_config,
+        user_config,
+        LOCALISATIONS,
+    )
+
+
+COMPONENT_ROUTER: CustomIdRouter[ComponentHandler] = CustomIdRouter()
+COMPONENT_ROUTER.register(
+    "gcm:", _handle_guild_config_menu, parser=_config_menu_parser("guild")
+)
+COMPONENT_ROUTER.register(
+    "ucm:", _handle_user_config_menu, parser=_config_menu_parser("user")
+)
+COMPONENT_ROUTER.register(
+    "v4_suggest_button",
+    _handle_suggest_button,
+    parser=lambda _: ParsedCustomId("creating suggestion from button"),
+)
+COMPONENT_ROUTER.register(
+    "v4_queue:", _handle_queue_paginator, parser=_parse_queue_paginator
+)
+COMPONENT_ROUTER.register(
+    "v4_queued_suggestion:approve:",
+    _handle_queue_decision,
+    parser=_queue_decision_parser(to_approve=True, has_id=True),
+)
+COMPONENT_ROUTER.register(
+    "v4_queued_suggestion:reject:",
+    _handle_queue_decision,
+    parser=_queue_decision_parser(to_approve=False, has_id=True),
+)
+COMPONENT_ROUTER.register(
+    "queue_approve",
+    _handle_queue_decision,
+    parser=_queue_decision_parser(to_approve=True, has_id=False),
+)
+COMPONENT_ROUTER.register(
+    "queue_reject",
+    _handle_queue_decision,
+    parser=_queue_decision_parser(to_approve=False, has_id=False),
+)
+COMPONENT_ROUTER.register(
+    "v4_suggestions_up_vote",
+    _handle_vote,
+    parser=_vote_parser(SuggestionsVoteTypeEnum.UpVote),
+    aliases=("suggestion_up_vote", "SuggestionUpVote"),
+)
+COMPONENT_ROUTER.register(
+    "v4_suggestions_down_vote",
+    _handle_vote,
+    parser=_vote_parser(SuggestionsVoteTypeEnum.DownVote),
+    aliases=("suggestion_down_vote", "SuggestionDownVote"),
+)
+
+MODAL_ROUTER: CustomIdRouter[ModalHandler] = CustomIdRouter()
+MODAL_ROUTER.register(
+    "suggest_modal:",
+    _handle_suggest_modal,
+    parser=lambda link_id: ParsedCustomId("suggestion modal", link_id),
+)
+MODAL_ROUTER.register(
+    "guild_premium_modal:",
+    _handle_guild_premium_modal,
+    parser=_parse_guild_premium_modal,
+)
+MODAL_ROUTER.register(
+    "resolve_modal:",
+    _handle_resolve_modal,
+    parser=_parse_link_and_suggestion_id("resolve modal"),
+)
+MODAL_ROUTER.register(
+    "queue_resolve_modal:",
+    _handle_queue_resolve_modal,
+    parser=_parse_link_and_suggestion_id("queue resolve modal"),
+)
+
+
 async def create_bot(  # noqa: PLR0915, C901
     token: str,
     *,
@@ -130,30 +522,13 @@ async def create_bot(  # noqa: PLR0915, C901
         otel_ctx = None
         component_key = f"{custom_id} modal"
         try:
-            if custom_id.startswith("suggest_modal"):
-                component_key = "suggestion modal"
-                link_id = custom_id.split(":", maxsplit=1)[1]
-                if link_id is not None and link_id:
-                    otel_ctx = await utils.otel.get_context_from_link_state(link_id)
-
-            elif custom_id.startswith("guild_premium_modal"):
-                _, link_id, modal_type = custom_id.split(":", maxsplit=2)
-                modal_type = modal_type.replace("_", " ")
-                component_key = f"guild premium {modal_type} modal"
-                if link_id is not None and link_id:
-                    otel_ctx = await utils.otel.get_context_from_link_state(link_id)
-
-            elif custom_id.startswith("resolve_modal"):
-                component_key = "resolve modal"
-                _, link_id, suggestion_id = custom_id.split(":", maxsplit=2)
-                if link_id is not None and link_id:
-                    otel_ctx = await utils.otel.get_context_from_link_state(link_id)
-
-            elif custom_id.startswith("queue_resolve_modal"):
-                component_key = "queue resolve modal"
-                _, link_id, suggestion_id = custom_id.split(":", maxsplit=2)
-                if link_id is not None and link_id:
-                    otel_ctx = await utils.otel.get_context_from_link_state(link_id)
+            routed = MODAL_ROUTER.resolve(custom_id)
+            if routed is not None:
+                component_key = routed[1].component_key
+                if routed[1].link_id:
+                    otel_ctx = await utils.otel.get_context_from_link_state(
+                        routed[1].link_id
+                    )
 
             with OTEL_TRACER.start_as_current_span(component_key, otel_ctx) as span:
                 span.set_attribute("interaction.user.id", ctx.user.id)
@@ -169,123 +544,9 @@ async def create_bot(  # noqa: PLR0915, C901
                     cast("int", ctx.guild_id)
                 )
                 user_config = await configs.ensure_user_config(ctx.user.id)
-                if custom_id.startswith("suggest_modal"):
-                    await SuggestionMenu.handle_interaction(
-                        event.interaction.components,
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                        event=event,
-                        guild_config=guild_config,
-                        user_config=user_config,
-                    )
-
-                elif custom_id.startswith("guild_premium_modal"):
-                    _, link_id, modal_type = custom_id.split(":", maxsplit=2)
-                    await GuildPremiumMenu.handle_modal_interaction(
-                        modal_type,
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                        event=event,
-                        guild_config=guild_config,
-                        user_config=user_config,
-                    )
-
-                elif custom_id.startswith("queue_resolve_modal"):
-                    resolution_state_raw: str
-                    response: str | None = None
-                    anonymously: bool = False
-                    thread_name = None
-                    for entry in event.interaction.components:
-                        if entry.component.custom_id == "state":
-                            entry.component = cast(
-                                "TextSelectMenuInteractionComponent",
-                                entry.component,
-                            )
-                            resolution_state_raw: str = entry.component.values[0]
-
-                        elif entry.component.custom_id == "response":
-                            entry.component = cast(
-                                "TextInputInteractionComponent",
-                                entry.component,
-                            )
-                            response = entry.component.value
-
-                        elif entry.component.custom_id == "thread_name":
-                            entry.component = cast(
-                                "TextInputInteractionComponent",
-                                entry.component,
-                            )
-                            if entry.component.value:
-                                thread_name = entry.component.value
-
-                        elif entry.component.custom_id == "anonymously":
-                            entry.component = cast(
-                                "TextSelectMenuInteractionComponent",
-                                entry.component,
-                            )
-                            if entry.component.values:
-                                # anon by default unless you provide the value
-                                anonymously = commons.value_to_bool(
-                                    entry.component.values[0]
-                                )
-
-                    await SuggestionsQueueMenu.handle_modal_interaction(
-                        queued_suggestion_id=suggestion_id,
-                        to_approve=resolution_state_raw == "approve",
-                        anonymously=anonymously,
-                        ctx=ctx,
-                        guild_config=guild_config,
-                        localisations=LOCALISATIONS,
-                        event=event,
-                        reason=response,
-                        thread_name=thread_name,
-                    )
-
-                elif custom_id.startswith("resolve_modal"):
-                    suggestion: Suggestions | None = await Suggestions.fetch_suggestion(
-                        suggestion_id,
-                        guild_config.guild_id,  # noqa
-                    )
-                    resolution_state_raw: str
-                    response: str | None = None
-                    anonymously: bool = False
-                    for entry in event.interaction.components:
-                        if entry.component.custom_id == "resolution_state_raw":
-                            entry.component = cast(
-                                "FileUploadInteractionComponent",
-                                entry.component,
-                            )
-                            resolution_state_raw: str = entry.component.values[0]
-                        elif entry.component.custom_id == "response":
-                            entry.component = cast(
-                                "TextInputInteractionComponent",
-                                entry.component,
-                            )
-                            response = entry.component.value
-
-                        elif entry.component.custom_id == "anonymously":
-                            entry.component = cast(
-                                "FileUploadInteractionComponent",
-                                entry.component,
-                            )
-                            if entry.component.values:
-                                # anon by default unless you provide the value
-                                anonymously = commons.value_to_bool(
-                                    entry.component.values[0]
-                                )
-
-                    # We know by here this is always true
-                    suggestion: Suggestions = cast("Suggestions", suggestion)
-                    await resolve_suggestion(
-                        suggestion,
-                        response,
-                        anonymously,
-                        SuggestionStateEnum(resolution_state_raw),
-                        ctx,
-                        guild_config,
-                        user_config,
-                        LOCALISATIONS,
-                    )
+                if routed is not None:
+                    route, parsed = routed
+                    await route.handler(parsed, ctx, event, guild_config, user_config)
 
                 else:
                     internal_error: InternalErrors = await InternalErrors.persist_error(
@@ -341,96 +602,21 @@ async def create_bot(  # noqa: PLR0915, C901
         )
 
     @bot.listen(hikari.ComponentInteractionCreateEvent)
-    async def on_component_interaction(  # noqa: PLR0915, PLR0912, C901
+    async def on_component_interaction(
         event: hikari.ComponentInteractionCreateEvent,
     ) -> None:
-        from shared.tables import SuggestionsVoteTypeEnum
-
         custom_id: str = event.interaction.custom_id
         component_key = f"component {custom_id}"
         ctx = build_ctx(event.interaction)
         try:
             otel_ctx = None
-            if custom_id.startswith("gcm"):
-                _, link_id, setting = custom_id.split(":", maxsplit=2)
-                component_key = f"editing guild setting '{setting}'"
-                otel_ctx = await utils.otel.get_context_from_link_state(link_id)
-
-            elif custom_id.startswith("ucm"):
-                _, link_id, setting = custom_id.split(":", maxsplit=2)
-                component_key = f"editing user setting '{setting}'"
-                otel_ctx = await utils.otel.get_context_from_link_state(link_id)
-
-            elif custom_id.startswith("v4_suggest_button"):
-                component_key = "creating suggestion from button"
-
-            elif custom_id.startswith(("queue_approve", "queue_reject")):
-                # Legacy physical queue
-                if not custom_id.endswith("e") or not custom_id.endswith("t"):
-                    custom_id = custom_id[:-1]
-
-                component_key = custom_id.replace("_", " ")
-                queued_suggestion_id = None
-                to_approve = custom_id.startswith("queue_approve")
-
-            elif custom_id.startswith("v4_queued_suggestion"):
-                _, approve, queued_suggestion_id = custom_id.split(":", maxsplit=2)
-                to_approve = approve == "approve"
-                component_key = f"queue {approve}"
-
-            elif custom_id.startswith("v4_queue:"):
-                _, action, pid, queued_suggestion_id, link_id = custom_id.split(
-                    ":",
-                    maxsplit=4,
-                )
-                queued_suggestion_id = queued_suggestion_id or None
-                otel_ctx = await utils.otel.get_context_from_link_state(link_id)
-                component_key = f"queue paginator {action}"
-
-            elif custom_id.startswith(("suggestion_up_vote", "suggestion_down_vote")):
-                # Legacy button type one
-                sep = ":" if ":" in custom_id else "|"
-                custom_id, suggestion_id = custom_id.split(sep, maxsplit=2)
-                if not custom_id.endswith("e"):
-                    custom_id = custom_id[:-1]
-
-                vote_enum = (
-                    SuggestionsVoteTypeEnum.UpVote
-                    if custom_id == "suggestion_up_vote"
-                    else SuggestionsVoteTypeEnum.DownVote
-                )
-                component_key = f"suggestion {vote_enum.value}"
-
-            elif custom_id.startswith(
-                (
-                    "SuggestionUpVote",
-                    "SuggestionDownVote",
-                )
-            ):
-                # Other legacy button type
-                # "SuggestionUpVote	|1234abcd" (non ascii, not a space)
-                custom_id, suggestion_id = custom_id.split("|", maxsplit=2)
-
-                if not custom_id.endswith("e"):
-                    custom_id = custom_id[:-1]
-
-                vote_enum = (
-                    SuggestionsVoteTypeEnum.UpVote
-                    if custom_id in ("SuggestionsUpVote", "SuggestionUpVote")
-                    else SuggestionsVoteTypeEnum.DownVote
-                )
-                component_key = f"suggestion {vote_enum.value}"
-
-            elif custom_id.startswith(
-                ("v4_suggestions_up_vote", "v4_suggestions_down_vote")
-            ):
-                custom_id, suggestion_id = custom_id.split(":", maxsplit=2)
-                vote_enum = (
-                    SuggestionsVoteTypeEnum.UpVote
-                    if custom_id == "v4_suggestions_up_vote"
-                    else SuggestionsVoteTypeEnum.DownVote
-                )
-                component_key = f"suggestion {vote_enum.value}"
+            routed = COMPONENT_ROUTER.resolve(custom_id)
+            if routed is not None:
+                component_key = routed[1].component_key
+                if routed[1].link_id:
+                    otel_ctx = await utils.otel.get_context_from_link_state(
+                        routed[1].link_id
+                    )
 
             with OTEL_TRACER.start_as_current_span(component_key, otel_ctx) as span:
                 span.set_attribute("interaction.user.id", ctx.user.id)
@@ -441,60 +627,9 @@ async def create_bot(  # noqa: PLR0915, C901
                 if ctx.guild_id:
                     span.set_attribute("interaction.guild.id", ctx.guild_id)
 
-                if custom_id.startswith("gcm"):
-                    _, link_id, setting = custom_id.split(":", maxsplit=2)
-                    await GuildConfigurationMenus.handle_interaction(
-                        setting,
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                        event=event,
-                        link_id=link_id,
-                    )
-
-                elif custom_id.startswith("ucm"):
-                    _, link_id, setting = custom_id.split(":", maxsplit=2)
-                    await UserConfigurationMenus.handle_interaction(
-                        setting,
-                        ctx=ctx,
-                        event=event,
-                        link_id=link_id,
-                    )
-
-                elif custom_id.startswith("v4_suggest_button"):
-                    await SuggestionMenu.handle_embedded_button(
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                    )
-
-                elif custom_id.startswith("v4_queue:"):
-                    await SuggestionsQueueViewerMenu.handle_paginator_interaction(
-                        queue_id=pid,
-                        action=cast(
-                            "Literal['back', 'next', 'stop', 'approve', 'reject']",
-                            action,
-                        ),
-                        queued_suggestion_id=queued_suggestion_id,
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                        event=event,
-                    )
-
-                elif component_key in ("queue approve", "queue reject"):
-                    await SuggestionsQueueMenu.handle_physical_interaction(
-                        queued_suggestion_id,
-                        to_approve,
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                        event=event,
-                    )
-
-                elif component_key in ("suggestion UpVote", "suggestion DownVote"):
-                    await SuggestionMenu.handle_vote(
-                        suggestion_id,
-                        vote_enum,
-                        ctx=ctx,
-                        localisations=constants.LOCALISATIONS,
-                    )
+                if routed is not None:
+                    route, parsed = routed
+                    await route.handler(parsed, ctx, event)
 
                 else:
                     internal_error: InternalErrors = await InternalErrors.persist_error(
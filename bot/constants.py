@@ -7,12 +7,11 @@ import datetime
 from datetime import timedelta
 from enum import IntEnum
 from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from typing import cast
 
 import hikari
 import lightbulb
 from commons import value_to_bool
-from commons.caching import TimedCache
 from cooldowns import Cooldown
 from dotenv import load_dotenv
 from hikari import Color
@@ -20,9 +19,6 @@ from opentelemetry import trace
 
 from bot.localisation import Localisation
 
-if TYPE_CHECKING:
-    from bot.utils import QueuedSuggestionsPaginator, ViewVotersPaginator
-
 load_dotenv()
 
 VERSION = "4.3"
@@ -41,13 +37,8 @@ IS_MIGRATION_DATA_PRIOR_TO = arrow.get("2026-07-04 10:00:00.151313+00:00")
 LOCALISATIONS = Localisation(
     base_path=Path("bot"),
 )
-PAGINATOR_OBJECTS: TimedCache[str, QueuedSuggestionsPaginator | ViewVotersPaginator] = (
-    TimedCache(
-        global_ttl=timedelta(minutes=15),
-        lazy_eviction=False,
-        ttl_from_last_access=True,
-    )
-)
+PAGINATOR_TTL = timedelta(minutes=15)
+"""How long paginator state lives in Redis after it was last used."""
 CONFIGURE_GROUP = lightbulb.Group(
     name="commands.configure.name",
     description="commands.configure.description",
@@ -140,6 +131,11 @@ ENABLE_CUSTOM_NAME_AND_AVATARS: bool = commons.value_to_bool(
 )
 IS_CUSTOM_BOT: bool = commons.value_to_bool(os.environ.get("IS_CUSTOM_BOT", "0"))
 
+# Acknowledge votes from memory and write them to the DB in batches
+BATCHED_VOTE_INGESTION: bool = commons.value_to_bool(
+    os.environ.get("BATCHED_VOTE_INGESTION", "0")
+)
+
 
 class ErrorCode(IntEnum):
     SUGGESTION_MESSAGE_DELETED = 1
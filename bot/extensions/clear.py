@@ -120,8 +120,15 @@ class ClearCmd(
             suggestion.state = QueuedSuggestionStateEnum.CLEARED
 
         await suggestion.save()
-        await shared.utils.delete_autocomplete_cache_sid(
-            suggestion.sID, guild_config.guild_id
+        await shared.utils.apply_autocomplete_changes(
+            [
+                shared.utils.AutocompleteChange(
+                    guild_id=guild_config.guild_id,
+                    suggestion_id=suggestion.sID,
+                    indexes=shared.utils.ALL_AUTOCOMPLETE_INDEXES,
+                    present=False,
+                )
+            ]
         )
         await ctx.respond(
             localisations.get_localized_string(
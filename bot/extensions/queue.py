@@ -5,7 +5,7 @@ import hikari
 import lightbulb
 
 from bot import utils
-from bot.constants import QUEUE_GROUP, EMBED_COLOR, PAGINATOR_OBJECTS
+from bot.constants import QUEUE_GROUP, EMBED_COLOR
 from bot.hooks import early_ephemeral_defer
 from bot.localisation import Localisation
 from bot.tables import CommandInvokes, CommandTypes
@@ -121,12 +121,19 @@ class QueueViewCmd(
             action="/queue view",
             command_type=CommandTypes.SLASH_COMMAND,
         )
-        queued_suggestions_for_guild: list[QueuedSuggestions] = (
-            await QueuedSuggestions.fetch_guild_queued_suggestions(
-                guild_id=guild_config.guild_id,
-            )
+        pid = generate_id()
+        link_id = await utils.otel.generate_trace_link_state()
+        paginator = QueuedSuggestionsPaginator(
+            pid=pid,
+            state=QueuedSuggestionsPaginator.build_state(
+                ctx=ctx,
+                locale=user_config.primary_language,
+                link_id=link_id,
+            ),
+            rest=ctx.interaction.app.rest,
         )
-        if not queued_suggestions_for_guild:
+        components = await paginator.start()
+        if components is None:
             await ctx.respond(
                 localisations.get_localized_string(
                     "commands.queue.view.responses.empty",
@@ -135,18 +142,5 @@ class QueueViewCmd(
             )
             return
 
-        queued_suggestion_ids: list[str] = [qs.sID for qs in queued_suggestions_for_guild]
-        pid = generate_id()
-        link_id = await utils.otel.generate_trace_link_state()
-        paginator = QueuedSuggestionsPaginator(
-            data=queued_suggestion_ids,
-            ctx=ctx,
-            locale=user_config.primary_language,
-            pid=pid,
-            link_id=link_id,
-        )
-        PAGINATOR_OBJECTS.add_entry(pid, paginator)
-        await ctx.respond(
-            components=await paginator.format_page()  # ty:ignore[invalid-argument-type]
-        )
+        await ctx.respond(components=components)
         return
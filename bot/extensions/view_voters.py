@@ -1,7 +1,5 @@
 from typing import cast
-import io
 import logging
-from itertools import batched
 
 import hikari
 import lightbulb
@@ -10,9 +8,6 @@ import shared.utils
 from bot import utils
 from bot.constants import (
     VIEW_GROUP,
-    PAGINATOR_OBJECTS,
-    DEFAULT_UP_VOTE,
-    DEFAULT_DOWN_VOTE,
 )
 from bot.hooks import early_ephemeral_defer
 from bot.localisation import Localisation
@@ -22,7 +17,6 @@ from shared.tables import (
     GuildConfigs,
     UserConfigs,
     Suggestions,
-    SuggestionVotes,
     SuggestionsVoteTypeEnum,
 )
 
@@ -40,19 +34,30 @@ async def autocomplete_callback(ctx: lightbulb.AutocompleteContext[str]) -> None
     await ctx.respond(values_to_recommend)
 
 
-async def get_vote_data(
+async def view_voters_for_suggestion(
     *,
     suggestion: Suggestions,
     vote_type: SuggestionsVoteTypeEnum | None,
     ctx: lightbulb.Context,
     localisations: Localisation,
     user_config: UserConfigs,
-) -> list[str] | None:
-    votes = await SuggestionVotes.fetch_votes_for_suggestion(
-        suggestion,
-        vote_type=vote_type,
+) -> None:
+    pid = generate_id()
+    link_id = await utils.otel.generate_trace_link_state()
+    paginator = ViewVotersPaginator(
+        pid=pid,
+        state=ViewVotersPaginator.build_state(
+            ctx=ctx,
+            locale=user_config.primary_language,
+            link_id=link_id,
+            sid=suggestion.sID,
+            suggestion_id=suggestion.id,
+            vote_type=vote_type.value if vote_type is not None else None,
+        ),
+        rest=ctx.interaction.app.rest,
     )
-    if not votes:
+    components = await paginator.start()
+    if components is None:
         await ctx.respond(
             localisations.get_localized_string(
                 "commands.view.voters.responses.no_votes",
@@ -60,44 +65,9 @@ async def get_vote_data(
             ),
             ephemeral=True,
         )
-        return None
-
-    data = []
-    for group in batched(votes, 25):
-        text = io.StringIO()
-        for item in group:
-            emoji = (
-                DEFAULT_UP_VOTE
-                if item.vote_type_enum == SuggestionsVoteTypeEnum.UpVote
-                else DEFAULT_DOWN_VOTE
-            )
-            text.write(f"{emoji} {item.voter_display_name}\n")
+        return
 
-        data.append(text.getvalue())
-    return data
-
-
-async def view_voters_for_suggestion(
-    *,
-    suggestion: Suggestions,
-    data: list[str],
-    ctx: lightbulb.Context,
-    user_config: UserConfigs,
-) -> None:
-    pid = generate_id()
-    link_id = await utils.otel.generate_trace_link_state()
-    paginator = ViewVotersPaginator(
-        data=data,
-        ctx=ctx,
-        locale=user_config.primary_language,
-        pid=pid,
-        link_id=link_id,
-        sid=suggestion.sID,
-    )
-    PAGINATOR_OBJECTS.add_entry(pid, paginator)
-    await ctx.respond(
-        components=await paginator.format_page()  # ty:ignore[invalid-argument-type]
-    )
+    await ctx.respond(components=components)
 
 
 @VIEW_GROUP.register
@@ -179,20 +149,11 @@ class ViewVotersCmd(
             else None
         )
 
-        data = await get_vote_data(
-            suggestion=suggestion,
-            ctx=ctx,
-            user_config=user_config,
-            vote_type=vote_type,
-            localisations=localisations,
-        )
-        if data is None:
-            return
-
         await view_voters_for_suggestion(
             suggestion=suggestion,
-            data=data,
+            vote_type=vote_type,
             ctx=ctx,
+            localisations=localisations,
             user_config=user_config,
         )
         return
@@ -235,20 +196,11 @@ class ViewVoterMessageCommand(
             )
             return
 
-        data = await get_vote_data(
-            suggestion=suggestion,
-            ctx=ctx,
-            user_config=user_config,
-            vote_type=None,
-            localisations=localisations,
-        )
-        if data is None:
-            return
-
         await view_voters_for_suggestion(
             suggestion=suggestion,
-            data=data,
+            vote_type=None,
             ctx=ctx,
+            localisations=localisations,
             user_config=user_config,
         )
         return
@@ -291,20 +243,11 @@ class ViewUpVoterMessageCommand(
             )
             return
 
-        data = await get_vote_data(
-            suggestion=suggestion,
-            ctx=ctx,
-            user_config=user_config,
-            vote_type=SuggestionsVoteTypeEnum.UpVote,
-            localisations=localisations,
-        )
-        if data is None:
-            return
-
         await view_voters_for_suggestion(
             suggestion=suggestion,
-            data=data,
+            vote_type=SuggestionsVoteTypeEnum.UpVote,
             ctx=ctx,
+            localisations=localisations,
             user_config=user_config,
         )
         return
@@ -347,20 +290,11 @@ class ViewDownVoterMessageCommand(
             )
             return
 
-        data = await get_vote_data(
-            suggestion=suggestion,
-            ctx=ctx,
-            user_config=user_config,
-            vote_type=SuggestionsVoteTypeEnum.DownVote,
-            localisations=localisations,
-        )
-        if data is None:
-            return
-
         await view_voters_for_suggestion(
             suggestion=suggestion,
-            data=data,
+            vote_type=SuggestionsVoteTypeEnum.DownVote,
             ctx=ctx,
+            localisations=localisations,
             user_config=user_config,
         )
         return
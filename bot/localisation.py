@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import typing
+from dataclasses import dataclass
 from pathlib import Path
 from string import Template
 
@@ -15,6 +16,54 @@ if typing.TYPE_CHECKING:
     from shared.tables import GuildConfigs
 
 logger = logging.getLogger(__name__)
+GUILD_CONFIG_PREFIX = "GUILD_CONFIG_"
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledString:
+    """A translation parsed once so rendering it is a single substitution."""
+
+    content: str
+    template: Template
+    needs_substitution: bool
+    """False if the content can be returned as is."""
+    uses_guild_config: bool
+    """True if the content references any $GUILD_CONFIG_ values."""
+
+    @classmethod
+    def compile(cls, content: str) -> CompiledString:
+        template = Template(content)
+        return cls(
+            content=content,
+            template=template,
+            # $$ escapes still need substituting down to $
+            needs_substitution="$" in content,
+            uses_guild_config=any(
+                identifier.startswith(GUILD_CONFIG_PREFIX)
+                for identifier in template.get_identifiers()
+            ),
+        )
+
+    def render(
+        self,
+        *,
+        extras: dict | None = None,
+        guild_config: GuildConfigs | None = None,
+    ) -> str:
+        if not self.needs_substitution:
+            return self.content
+
+        values = {} if extras is None else extras
+        if guild_config is not None and self.uses_guild_config:
+            values = {**values, **guild_config_values(guild_config)}
+
+        return self.template.safe_substitute(values)
+
+
+def guild_config_values(guild_config: GuildConfigs) -> dict[str, typing.Any]:
+    return {
+        f"{GUILD_CONFIG_PREFIX}{k.upper()}": v for k, v in guild_config.to_dict().items()
+    }
 
 
 class Localisation:
@@ -35,19 +84,35 @@ class Localisation:
                 data[v] = as_dict
 
         self.lightbulb_provider = DictLocalizationProvider(data)
+        # Every locale holds every key, with anything missing
+        # already resolved to its EN_GB translation
+        compiled_base = {
+            key: CompiledString.compile(value)
+            for key, value in data[hikari.Locale.EN_GB].items()
+        }
+        self._compiled: dict[hikari.Locale, dict[str, CompiledString]] = {}
+        for locale, translations in data.items():
+            self._compiled[locale] = {
+                **compiled_base,
+                **{
+                    key: CompiledString.compile(value)
+                    for key, value in translations.items()
+                },
+            }
+
+    def get_compiled(self, key: str, locale: hikari.Locale) -> CompiledString:
+        translations = self._compiled.get(locale)
+        if translations is None:
+            translations = self._compiled[hikari.Locale.EN_GB]
 
-    def get_locale(self, key: str, locale: hikari.Locale) -> str:
         try:
-            return self.lightbulb_provider.localizations[locale][key]
+            return translations[key]
         except KeyError as e:
-            fallback_value = self.lightbulb_provider.localizations[
-                hikari.Locale.EN_GB
-            ].get(key, None)
-            if fallback_value is None:
-                logger.critical("Could not find base translation for %s", key)
-                raise MissingTranslation(key) from e
+            logger.critical("Could not find base translation for %s", key)
+            raise MissingTranslation(key) from e
 
-            return fallback_value
+    def get_locale(self, key: str, locale: hikari.Locale) -> str:
+        return self.get_compiled(key, locale).content
 
     @staticmethod
     def inject_locale_values(
@@ -61,11 +126,7 @@ class Localisation:
             base_config = {**base_config, **extras}
 
         if guild_config is not None:
-            guild_data = {}
-            for k, v in guild_config.to_dict().items():
-                guild_data[f"GUILD_CONFIG_{k.upper()}"] = v
-
-            base_config = {**base_config, **guild_data}
+            base_config = {**base_config, **guild_config_values(guild_config)}
 
         return Template(content).safe_substitute(base_config)
 
@@ -80,9 +141,7 @@ class Localisation:
         if not isinstance(locale, hikari.Locale):
             locale = hikari.Locale(locale)
 
-        content = self.get_locale(key, locale)
-        return self.inject_locale_values(
-            content,
-            guild_config=guild_config,
+        return self.get_compiled(key, locale).render(
             extras=extras,
+            guild_config=guild_config,
         )
@@ -28,6 +28,7 @@ from bot.tables import (
     CommandTypes,
 )
 from bot.utils import generate_id
+from bot.utils.vote_ingestion import VOTE_BUFFER, VoteOutcome
 from shared.utils import r2, configs
 
 if typing.TYPE_CHECKING:
@@ -106,7 +107,6 @@ class SuggestionMenu:
         from shared.tables import (
             Suggestions,
             SuggestionStateEnum,
-            SuggestionVotes,
             SuggestionsVoteTypeEnum,
         )
 
@@ -145,105 +145,81 @@ class SuggestionMenu:
             )
             return
 
-        async with SuggestionVotes._meta.db.transaction():
-            was_created = False
-            try_insert = (
-                await SuggestionVotes.insert(
-                    SuggestionVotes(
-                        suggestion=suggestion,
-                        vote_type=vote,
-                        user_id=ctx.user.id,
-                        voter_display_name_raw=utils.generate_author_text(
-                            ctx.user.display_name,
-                            ctx.user.id,
-                            # TODO Change later
-                            is_anonymous=False,
-                        ),
-                    ),
-                )
-                .on_conflict(
-                    action="DO NOTHING",
-                    target=(SuggestionVotes.user_id, SuggestionVotes.suggestion),
-                )
-                .returning(*SuggestionVotes.all_columns())
+        voter_display_name = utils.generate_author_text(
+            ctx.user.display_name,
+            ctx.user.id,
+            # TODO Change later
+            is_anonymous=False,
+        )
+        if constants.BATCHED_VOTE_INGESTION:
+            outcome = await VOTE_BUFFER.add(
+                suggestion_id=suggestion.id,
+                user_id=ctx.user.id,
+                vote=vote,
+                voter_display_name=voter_display_name,
+            )
+        else:
+            outcome = await cls.store_vote(
+                suggestion,
+                vote,
+                user_id=ctx.user.id,
+                voter_display_name=voter_display_name,
             )
-            if try_insert:
-                vote_obj: SuggestionVotes = SuggestionVotes(**try_insert[0])
-                vote_obj._exists_in_db = True
-                was_created = True
-
-            else:
-                vote_obj: SuggestionVotes = (
-                    await SuggestionVotes.objects()
-                    .first()
-                    .where(SuggestionVotes.suggestion == suggestion)
-                    .where(SuggestionVotes.user_id == ctx.user.id)
-                )
-
-                if vote_obj.voter_display_name_raw is None:
-                    vote_obj.voter_display_name_raw = utils.generate_author_text(
-                        ctx.user.display_name,
-                        ctx.user.id,
-                        # TODO Change later
-                        is_anonymous=False,
-                    )
-                    await vote_obj.save()
-
-            if not was_created and vote_obj.vote_type == vote.value:
-                # Trying to vote again for the same item
-                key = (
-                    "values.suggestion_up_vote_already_voted"
-                    if vote == SuggestionsVoteTypeEnum.UpVote
-                    else "values.suggestion_down_vote_already_voted"
-                )
-                await ctx.respond(
-                    localisations.get_localized_string(key, user_config.primary_language),
-                    ephemeral=True,
-                )
-                return
 
-            if was_created:
-                # New vote
-                key = (
-                    "values.suggestion_up_vote_registered_vote"
-                    if vote == SuggestionsVoteTypeEnum.UpVote
-                    else "values.suggestion_down_vote_registered_vote"
-                )
-                logger.debug(
-                    "Member voted on %s with %s",
-                    suggestion.sID,
-                    vote.value,
-                    extra={
-                        "interaction.user.id": ctx.user.id,
-                        "interaction.user.username": ctx.user.display_name,
-                        "interaction.guild.id": ctx.guild_id,
-                        "suggestion.id": suggestion.sID,
-                    },
-                )
+        if outcome is VoteOutcome.UNCHANGED:
+            # Trying to vote again for the same item
+            key = (
+                "values.suggestion_up_vote_already_voted"
+                if vote == SuggestionsVoteTypeEnum.UpVote
+                else "values.suggestion_down_vote_already_voted"
+            )
+            await ctx.respond(
+                localisations.get_localized_string(key, user_config.primary_language),
+                ephemeral=True,
+            )
+            return
 
-            else:
-                # Vote has changed
-                key = (
-                    "values.suggestion_down_vote_modified_vote"
-                    if vote == SuggestionsVoteTypeEnum.DownVote
-                    else "values.suggestion_up_vote_modified_vote"
-                )
-                logger.debug(
-                    "Member modified their vote on %s to a %s",
-                    suggestion.sID,
-                    vote.value,
-                    extra={
-                        "interaction.user.id": ctx.user.id,
-                        "interaction.user.username": ctx.user.display_name,
-                        "interaction.guild.id": ctx.guild_id,
-                        "suggestion.id": suggestion.sID,
-                    },
-                )
+        if outcome is VoteOutcome.CREATED:
+            # New vote
+            key = (
+                "values.suggestion_up_vote_registered_vote"
+                if vote == SuggestionsVoteTypeEnum.UpVote
+                else "values.suggestion_down_vote_registered_vote"
+            )
+            logger.debug(
+                "Member voted on %s with %s",
+                suggestion.sID,
+                vote.value,
+                extra={
+                    "interaction.user.id": ctx.user.id,
+                    "interaction.user.username": ctx.user.display_name,
+                    "interaction.guild.id": ctx.guild_id,
+                    "suggestion.id": suggestion.sID,
+                },
+            )
 
-            vote_obj.vote_type_enum = vote
-            await vote_obj.save()
+        else:
+            # Vote has changed
+            key = (
+                "values.suggestion_down_vote_modified_vote"
+                if vote == SuggestionsVoteTypeEnum.DownVote
+                else "values.suggestion_up_vote_modified_vote"
+            )
+            logger.debug(
+                "Member modified their vote on %s to a %s",
+                suggestion.sID,
+                vote.value,
+                extra={
+                    "interaction.user.id": ctx.user.id,
+                    "interaction.user.username": ctx.user.display_name,
+                    "interaction.guild.id": ctx.guild_id,
+                    "suggestion.id": suggestion.sID,
+                },
+            )
 
-        await suggestion.queue_message_edit()
+        if not constants.BATCHED_VOTE_INGESTION:
+            # Buffered votes queue their edit once they are written
+            await suggestion.queue_message_edit()
 
         content = io.StringIO()
         content.write(
@@ -286,6 +262,59 @@ class SuggestionMenu:
         await ctx.respond(content.getvalue(), ephemeral=True)
         return
 
+    @classmethod
+    async def store_vote(
+        cls,
+        suggestion: Suggestions,
+        vote: SuggestionsVoteTypeEnum,
+        *,
+        user_id: int,
+        voter_display_name: str,
+    ) -> VoteOutcome:
+        """Write a single vote and its counter change in one transaction."""
+        from shared.tables import SuggestionVotes
+
+        async with SuggestionVotes._meta.db.transaction():
+            try_insert = (
+                await SuggestionVotes.insert(
+                    SuggestionVotes(
+                        suggestion=suggestion,
+                        vote_type=vote,
+                        user_id=user_id,
+                        voter_display_name_raw=voter_display_name,
+                    ),
+                )
+                .on_conflict(
+                    action="DO NOTHING",
+                    target=(SuggestionVotes.user_id, SuggestionVotes.suggestion),
+                )
+                .returning(*SuggestionVotes.all_columns())
+            )
+            if try_insert:
+                await suggestion.record_vote_change(added=vote)
+                return VoteOutcome.CREATED
+
+            vote_obj: SuggestionVotes = (
+                await SuggestionVotes.objects()
+                .first()
+                .where(SuggestionVotes.suggestion == suggestion)
+                .where(SuggestionVotes.user_id == user_id)
+                # Concurrent changes must not both adjust the counters
+                .lock_rows()
+            )
+            if vote_obj.voter_display_name_raw is None:
+                vote_obj.voter_display_name_raw = voter_display_name
+                await vote_obj.save()
+
+            if vote_obj.vote_type == vote.value:
+                return VoteOutcome.UNCHANGED
+
+            previous_vote = vote_obj.vote_type_enum
+            vote_obj.vote_type_enum = vote
+            await vote_obj.save()
+            await suggestion.record_vote_change(added=vote, removed=previous_vote)
+            return VoteOutcome.CHANGED
+
     @classmethod
     async def handle_interaction(  # noqa: PLR0912, C901
         cls,
@@ -591,15 +620,17 @@ class SuggestionMenu:
         s.channel_id = message.channel_id
         s.message_id = message.id
         await s.save()
-        await shared.utils.cache_sid_in_autocomplete(
-            guild_id=cast("int", ctx.guild_id),
-            suggestion_id=s.sID,
-            index="shared_sid_autocomplete_index",
-        )
-        await shared.utils.cache_sid_in_autocomplete(
-            guild_id=cast("int", ctx.guild_id),
-            suggestion_id=s.sID,
-            index="suggestion_sid_autocomplete_index",
+        await shared.utils.apply_autocomplete_changes(
+            [
+                shared.utils.AutocompleteChange(
+                    guild_id=cast("int", ctx.guild_id),
+                    suggestion_id=s.sID,
+                    indexes=(
+                        "shared_sid_autocomplete_index",
+                        "suggestion_sid_autocomplete_index",
+                    ),
+                )
+            ]
         )
 
         if guild_config.threads_for_suggestions:
@@ -788,15 +819,17 @@ class SuggestionMenu:
             qs.message_id = message.id
 
         await qs.save()
-        await shared.utils.cache_sid_in_autocomplete(
-            guild_id=cast("int", ctx.guild_id),
-            suggestion_id=qs.sID,
-            index="shared_sid_autocomplete_index",
-        )
-        await shared.utils.cache_sid_in_autocomplete(
-            guild_id=cast("int", ctx.guild_id),
-            suggestion_id=qs.sID,
-            index="queue_sid_autocomplete_index",
+        await shared.utils.apply_autocomplete_changes(
+            [
+                shared.utils.AutocompleteChange(
+                    guild_id=cast("int", ctx.guild_id),
+                    suggestion_id=qs.sID,
+                    indexes=(
+                        "shared_sid_autocomplete_index",
+                        "queue_sid_autocomplete_index",
+                    ),
+                )
+            ]
         )
 
         logger.debug(
@@ -206,6 +206,16 @@ class SuggestionsQueueMenu:
             )
             return
 
+        if queued_suggestion.state != QueuedSuggestionStateEnum.PENDING:
+            # Such as from a paginator page rendered before it was resolved
+            await ctx.respond(
+                localisations.get_localized_string(
+                    "menus.queue_paginator.responses.already_resolved",
+                    user_config.primary_language,
+                ),
+            )
+            return
+
         components = await cls.build_queue_modal(
             guild_config=guild_config,
             localisations=localisations,
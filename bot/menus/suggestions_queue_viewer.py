@@ -2,12 +2,11 @@ from typing import Literal, TYPE_CHECKING, cast
 
 import hikari
 import lightbulb
-from commons.caching import NonExistentEntry
 
 from bot import utils
-from bot.constants import PAGINATOR_OBJECTS
 from bot.localisation import Localisation
 from bot.menus import SuggestionsQueueMenu
+from bot.utils.paginator_state import load_paginator_state
 from shared.utils import configs
 
 if TYPE_CHECKING:
@@ -17,6 +16,22 @@ if TYPE_CHECKING:
 
 
 class SuggestionsQueueViewerMenu:
+    @classmethod
+    async def load_paginator(
+        cls, pid: str, *, rest: hikari.api.RESTClient
+    ) -> utils.QueuedSuggestionsPaginator | utils.ViewVotersPaginator | None:
+        """Rebuild a paginator from its stored state, if it has not expired."""
+        state = await load_paginator_state(pid)
+        if state is None:
+            return None
+
+        paginator_cls = (
+            utils.QueuedSuggestionsPaginator
+            if state.kind == "queue"
+            else utils.ViewVotersPaginator
+        )
+        return paginator_cls(pid=pid, state=state, rest=rest)
+
     @classmethod
     async def handle_paginator_interaction(
         cls,
@@ -32,9 +47,8 @@ class SuggestionsQueueViewerMenu:
             user_id=event.interaction.user.id,
             locale=event.interaction.locale,
         )
-        try:
-            paginator = PAGINATOR_OBJECTS.get_entry(queue_id)
-        except NonExistentEntry:
+        paginator = await cls.load_paginator(queue_id, rest=event.interaction.app.rest)
+        if paginator is None:
             await ctx.respond(
                 localisations.get_localized_string(
                     "menus.queue_paginator.responses.expired",
@@ -47,8 +61,7 @@ class SuggestionsQueueViewerMenu:
             await ctx.defer(ephemeral=True)
 
         if action == "back":
-            paginator.current_page -= 1
-            await paginator.update_message_with_current_page()
+            await paginator.previous_page()
             await ctx.respond(
                 localisations.get_localized_string(
                     "menus.queue_paginator.responses.back",
@@ -58,8 +71,7 @@ class SuggestionsQueueViewerMenu:
             return
 
         if action == "next":
-            paginator.current_page += 1
-            await paginator.update_message_with_current_page()
+            await paginator.next_page()
             await ctx.respond(
                 localisations.get_localized_string(
                     "menus.queue_paginator.responses.next",
@@ -69,7 +81,6 @@ class SuggestionsQueueViewerMenu:
             return
 
         if action == "stop":
-            PAGINATOR_OBJECTS.delete_entry(queue_id)
             await paginator.stop_paginating()
             await ctx.respond(
                 localisations.get_localized_string(
@@ -80,7 +91,10 @@ class SuggestionsQueueViewerMenu:
             return
 
         if action == "approve":
-            if queued_suggestion_id not in paginator.pages:
+            if (
+                not isinstance(paginator, utils.QueuedSuggestionsPaginator)
+                or queued_suggestion_id != paginator.current_sid
+            ):
                 await ctx.respond(
                     localisations.get_localized_string(
                         "menus.queue_paginator.responses.already_resolved",
@@ -100,7 +114,10 @@ class SuggestionsQueueViewerMenu:
             return
 
         if action == "reject":
-            if queued_suggestion_id not in paginator.pages:
+            if (
+                not isinstance(paginator, utils.QueuedSuggestionsPaginator)
+                or queued_suggestion_id != paginator.current_sid
+            ):
                 await ctx.respond(
                     localisations.get_localized_string(
                         "menus.queue_paginator.responses.already_resolved",
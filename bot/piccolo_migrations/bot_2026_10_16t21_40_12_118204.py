@@ -0,0 +1,109 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.columns.column_types import Date
+from piccolo.columns.column_types import Integer
+from piccolo.columns.column_types import Text
+from piccolo.columns.defaults.date import DateNow
+from piccolo.columns.indexes import IndexMethod
+
+from bot.tables.command_invoke_daily_rollup import RollupDimension
+
+ID = "2026-10-16T21:40:12:118204"
+VERSION = "1.36.0"
+DESCRIPTION = ""
+
+
+async def forwards():
+    manager = MigrationManager(migration_id=ID, app_name="bot", description=DESCRIPTION)
+
+    manager.add_table(
+        class_name="CommandInvokeDailyRollups",
+        tablename="command_invoke_daily_rollups",
+        schema=None,
+        columns=None,
+    )
+
+    manager.add_column(
+        table_class_name="CommandInvokeDailyRollups",
+        tablename="command_invoke_daily_rollups",
+        column_name="day",
+        db_column_name="day",
+        column_class_name="Date",
+        column_class=Date,
+        params={
+            "default": DateNow(),
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": True,
+            "index_method": IndexMethod.btree,
+            "choices": None,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    manager.add_column(
+        table_class_name="CommandInvokeDailyRollups",
+        tablename="command_invoke_daily_rollups",
+        column_name="dimension",
+        db_column_name="dimension",
+        column_class_name="Text",
+        column_class=Text,
+        params={
+            "default": "",
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": False,
+            "index_method": IndexMethod.btree,
+            "choices": RollupDimension,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    manager.add_column(
+        table_class_name="CommandInvokeDailyRollups",
+        tablename="command_invoke_daily_rollups",
+        column_name="value",
+        db_column_name="value",
+        column_class_name="Text",
+        column_class=Text,
+        params={
+            "default": "",
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": False,
+            "index_method": IndexMethod.btree,
+            "choices": None,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    manager.add_column(
+        table_class_name="CommandInvokeDailyRollups",
+        tablename="command_invoke_daily_rollups",
+        column_name="total",
+        db_column_name="total",
+        column_class_name="Integer",
+        column_class=Integer,
+        params={
+            "default": 0,
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": False,
+            "index_method": IndexMethod.btree,
+            "choices": None,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    return manager
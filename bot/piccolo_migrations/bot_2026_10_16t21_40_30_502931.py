@@ -0,0 +1,21 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+
+from bot.tables import CommandInvokeDailyRollups
+
+ID = "2026-10-16T21:40:30:502931"
+VERSION = "1.36.0"
+DESCRIPTION = "Unique daily rollup rows"
+
+
+async def forwards():
+    manager = MigrationManager(migration_id=ID, app_name="bot", description=DESCRIPTION)
+
+    async def run():
+        q = (
+            "alter table command_invoke_daily_rollups add constraint "
+            "unique_daily_rollups UNIQUE (day, dimension, value)"
+        )
+        await CommandInvokeDailyRollups.raw(q)
+
+    manager.add_raw(run)
+    return manager
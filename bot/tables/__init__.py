@@ -2,13 +2,16 @@ from .internal_error import InternalErrors
 from .message_addon import MessageAddons, PossibleMessageAddons
 from .command_invoke import CommandTypes, CommandInvokes
 from .aggregate_command_invoke import AggregateCommandInvokes
+from .command_invoke_daily_rollup import CommandInvokeDailyRollups, RollupDimension
 
 __all__ = [
     "AggregateCommandInvokes",
+    "CommandInvokeDailyRollups",
     "CommandInvokes",
     "CommandInvokes",
     "CommandTypes",
     "InternalErrors",
     "MessageAddons",
     "PossibleMessageAddons",
+    "RollupDimension",
 ]
@@ -54,6 +54,13 @@ class CommandInvokes(Table):
         command_type: CommandTypes,
         guild_config: GuildConfigs | None = None,
     ) -> Self:
+        """Record an invocation.
+
+        Once the bot has started the batched writer this only queues
+        the row, so the returned object will not have an id yet.
+        """
+        from bot.utils.command_invoke_writer import COMMAND_INVOKE_WRITER
+
         obj = cls(
             action=action,
             action_type=command_type,
@@ -62,5 +69,10 @@ class CommandInvokes(Table):
             guild_id=guild_config.guild_id if guild_config else None,
             guild_locale=guild_config.primary_language.value if guild_config else None,
         )
-        await obj.save()
+        if COMMAND_INVOKE_WRITER.is_running:
+            COMMAND_INVOKE_WRITER.add(obj)
+
+        else:
+            await obj.save()
+
         return obj
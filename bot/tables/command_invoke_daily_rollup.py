@@ -0,0 +1,29 @@
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from piccolo.columns import Serial, Date, Text, Integer
+from piccolo.table import Table
+
+
+class RollupDimension(StrEnum):
+    ACTION = "action"
+    ACTION_TYPE = "action_type"
+    USER_LOCALE = "user_locale"
+    GUILD_LOCALE = "guild_locale"
+    USER = "user"
+    """Every invocation by a user, keyed by their id."""
+    GUILD = "guild"
+    VOTER = "voter"
+    """Suggestion votes by a user, keyed by their id."""
+
+
+class CommandInvokeDailyRollups(
+    Table, help_text="Per day CommandInvokes counts used to compose weekly aggregates."
+):
+    if TYPE_CHECKING:
+        id: Serial
+
+    day = Date(help_text="The UTC day these counts are for", index=True)
+    dimension = Text(choices=RollupDimension, required=True)
+    value = Text(help_text="The action, locale or id being counted", required=True)
+    total = Integer(help_text="How many invocations had this value on this day")
@@ -1,40 +1,109 @@
 import datetime
 import logging
+import time
+from itertools import batched
 
 import hikari
 import lightbulb
 import orjson
+from opentelemetry.metrics import get_meter_provider
 
 from bot.constants import CLUSTER_ID
+from shared.utils import apply_cluster_guild_changes, publish_cluster_guilds
+from shared.utils.redis import GUILD_PRESENCE_TTL
 from web import constants
 
 loader = lightbulb.Loader()
 logger = logging.getLogger(__name__)
+sweep_duration = (
+    get_meter_provider()
+    .get_meter("bot.guilds")
+    .create_histogram(
+        name="guild_presence_sweep_duration",
+        unit="s",
+        description="How long a cluster takes to write every guild it is in to redis",
+    )
+)
 
+SWEEP_BATCH_SIZE = 1_000
+# Joins and leaves are written as they happen so the full
+# sweep is only here to reconcile anything which was missed
+SWEEP_INTERVAL = datetime.timedelta(hours=2)
+# Published counts are ignored after 30 minutes so keep them fresh
+COUNT_REFRESH_INTERVAL = datetime.timedelta(minutes=10)
 
-# This is set to 15 minutes to handle
-# bot restarts and the fact thats about how
-# long it takes to get the bot running and repopulate redis
-#
-# We also don't mind if edits occur in a short period
-# after the bot leaves as thats basically a noop
-time_to_cache = datetime.timedelta(minutes=30)
+_PENDING_CHANGES: dict[int, bool] = {}
+_last_published: float = 0
 
 
-@loader.task(lightbulb.uniformtrigger(minutes=15, wait_first=False))
+@loader.task(lightbulb.uniformtrigger(hours=2, wait_first=False))
 async def update_redis(bot: hikari.GatewayBot) -> None:
-    """Updates redis with bot specific info such as guilds."""
-    guilds = bot.cache.get_guilds_view()
-    guild_count = len(guilds.keys())
-    for guild_id in guilds:
-        await constants.REDIS_CLIENT.set(
-            f"bot:guilds:is_in:{guild_id}",
-            orjson.dumps(guild_id),
-            ex=int(time_to_cache.total_seconds()),
-        )
+    """Updates redis with every guild this cluster is in."""
+    global _last_published  # noqa: PLW0603
+    started_at = time.perf_counter()
+    guild_ids = list(bot.cache.get_guilds_view().keys())
+    for guild_batch in batched(guild_ids, n=SWEEP_BATCH_SIZE):
+        async with constants.REDIS_CLIENT.pipeline(transaction=False) as pipe:
+            for guild_id in guild_batch:
+                pipe.set(
+                    f"bot:guilds:is_in:{guild_id}",
+                    orjson.dumps(guild_id),
+                    ex=GUILD_PRESENCE_TTL,
+                )
 
+            await pipe.execute()
+
+    await publish_cluster_guilds(CLUSTER_ID, guild_ids)
+    _last_published = time.monotonic()
+    duration = time.perf_counter() - started_at
+    sweep_duration.record(duration, {"cluster.id": CLUSTER_ID})
     logger.info(
         "Updated redis with current guilds for cluster %s",
         CLUSTER_ID,
-        extra={"cluster.id": CLUSTER_ID, "cluster.guilds.count": guild_count},
+        extra={
+            "cluster.id": CLUSTER_ID,
+            "cluster.guilds.count": len(guild_ids),
+            "cluster.guilds.sweep_duration": duration,
+        },
     )
+
+
+@loader.task(lightbulb.uniformtrigger(seconds=5))
+async def flush_guild_changes(bot: hikari.GatewayBot) -> None:
+    """Write guilds joined or left since the last flush in one pipeline."""
+    global _last_published  # noqa: PLW0603
+    if (
+        not _PENDING_CHANGES
+        and time.monotonic() - _last_published < COUNT_REFRESH_INTERVAL.total_seconds()
+    ):
+        return
+
+    changes = dict(_PENDING_CHANGES)
+    _PENDING_CHANGES.clear()
+    try:
+        await apply_cluster_guild_changes(
+            CLUSTER_ID, changes, len(bot.cache.get_guilds_view())
+        )
+    except Exception:
+        # Retry them next flush, unless the guild has changed again since
+        for guild_id, is_in in changes.items():
+            _PENDING_CHANGES.setdefault(guild_id, is_in)
+
+        raise
+
+    _last_published = time.monotonic()
+
+
+@loader.listener(hikari.GuildAvailableEvent)
+async def on_guild_available(event: hikari.GuildAvailableEvent) -> None:
+    _PENDING_CHANGES[event.guild_id] = True
+
+
+@loader.listener(hikari.GuildJoinEvent)
+async def on_guild_join(event: hikari.GuildJoinEvent) -> None:
+    _PENDING_CHANGES[event.guild_id] = True
+
+
+@loader.listener(hikari.GuildLeaveEvent)
+async def on_guild_leave(event: hikari.GuildLeaveEvent) -> None:
+    _PENDING_CHANGES[event.guild_id] = False
@@ -2,13 +2,18 @@ from bot.utils.id import generate_id
 from bot.utils.embeds import error_embed, generate_author_text
 from .queue_paginator import QueuedSuggestionsPaginator
 from .voter_paginator import ViewVotersPaginator
+from .paginator_state import PaginatorState
 from .errors import HandleClientHTTPResponse, should_handle_error
 from .otel import start_error_span, get_trace_id
 from .users import fetch_user_avatar
 from .cv2 import insert_user_segment
+from .custom_id_router import CustomIdRouter, ParsedCustomId
 
 __all__ = [
+    "CustomIdRouter",
     "HandleClientHTTPResponse",
+    "PaginatorState",
+    "ParsedCustomId",
     "QueuedSuggestionsPaginator",
     "ViewVotersPaginator",
     "error_embed",
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import commons
+from opentelemetry.metrics import get_meter_provider
+
+from bot.utils.periodic_flusher import PeriodicFlusher
+
+if TYPE_CHECKING:
+    from bot.tables import CommandInvokes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _QueuedInvoke:
+    invoke: CommandInvokes
+    attempts: int = 0
+
+
+class CommandInvokeWriter(PeriodicFlusher):
+    """Queues CommandInvokes in memory and inserts them in batches.
+
+    Notes
+    -----
+    The queue is bounded, once full new invocations are dropped
+    rather than making a user facing response wait on analytics.
+    A batch which keeps failing to insert is dropped after
+    max_flush_attempts so it can't hold up everything behind it.
+    Drops, failed writes and rows written are exported as metrics.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: timedelta,
+        max_batch_size: int,
+        max_queued: int,
+        max_flush_attempts: int = 3,
+    ) -> None:
+        super().__init__(flush_interval=flush_interval)
+        self.max_batch_size: int = max_batch_size
+        self.max_queued: int = max_queued
+        self.max_flush_attempts: int = max_flush_attempts
+        self.dropped: int = 0
+        self._queue: deque[_QueuedInvoke] = deque()
+
+        meter = get_meter_provider().get_meter("bot.command_invokes")
+        self._written_counter = meter.create_counter(
+            name="command_invokes_written",
+            description="Command invocations inserted by the batched writer",
+        )
+        self._dropped_counter = meter.create_counter(
+            name="command_invokes_dropped",
+            description="Command invocations dropped as the writer queue was full",
+        )
+        self._failed_counter = meter.create_counter(
+            name="command_invokes_failed_flushes",
+            description="Batched command invocation inserts which raised",
+        )
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(self, invoke: CommandInvokes) -> bool:
+        """Queue an invocation to be written, returns False if it was dropped."""
+        if len(self._queue) >= self.max_queued:
+            self.dropped += 1
+            self._dropped_counter.add(1)
+            return False
+
+        self._queue.append(_QueuedInvoke(invoke))
+        if len(self._queue) >= self.max_batch_size:
+            self.wake()
+
+        return True
+
+    async def flush(self) -> None:
+        """Insert everything queued, one multi row INSERT per batch."""
+        from bot.tables import CommandInvokes
+
+        async with self._lock:
+            while self._queue:
+                batch = [
+                    self._queue.popleft()
+                    for _ in range(min(self.max_batch_size, len(self._queue)))
+                ]
+                try:
+                    await CommandInvokes.insert(*[queued.invoke for queued in batch])
+
+                except Exception as e:  # noqa: BLE001
+                    self._requeue_failed_flush(batch, e)
+                    return
+
+                self._written_counter.add(len(batch))
+                logger.debug("Flushed %s command invokes", len(batch))
+
+    def _requeue_failed_flush(self, batch: list[_QueuedInvoke], e: Exception) -> None:
+        retry: list[_QueuedInvoke] = []
+        for queued in batch:
+            queued.attempts += 1
+            if queued.attempts < self.max_flush_attempts:
+                retry.append(queued)
+
+        # Retry on the next flush, keeping whatever fits so the queue stays bounded
+        space = max(self.max_queued - len(self._queue), 0)
+        self._queue.extendleft(reversed(retry[:space]))
+        dropped = len(batch) - min(space, len(retry))
+        if dropped:
+            self.dropped += dropped
+            self._dropped_counter.add(dropped)
+
+        self._failed_counter.add(1)
+        logger.error(
+            "Failed to flush %s command invokes, dropped %s",
+            len(batch),
+            dropped,
+            extra={"traceback": commons.exception_as_string(e)},
+        )
+
+
+COMMAND_INVOKE_WRITER: CommandInvokeWriter = CommandInvokeWriter(
+    flush_interval=timedelta(seconds=1),
+    max_batch_size=500,
+    max_queued=10_000,
+)
+"""Used by CommandInvokes.create once started by the bot."""
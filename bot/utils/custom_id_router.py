@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+type CustomIdParser = Callable[[str], ParsedCustomId]
+"""Called with everything in the custom id after the matched prefix."""
+
+
+RESOLVE_CACHE_SIZE = 4_096
+"""How many recently resolved custom ids each router remembers."""
+
+
+@dataclass(slots=True)
+class ParsedCustomId:
+    component_key: str
+    """Used as the span name and to identify the interaction in errors."""
+    link_id: str | None = None
+    """The trace link state to continue, if the custom id carries one."""
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class Route[HandlerT]:
+    prefix: str
+    parser: CustomIdParser
+    handler: HandlerT
+
+
+class CustomIdRouter[HandlerT]:
+    """Routes custom ids to a parser and handler by their longest registered prefix.
+
+    Notes
+    -----
+    Prefixes are compiled into a single level trie keyed by their
+    first character, each bucket ordered longest prefix first. With
+    the handful of prefixes per bucket we register this is cheaper
+    in Python than walking a deeper trie node by node.
+
+    Everyone interacting with a message clicks the same custom ids,
+    so resolved custom ids are cached and repeat clicks skip matching
+    and parsing entirely. Cached results are shared between callers
+    and must not be mutated.
+
+    """
+
+    def __init__(self, *, cache_size: int = RESOLVE_CACHE_SIZE) -> None:
+        self._routes: dict[str, Route[HandlerT]] = {}
+        self._index: dict[str, tuple[Route[HandlerT], ...]] = {}
+        self._cached_resolve = functools.lru_cache(maxsize=cache_size)(self._resolve)
+
+    def register(
+        self,
+        prefix: str,
+        handler: HandlerT,
+        *,
+        parser: CustomIdParser,
+        aliases: Sequence[str] = (),
+    ) -> None:
+        """Register a custom id family.
+
+        Parameters
+        ----------
+        prefix: str
+            The prefix custom ids in this family start with.
+        handler: HandlerT
+            What to call for custom ids in this family.
+        parser: CustomIdParser
+            Parses the rest of the custom id after the prefix.
+        aliases: Sequence[str]
+            Legacy prefixes which share the same format after the prefix.
+
+        Raises
+        ------
+        ValueError
+            A prefix is already registered.
+
+        """
+        for entry in (prefix, *aliases):
+            if not entry:
+                msg = "Custom id prefixes cannot be empty"
+                raise ValueError(msg)
+
+            if entry in self._routes:
+                msg = f"The custom id prefix {entry!r} is already registered"
+                raise ValueError(msg)
+
+            self._routes[entry] = Route(prefix=entry, parser=parser, handler=handler)
+
+        index: dict[str, list[Route[HandlerT]]] = {}
+        for route in sorted(self._routes.values(), key=lambda r: -len(r.prefix)):
+            index.setdefault(route.prefix[0], []).append(route)
+
+        self._index = {char: tuple(routes) for char, routes in index.items()}
+        self._cached_resolve.cache_clear()
+
+    def match(self, custom_id: str) -> Route[HandlerT] | None:
+        """Find the route with the longest prefix of the custom id."""
+        for route in self._index.get(custom_id[:1], ()):
+            if custom_id.startswith(route.prefix):
+                return route
+
+        return None
+
+    def resolve(self, custom_id: str) -> tuple[Route[HandlerT], ParsedCustomId] | None:
+        """Find and parse the route for a custom id, if one is registered."""
+        return self._cached_resolve(custom_id)
+
+    def _resolve(self, custom_id: str) -> tuple[Route[HandlerT], ParsedCustomId] | None:
+        route = self.match(custom_id)
+        if route is None:
+            return None
+
+        return route, route.parser(custom_id[len(route.prefix) :])
@@ -6,9 +6,8 @@ from typing import TYPE_CHECKING, Protocol
 import hikari
 
 from bot.constants import LOCALISATIONS, EMBED_COLOR
-from bot.utils import fetch_user_avatar
+from bot.utils import fetch_user_avatar, fragments
 from shared.tables import (
-    UserConfigs,
     Suggestions,
     QueuedSuggestions,
     QueuedSuggestionStateEnum,
@@ -21,7 +20,7 @@ logger = logging.getLogger(__name__)
 
 async def build_new_suggestion_notification(
     *,
-    user_config: UserConfigs,
+    locale: hikari.Locale,
     suggestion: Suggestions,
 ) -> list[hikari.impl.ContainerComponentBuilder]:
     return [
@@ -31,7 +30,7 @@ async def build_new_suggestion_notification(
                 hikari.impl.TextDisplayComponentBuilder(
                     content=LOCALISATIONS.get_localized_string(
                         "saq.notify_users_of_new_suggestion.responses.suggestion_created",
-                        user_config.primary_language,
+                        locale,
                         extras={
                             "AUTHOR": suggestion.author_display_name,
                             "CHANNEL": f"<#{suggestion.channel_id}>",
@@ -39,19 +38,16 @@ async def build_new_suggestion_notification(
                         },
                     ),
                 ),
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                ),
+                fragments.divider(),
                 hikari.impl.TextDisplayComponentBuilder(
                     content=LOCALISATIONS.get_localized_string(
                         "saq.notify_users_of_new_suggestion.responses.suggestion_created.footer",
-                        user_config.primary_language,
+                        locale,
                         extras={
                             "GUILD_ID": suggestion.guild_id,
                             "SID": suggestion.footer_sid,
                         },
-                    ),
+                    )
                 ),
             ],
         ),
@@ -60,7 +56,7 @@ async def build_new_suggestion_notification(
 
 async def build_user_resolution_notification(
     *,
-    user_config: UserConfigs,
+    locale: hikari.Locale,
     suggestion: Suggestions,
 ) -> list[hikari.impl.ContainerComponentBuilder]:
     return [
@@ -70,7 +66,7 @@ async def build_user_resolution_notification(
                 hikari.impl.TextDisplayComponentBuilder(
                     content=LOCALISATIONS.get_localized_string(
                         "saq.suggestion_resolved_notifications.responses.suggestion_resolved.description",
-                        user_config.primary_language,
+                        locale,
                         extras={
                             "AUTHOR": suggestion.author_display_name,
                             "STATE": suggestion.state.value,
@@ -80,19 +76,16 @@ async def build_user_resolution_notification(
                         },
                     ),
                 ),
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                ),
+                fragments.divider(),
                 hikari.impl.TextDisplayComponentBuilder(
                     content=LOCALISATIONS.get_localized_string(
                         "saq.suggestion_resolved_notifications.responses.suggestion_resolved.footer",
-                        user_config.primary_language,
+                        locale,
                         extras={
                             "GUILD_ID": suggestion.guild_id,
                             "SID": suggestion.footer_sid,
                         },
-                    ),
+                    )
                 ),
             ],
         ),
@@ -101,7 +94,7 @@ async def build_user_resolution_notification(
 
 async def build_queued_user_resolution_notification(
     *,
-    user_config: UserConfigs,
+    locale: hikari.Locale,
     suggestion: QueuedSuggestions,
     rest: hikari.api.RESTClient,
 ) -> tuple[
@@ -119,7 +112,7 @@ async def build_queued_user_resolution_notification(
         initial_cv = hikari.impl.TextDisplayComponentBuilder(
             content=LOCALISATIONS.get_localized_string(
                 "saq.queued_suggestion_resolved_notifications.responses.approved.description",
-                user_config.primary_language,
+                locale,
                 extras={
                     "AUTHOR": suggestion.author_display_name,
                     "JUMP_TO": jump_to,
@@ -132,7 +125,7 @@ async def build_queued_user_resolution_notification(
         initial_cv = hikari.impl.TextDisplayComponentBuilder(
             content=LOCALISATIONS.get_localized_string(
                 "saq.queued_suggestion_resolved_notifications.responses.rejected.description",
-                user_config.primary_language,
+                locale,
                 extras={
                     "AUTHOR": suggestion.author_display_name,
                     "RESOLVED_BY": suggestion.resolved_by_display_text,
@@ -142,7 +135,7 @@ async def build_queued_user_resolution_notification(
         )
         extra = await suggestion.as_components(
             rest=rest,
-            locale=user_config.primary_language,
+            locale=locale,
             localisations=LOCALISATIONS,
             include_buttons=False,
         )
@@ -152,19 +145,16 @@ async def build_queued_user_resolution_notification(
             accent_color=suggestion.color,
             components=[
                 initial_cv,
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                ),
+                fragments.divider(),
                 hikari.impl.TextDisplayComponentBuilder(
                     content=LOCALISATIONS.get_localized_string(
                         "saq.queued_suggestion_resolved_notifications.responses.suggestion_resolved.footer",
-                        user_config.primary_language,
+                        locale,
                         extras={
                             "GUILD_ID": suggestion.guild_id,
                             "SID": suggestion.footer_sid,
                         },
-                    ),
+                    )
                 ),
             ],
         ),
@@ -0,0 +1,124 @@
+"""Memoised pieces of the suggestion and notification components.
+
+The dividers and button rows of a suggestion are the same on every
+edit, so rather than building new builders each time these are built
+once and shared. Text which carries per suggestion details, such as
+vote counts and footers, is rendered directly by the caller.
+
+Notes
+-----
+Builders returned from here are shared between renders and
+must never be mutated, only placed into other components.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import hikari
+
+from bot import constants
+from shared.utils.caching import LRUTimedCache
+
+if TYPE_CHECKING:
+    from bot.localisation import Localisation
+
+FRAGMENT_CACHE_SIZE = 10_000
+FRAGMENT_TTL = timedelta(hours=1)
+
+_DIVIDER = hikari.impl.SeparatorComponentBuilder(
+    divider=True,
+    spacing=hikari.SpacingType.SMALL,
+)
+_BUTTON_ROWS: LRUTimedCache[tuple, hikari.impl.MessageActionRowBuilder] = LRUTimedCache(
+    max_size=FRAGMENT_CACHE_SIZE, ttl=FRAGMENT_TTL
+)
+
+
+def divider() -> hikari.impl.SeparatorComponentBuilder:
+    """The small divider placed between every section."""
+    return _DIVIDER
+
+
+def vote_buttons(suggestion_id: str) -> hikari.impl.MessageActionRowBuilder:
+    """The up and down vote buttons shown under a suggestion."""
+    cache_key = ("vote", suggestion_id)
+    row = _BUTTON_ROWS.get(cache_key)
+    if row is None:
+        row = hikari.impl.MessageActionRowBuilder(
+            components=[
+                hikari.impl.InteractiveButtonBuilder(
+                    style=hikari.ButtonStyle.SECONDARY,
+                    emoji=constants.DEFAULT_UP_VOTE,
+                    custom_id=f"v4_suggestions_up_vote:{suggestion_id}",
+                ),
+                hikari.impl.InteractiveButtonBuilder(
+                    style=hikari.ButtonStyle.SECONDARY,
+                    emoji=constants.DEFAULT_DOWN_VOTE,
+                    custom_id=f"v4_suggestions_down_vote:{suggestion_id}",
+                ),
+            ]
+        )
+        _BUTTON_ROWS.set(cache_key, row)
+
+    return row
+
+
+def queue_buttons(
+    localisations: Localisation,
+    locale: hikari.Locale | str,
+    *,
+    approve_id: str,
+    reject_id: str,
+) -> hikari.impl.MessageActionRowBuilder:
+    """The approve and reject buttons shown under a queued suggestion."""
+    if not isinstance(locale, hikari.Locale):
+        locale = hikari.Locale(locale)
+
+    cache_key = ("queue", localisations, locale, approve_id, reject_id)
+    row = _BUTTON_ROWS.get(cache_key)
+    if row is None:
+        row = build_queue_buttons(
+            localisations, locale, approve_id=approve_id, reject_id=reject_id
+        )
+        _BUTTON_ROWS.set(cache_key, row)
+
+    return row
+
+
+def build_queue_buttons(
+    localisations: Localisation,
+    locale: hikari.Locale | str,
+    *,
+    approve_id: str,
+    reject_id: str,
+) -> hikari.impl.MessageActionRowBuilder:
+    """Build the queue buttons without caching them.
+
+    Use this for custom ids which are unique to a
+    single render, such as those from a paginator.
+    """
+    return hikari.impl.MessageActionRowBuilder(
+        components=[
+            hikari.impl.InteractiveButtonBuilder(
+                style=hikari.ButtonStyle.SUCCESS,
+                label=localisations.get_localized_string(
+                    "values.suggest.queue_approve", locale
+                ),
+                custom_id=approve_id,
+            ),
+            hikari.impl.InteractiveButtonBuilder(
+                style=hikari.ButtonStyle.DANGER,
+                label=localisations.get_localized_string(
+                    "values.suggest.queue_reject", locale
+                ),
+                custom_id=reject_id,
+            ),
+        ]
+    )
+
+
+def clear_fragments() -> None:
+    """Drop every cached fragment, mainly for tests."""
+    _BUTTON_ROWS.clear()
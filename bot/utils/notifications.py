@@ -0,0 +1,169 @@
+"""Deliver the same notification to many users by DM.
+
+Messages are rendered once per locale rather than once per user, DM
+channels already cached in Redis are resolved in a single round trip,
+and sends from every fan out in the process share one pace so together
+they leave room under Discord's global rate limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import hikari
+
+from bot.utils.errors import HandleClientHTTPResponse
+from bot.utils.users import create_user_dm_channel_id, fetch_cached_dm_channel_ids
+
+if TYPE_CHECKING:
+    from hikari.api import ComponentBuilder
+
+    from shared.tables import UserConfigs
+
+logger = logging.getLogger(__name__)
+
+DM_CONCURRENCY = 10
+DM_REQUESTS_PER_SECOND = 25
+"""Discord allows 50 requests a second per bot, leave room for everything else.
+
+This is only enforced per process, not across every process using the bot token.
+"""
+
+type RenderedMessages = Sequence[Sequence[ComponentBuilder]]
+"""Each entry is sent as its own message, in order"""
+type NotificationRenderer = Callable[[hikari.Locale], Awaitable[RenderedMessages]]
+
+
+@dataclass(slots=True)
+class FanOutResult:
+    sent: int = 0
+    forbidden: int = 0
+    """Users who have DMs closed or have blocked the bot"""
+    failed: int = 0
+
+
+class RequestPacer:
+    """Spaces requests out evenly at no more than per_second."""
+
+    def __init__(self, per_second: float) -> None:
+        self.interval: float = 1 / per_second
+        self._next_at: float = 0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        send_at = max(now, self._next_at)
+        self._next_at = send_at + self.interval
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+
+DM_PACER = RequestPacer(DM_REQUESTS_PER_SECOND)
+"""Shared by every fan out in this process"""
+
+
+async def fan_out_notification(  # noqa: C901
+    recipients: Iterable[UserConfigs],
+    render: NotificationRenderer,
+    *,
+    rest: hikari.api.RESTClient,
+    caller_name: str,
+    context: str | None = None,
+    concurrency: int = DM_CONCURRENCY,
+    pacer: RequestPacer = DM_PACER,
+) -> FanOutResult:
+    """DM every recipient the messages returned by render.
+
+    Parameters
+    ----------
+    recipients
+        Users to notify, anyone listed more than once is only sent it once.
+    render
+        Called once for each locale used by the recipients.
+    caller_name
+        Used to attribute any errors, typically the job name.
+    context
+        Extra context stored alongside any errors.
+    pacer
+        Paces requests, defaults to the one shared by the whole process.
+
+    Notes
+    -----
+    Users who can't be messaged are counted in the returned result
+    without stopping delivery to the rest, any other error propagates.
+    """
+    locales: dict[int, hikari.Locale] = {
+        user_config.user_id: user_config.primary_language for user_config in recipients
+    }
+    if not locales:
+        return FanOutResult()
+
+    rendered: dict[hikari.Locale, RenderedMessages] = {}
+    for locale in locales.values():
+        if locale not in rendered:
+            rendered[locale] = await render(locale)
+
+    dm_channels = await fetch_cached_dm_channel_ids(list(locales.keys()))
+    result = FanOutResult()
+    semaphore = asyncio.Semaphore(concurrency)
+    error_handler = HandleClientHTTPResponse(caller_name, context)
+
+    async def deliver(user_id: int, messages: RenderedMessages) -> None:
+        async with semaphore:
+            try:
+                channel_id = dm_channels.get(user_id)
+                if channel_id is None:
+                    await pacer.wait()
+                    channel_id = await create_user_dm_channel_id(user_id, rest=rest)
+
+                for components in messages:
+                    await pacer.wait()
+                    await rest.create_message(channel_id, components=components)
+
+            except hikari.ForbiddenError:
+                # I'd consider it 'fine' if the bot can't send this message
+                result.forbidden += 1
+                logger.debug(
+                    "Failed to dm user for %s",
+                    caller_name,
+                    extra={"interaction.user.id": user_id},
+                )
+
+            except hikari.NotFoundError:
+                # The user has since deleted their account
+                result.failed += 1
+                logger.debug(
+                    "Could not find user to dm for %s",
+                    caller_name,
+                    extra={"interaction.user.id": user_id},
+                )
+
+            except hikari.ClientHTTPResponseError as e:
+                if not await error_handler.handle_client_http_response(e):
+                    raise
+
+                result.failed += 1
+
+            else:
+                result.sent += 1
+
+    async with asyncio.TaskGroup() as tg:
+        for user_id, locale in locales.items():
+            tg.create_task(deliver(user_id, rendered[locale]))
+
+    logger.debug(
+        "Fanned out %s to %s users in %s locales",
+        caller_name,
+        len(locales),
+        len(rendered),
+        extra={
+            "notification.sent": result.sent,
+            "notification.forbidden": result.forbidden,
+            "notification.failed": result.failed,
+        },
+    )
+    return result
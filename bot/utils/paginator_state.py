@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import abc
+import dataclasses
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, TypedDict, Unpack
+
+import hikari
+import orjson
+
+from bot.constants import LOCALISATIONS, PAGINATOR_TTL
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import lightbulb
+    from hikari.api import (
+        ComponentBuilder,
+        ContainerComponentBuilder,
+        MessageActionRowBuilder,
+        TextDisplayComponentBuilder,
+    )
+
+
+@dataclass(slots=True)
+class PaginatorState:
+    """Everything needed to rebuild a paginator on any cluster."""
+
+    kind: Literal["queue", "voters"]
+    guild_id: int
+    user_id: int
+    locale: str
+    link_id: str
+    application_id: int
+    interaction_token: str
+    """Used to edit the response the paginator is shown in."""
+    page_index: int = 0
+    total: int = 0
+    cursor: int | None = None
+    """The id of the first row on the current page."""
+    cursor_end: int | None = None
+    """The id of the last row on the current page."""
+    cursor_sid: str | None = None
+    sid: str | None = None
+    suggestion_id: int | None = None
+    vote_type: str | None = None
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(dataclasses.asdict(self))
+
+    @classmethod
+    def loads(cls, raw_data: bytes) -> PaginatorState:
+        data = orjson.loads(raw_data)
+        known = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+class PaginatorStateExtras(TypedDict, total=False):
+    """The PaginatorState fields only some kinds of paginator use."""
+
+    page_index: int
+    total: int
+    cursor: int | None
+    cursor_end: int | None
+    cursor_sid: str | None
+    sid: str | None
+    suggestion_id: int | None
+    vote_type: str | None
+
+
+def _paginator_redis_key(pid: str) -> str:
+    return f"paginator:{pid}"
+
+
+async def save_paginator_state(pid: str, state: PaginatorState) -> None:
+    from web.constants import REDIS_CLIENT
+
+    await REDIS_CLIENT.set(_paginator_redis_key(pid), state.dumps(), ex=PAGINATOR_TTL)
+
+
+async def load_paginator_state(pid: str) -> PaginatorState | None:
+    """Fetch a paginators state, extending how long it lives for."""
+    from web.constants import REDIS_CLIENT
+
+    raw_data = await REDIS_CLIENT.getex(_paginator_redis_key(pid), ex=PAGINATOR_TTL)
+    if raw_data is None:
+        return None
+
+    return PaginatorState.loads(raw_data)
+
+
+async def delete_paginator_state(pid: str) -> None:
+    from web.constants import REDIS_CLIENT
+
+    await REDIS_CLIENT.delete(_paginator_redis_key(pid))
+
+
+class StatefulPaginator[PageT](abc.ABC):
+    """Shared page handling for paginators backed by a PaginatorState.
+
+    Notes
+    -----
+    Paginators hold nothing which can't be serialised besides the
+    REST client they were rebuilt with, so they are discarded after
+    every interaction and rebuilt from Redis on the next one.
+
+    """
+
+    kind: Literal["queue", "voters"]
+    expired_key: str
+    """The localisation key shown once the paginator has finished."""
+
+    def __init__(
+        self, *, pid: str, state: PaginatorState, rest: hikari.api.RESTClient
+    ) -> None:
+        self._pid: str = pid
+        self._state: PaginatorState = state
+        self._rest: hikari.api.RESTClient = rest
+
+    @classmethod
+    def build_state(
+        cls,
+        *,
+        ctx: lightbulb.Context,
+        locale: hikari.Locale,
+        link_id: str,
+        **extras: Unpack[PaginatorStateExtras],
+    ) -> PaginatorState:
+        return PaginatorState(
+            kind=cls.kind,
+            guild_id=int(ctx.guild_id or 0),
+            user_id=ctx.user.id,
+            locale=locale.value,
+            link_id=link_id,
+            application_id=int(ctx.interaction.application_id),
+            interaction_token=ctx.interaction.token,
+            **extras,
+        )
+
+    @property
+    def _locale(self) -> hikari.Locale:
+        return hikari.Locale(self._state.locale)
+
+    @property
+    def _link_id(self) -> str:
+        return self._state.link_id
+
+    @property
+    def _guild_id(self) -> int:
+        return self._state.guild_id
+
+    @property
+    def current_page(self) -> int:
+        """The current page for this paginator."""
+        return self._state.page_index + 1
+
+    @property
+    @abc.abstractmethod
+    def total_pages(self) -> int:
+        """How many pages exist in this paginator."""
+
+    async def save(self) -> None:
+        await save_paginator_state(self._pid, self._state)
+
+    async def _edit_original_response(
+        self, components: Sequence[ComponentBuilder]
+    ) -> None:
+        await self._rest.edit_interaction_response(
+            self._state.application_id,
+            self._state.interaction_token,
+            components=components,
+        )
+
+    async def _show_expired(self) -> None:
+        await self._edit_original_response(
+            [
+                hikari.impl.TextDisplayComponentBuilder(
+                    content=LOCALISATIONS.get_localized_string(
+                        self.expired_key,
+                        self._locale,
+                    ),
+                ),
+            ],
+        )
+
+    @abc.abstractmethod
+    def format_page(
+        self, page: PageT
+    ) -> list[
+        ContainerComponentBuilder | MessageActionRowBuilder | TextDisplayComponentBuilder
+    ]:
+        """Build the components which show page."""
+
+    @abc.abstractmethod
+    async def next_page(self) -> None: ...
+
+    @abc.abstractmethod
+    async def previous_page(self) -> None: ...
+
+    async def stop_paginating(self) -> None:
+        await delete_paginator_state(self._pid)
+        await self._show_expired()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+
+class PeriodicFlusher(abc.ABC):
+    """Calls flush on a background task every flush_interval or when woken early.
+
+    Notes
+    -----
+    Subclasses buffer writes in memory, call wake once enough has
+    built up to be worth writing and hold _lock while flushing.
+
+    """
+
+    def __init__(self, *, flush_interval: timedelta) -> None:
+        self.flush_interval: float = flush_interval.total_seconds()
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write anything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        await self.flush()
+
+    def wake(self) -> None:
+        """Flush now rather than waiting for the interval to pass."""
+        self._wakeup.set()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+
+            self._wakeup.clear()
+            await self.flush()
+
+    @abc.abstractmethod
+    async def flush(self) -> None: ...
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, cast
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
 
 import hikari
 
 from bot.constants import LOCALISATIONS
-from bot.exceptions import QueueImbalance
+from bot.utils.paginator_state import StatefulPaginator
+from shared.utils import caching
 
 if TYPE_CHECKING:
     from hikari.api import (
@@ -14,94 +18,51 @@ if TYPE_CHECKING:
         MessageActionRowBuilder,
         TextDisplayComponentBuilder,
     )
-    import lightbulb
     from shared.tables import QueuedSuggestions
 
 log = logging.getLogger(__name__)
 
 
-class QueuedSuggestionsPaginator:
-    def __init__(
-        self,
-        *,
-        data: list[str],
-        ctx: lightbulb.Context,
-        locale: hikari.Locale,
-        pid: str,
-        link_id: str,
-    ) -> None:
-        self._current_page_index = 0
-        self._paged_data: list[str] = data
-        self._guild_id: int = cast("int", ctx.guild_id)
-        self._rest = ctx.interaction.app.rest
-        self._locale: hikari.Locale = locale
-        self._pid: str = pid
-        self._link_id: str = link_id
-        self.original_interaction: hikari.CommandInteraction = ctx.interaction
+@dataclass(slots=True)
+class _QueuePage:
+    queued_suggestion: QueuedSuggestions
+    components: list[
+        ContainerComponentBuilder | MessageActionRowBuilder | TextDisplayComponentBuilder
+    ]
 
-    @property
-    def current_page(self) -> int:
-        """The current page for this paginator."""
-        return self._current_page_index + 1
-
-    @current_page.setter
-    def current_page(self, value: int) -> None:
-        # Wrap around
-        if value > self.total_pages:
-            self._current_page_index = 0
-        elif value <= 0:
-            self._current_page_index = self.total_pages - 1
-        else:
-            self._current_page_index = value - 1
 
-    @property
-    def total_pages(self) -> int:
-        """How many pages exist in this paginator."""
-        return len(self._paged_data)
+_PREFETCHED_PAGES: caching.LRUTimedCache[tuple[str, int, bool], _QueuePage] = (
+    caching.LRUTimedCache(max_size=1_000, ttl=timedelta(seconds=30))
+)
+"""Rendered neighbours of a page keyed by paginator id, cursor and direction."""
+_PREFETCH_TASKS: set[asyncio.Task] = set()
 
-    @property
-    def pages(self) -> list[str]:
-        return self._paged_data
 
-    async def remove_current_page(self) -> None:
-        wrap = self.current_page == self.total_pages
-        self._paged_data.pop(self._current_page_index)
-        if wrap:
-            self.current_page = 1
+class QueuedSuggestionsPaginator(StatefulPaginator[_QueuePage]):
+    """Pages through a guilds pending queue using the queued suggestion id as a cursor.
 
-        if self.total_pages == 0:
-            await self.original_interaction.edit_initial_response(
-                components=[
-                    hikari.impl.TextDisplayComponentBuilder(
-                        content=LOCALISATIONS.get_localized_string(
-                            "menus.queue_paginator.responses.expired",
-                            self._locale,
-                        ),
-                    ),
-                ],
-            )
+    Notes
+    -----
+    Nothing is loaded up front besides a count. Each page is the
+    next or previous pending row by id, fetched with its joins in
+    one query, and after a page is shown both of its neighbours
+    are rendered in the background so the next page turn is free.
 
-        else:
-            await self.original_interaction.edit_initial_response(
-                components=await self.format_page(),
-            )
+    """
 
-    async def get_current_queued_suggestion(self) -> QueuedSuggestions | None:
-        from shared.tables import QueuedSuggestions, QueuedSuggestionStateEnum
+    kind = "queue"
+    expired_key = "menus.queue_paginator.responses.expired"
 
-        qs: QueuedSuggestions | None = await QueuedSuggestions.fetch_queued_suggestion(
-            self._paged_data[self._current_page_index],
-            self._guild_id,
-        )
-        if qs is None:
-            return qs
-
-        if qs.state != QueuedSuggestionStateEnum.PENDING:
-            raise QueueImbalance
+    @property
+    def total_pages(self) -> int:
+        return self._state.total
 
-        return qs
+    @property
+    def current_sid(self) -> str | None:
+        """The sID of the queued suggestion currently being shown."""
+        return self._state.cursor_sid
 
-    async def format_page(
+    async def start(
         self,
     ) -> (
         list[
@@ -111,84 +72,160 @@ class QueuedSuggestionsPaginator:
         ]
         | None
     ):
-        try:
-            suggestion: QueuedSuggestions | None = (
-                await self.get_current_queued_suggestion()
-            )
-            if suggestion is None:
-                await self.remove_current_page()
-                return None
-        except QueueImbalance:
-            await self.remove_current_page()
-            log.warning(
-                "Hit QueueImbalance",
-                extra={
-                    "interaction.user.id": self.original_interaction.user.id,
-                    "interaction.user.global_name": self.original_interaction.user.global_name,  # noqa: E501
-                    "interaction.guild.id": self.original_interaction.guild_id,
-                },
-            )
+        """Render the first page, returns None if the queue is empty."""
+        from shared.tables import QueuedSuggestions
+
+        self._state.total = await QueuedSuggestions.count_pending_for_guild(
+            self._guild_id
+        )
+        page = await self._seek(None, forwards=True)
+        if page is None:
             return None
+
+        await self._show(page, 0, edit=False)
+        return self.format_page(page)
+
+    async def next_page(self) -> None:
+        await self._turn_page(forwards=True)
+
+    async def previous_page(self) -> None:
+        await self._turn_page(forwards=False)
+
+    async def remove_current_page(self) -> None:
+        """Move past the current queued suggestion as it is being resolved."""
+        current = self._state.cursor
+        self._state.total = max(self._state.total - 1, 0)
+        index = self._state.page_index
+        page = await self._seek(current, forwards=True)
+        if page is None:
+            page = await self._seek(None, forwards=True)
+            index = 0
+
+        if page is None or page.queued_suggestion.id == current:
+            # The suggestion being resolved was the last one left
+            await self.stop_paginating()
+            return
+
+        await self._show(page, index)
+
+    async def _turn_page(self, *, forwards: bool) -> None:
+        from shared.tables import QueuedSuggestions
+
+        page = await self._seek(self._state.cursor, forwards=forwards)
+        if page is None:
+            # Reached an end of the queue so wrap around,
+            # which is also a good time to refresh the count
+            page = await self._seek(None, forwards=forwards)
+            self._state.total = await QueuedSuggestions.count_pending_for_guild(
+                self._guild_id
+            )
+            index = 0 if forwards else self._state.total - 1
+
         else:
-            components: list[
-                ContainerComponentBuilder
-                | MessageActionRowBuilder
-                | TextDisplayComponentBuilder
-            ] = [
-                hikari.impl.TextDisplayComponentBuilder(
-                    content=LOCALISATIONS.get_localized_string(
-                        "menus.queue_paginator.responses.page.footer",
-                        self._locale,
-                        extras={"CURRENT": self.current_page, "TOTAL": self.total_pages},
-                    ),
-                ),
-            ]
-            qsc = await suggestion.as_components(
+            index = self._state.page_index + (1 if forwards else -1)
+
+        if page is None:
+            await self.stop_paginating()
+            return
+
+        await self._show(page, index)
+
+    async def _seek(self, cursor: int | None, *, forwards: bool) -> _QueuePage | None:
+        from shared.tables import QueuedSuggestions
+
+        if cursor is not None:
+            key = (self._pid, cursor, forwards)
+            page = _PREFETCHED_PAGES.get(key)
+            if page is not None:
+                _PREFETCHED_PAGES.delete(key)
+                return page
+
+        queued_suggestion = await QueuedSuggestions.fetch_adjacent_pending(
+            self._guild_id, cursor, forwards=forwards
+        )
+        if queued_suggestion is None:
+            return None
+
+        return await self._render(queued_suggestion)
+
+    async def _render(self, queued_suggestion: QueuedSuggestions) -> _QueuePage:
+        return _QueuePage(
+            queued_suggestion=queued_suggestion,
+            components=await queued_suggestion.as_components(
                 rest=self._rest,
                 localisations=LOCALISATIONS,
                 locale=self._locale,
                 paginator_id=self._pid,
                 link_id=self._link_id,
-            )
-            components.extend(qsc)
-            components.extend(
-                [
-                    hikari.impl.MessageActionRowBuilder(
-                        components=[
-                            hikari.impl.InteractiveButtonBuilder(
-                                style=hikari.ButtonStyle.SECONDARY,
-                                emoji="\N{BLACK LEFT-POINTING TRIANGLE}\ufe0f",
-                                custom_id=f"v4_queue:back:{self._pid}::{self._link_id}",
-                            ),
-                            hikari.impl.InteractiveButtonBuilder(
-                                style=hikari.ButtonStyle.SECONDARY,
-                                emoji="\N{BLACK SQUARE FOR STOP}\ufe0f",
-                                custom_id=f"v4_queue:stop:{self._pid}::{self._link_id}",
-                            ),
-                            hikari.impl.InteractiveButtonBuilder(
-                                style=hikari.ButtonStyle.SECONDARY,
-                                emoji="\N{BLACK RIGHT-POINTING TRIANGLE}\ufe0f",
-                                custom_id=f"v4_queue:next:{self._pid}::{self._link_id}",
-                            ),
-                        ],
+            ),
+        )
+
+    async def _show(self, page: _QueuePage, index: int, *, edit: bool = True) -> None:
+        self._state.cursor = page.queued_suggestion.id
+        self._state.cursor_sid = page.queued_suggestion.sID
+        self._state.total = max(self._state.total, 1)
+        self._state.page_index = min(max(index, 0), self._state.total - 1)
+        await self.save()
+        if edit:
+            await self._edit_original_response(self.format_page(page))
+
+        task = asyncio.create_task(self._prefetch_neighbours(page.queued_suggestion.id))
+        _PREFETCH_TASKS.add(task)
+        task.add_done_callback(_PREFETCH_TASKS.discard)
+
+    async def _prefetch_neighbours(self, cursor: int) -> None:
+        for forwards in (True, False):
+            key = (self._pid, cursor, forwards)
+            if key in _PREFETCHED_PAGES:
+                continue
+
+            try:
+                page = await self._seek(cursor, forwards=forwards)
+            except Exception:  # noqa: BLE001
+                log.debug("Failed to prefetch a queue page", exc_info=True)
+                return
+
+            if page is not None:
+                _PREFETCHED_PAGES.set(key, page)
+
+    def format_page(
+        self, page: _QueuePage
+    ) -> list[
+        ContainerComponentBuilder | MessageActionRowBuilder | TextDisplayComponentBuilder
+    ]:
+        components: list[
+            ContainerComponentBuilder
+            | MessageActionRowBuilder
+            | TextDisplayComponentBuilder
+        ] = [
+            hikari.impl.TextDisplayComponentBuilder(
+                content=LOCALISATIONS.get_localized_string(
+                    "menus.queue_paginator.responses.page.footer",
+                    self._locale,
+                    extras={"CURRENT": self.current_page, "TOTAL": self.total_pages},
+                ),
+            ),
+        ]
+        components.extend(page.components)
+        components.append(
+            hikari.impl.MessageActionRowBuilder(
+                components=[
+                    hikari.impl.InteractiveButtonBuilder(
+                        style=hikari.ButtonStyle.SECONDARY,
+                        emoji="\N{BLACK LEFT-POINTING TRIANGLE}\ufe0f",
+                        custom_id=f"v4_queue:back:{self._pid}::{self._link_id}",
                     ),
-                ],
-            )
-            return components
-
-    async def update_message_with_current_page(self) -> None:
-        page = await self.format_page()
-        if page is not None:
-            await self.original_interaction.edit_initial_response(components=page)
-
-    async def stop_paginating(self) -> None:
-        await self.original_interaction.edit_initial_response(
-            components=[
-                hikari.impl.TextDisplayComponentBuilder(
-                    content=LOCALISATIONS.get_localized_string(
-                        "menus.queue_paginator.responses.expired",
-                        self._locale,
+                    hikari.impl.InteractiveButtonBuilder(
+                        style=hikari.ButtonStyle.SECONDARY,
+                        emoji="\N{BLACK SQUARE FOR STOP}\ufe0f",
+                        custom_id=f"v4_queue:stop:{self._pid}::{self._link_id}",
                     ),
-                ),
-            ],
+                    hikari.impl.InteractiveButtonBuilder(
+                        style=hikari.ButtonStyle.SECONDARY,
+                        emoji="\N{BLACK RIGHT-POINTING TRIANGLE}\ufe0f",
+                        custom_id=f"v4_queue:next:{self._pid}::{self._link_id}",
+                    ),
+                ],
+            ),
         )
+        return components
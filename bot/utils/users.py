@@ -1,37 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
 from datetime import timedelta
 
 import hikari
 import httpx
 
+from shared.utils import caching, http
+
+logger = logging.getLogger(__name__)
+
+AVATAR_TTL = timedelta(hours=12)
+MISSING_AVATAR_TTL = timedelta(minutes=15)
+"""Missing avatars are cached for less time as they may be transient"""
+MISSING_AVATAR_STATUSES: frozenset[int] = frozenset({404, 410})
+"""CDN responses which mean the avatar is gone, anything else isn't cached"""
+DM_CHANNEL_TTL = timedelta(hours=12)
+
+_MISSING = object()
+_RESOLVED_AVATARS: caching.LRUTimedCache[int, str | None] = caching.LRUTimedCache(
+    max_size=10_000, ttl=timedelta(minutes=5)
+)
+"""Avatars resolved by this process so hot users skip Redis entirely"""
+_IN_FLIGHT: dict[int, asyncio.Task[str | None]] = {}
+
+
+async def fetch_user_avatar(
+    user_id: int, *, rest: hikari.api.RESTClient
+) -> hikari.URL | None:
+    """Fetches the user avatar, returning None if the avatar is not available.
+
+    Notes
+    -----
+    Concurrent calls for the same user share a single lookup,
+    and avatars which are unavailable are cached for a short while.
+    """
+    url = _RESOLVED_AVATARS.get(user_id, _MISSING)
+    if url is _MISSING:
+        task = _IN_FLIGHT.get(user_id)
+        if task is None:
+            task = asyncio.create_task(_resolve_user_avatar(user_id, rest=rest))
+            _IN_FLIGHT[user_id] = task
+            task.add_done_callback(lambda _: _IN_FLIGHT.pop(user_id, None))
 
-async def fetch_user_avatar(user_id: int, *, rest) -> hikari.URL | None:
-    """Fetches the user avatar, returning None if the avatar is not available."""
+        # Shielded so one caller being cancelled doesn't cancel the others
+        url = await asyncio.shield(task)
+
+    return hikari.URL(url) if url else None
+
+
+async def _resolve_user_avatar(
+    user_id: int, *, rest: hikari.api.RESTClient
+) -> str | None:
     from web.constants import REDIS_CLIENT
 
-    data = await REDIS_CLIENT.get(f"avatars/{user_id}")
+    redis_key = f"avatars/{user_id}"
+    data = await REDIS_CLIENT.get(redis_key)
     if data is not None:
         assert isinstance(data, bytes), "Redis returned a string"
-        return hikari.URL(data.decode("utf-8"))
+        # An empty value means we already know there is no avatar
+        url = data.decode("utf-8") or None
+        _RESOLVED_AVATARS.set(user_id, url)
+        return url
+
+    try:
+        url = await _check_user_avatar(user_id, rest=rest)
+    except (httpx.HTTPError, hikari.HTTPError):
+        # Likely transient so don't remember it
+        logger.debug("Failed to check avatar for %s", user_id, exc_info=True)
+        return None
+
+    await REDIS_CLIENT.set(
+        redis_key,
+        (url or "").encode("utf-8"),
+        ex=AVATAR_TTL if url else MISSING_AVATAR_TTL,
+    )
+    _RESOLVED_AVATARS.set(user_id, url)
+    return url
+
 
-    async with httpx.AsyncClient() as client:
+async def _check_user_avatar(user_id: int, *, rest: hikari.api.RESTClient) -> str | None:
+    try:
         user: hikari.User = await rest.fetch_user(user_id)
-        url = user.display_avatar_url.url
+    except hikari.NotFoundError:
+        return None
 
-        try:
-            resp = await client.get(url)
-        except httpx.ReadTimeout:
-            return None
+    url = user.display_avatar_url.url
+    resp = await http.get_http_client("avatars").head(url)
+    if resp.status_code in MISSING_AVATAR_STATUSES:
+        return None
 
-        if resp.status_code != 200:  # noqa: PLR2004
-            return None
+    # Rate limits and server errors say nothing about the avatar
+    resp.raise_for_status()
+    return url
 
-        await REDIS_CLIENT.set(
-            f"avatars/{user_id}",
-            url.encode("utf-8"),
-            ex=timedelta(hours=12),
-        )
 
-    return hikari.URL(url)
+def _dm_channel_redis_key(user_id: int) -> str:
+    return f"dm_channel_id:{user_id}"
 
 
 async def fetch_user_dm_channel_id(
@@ -39,11 +106,44 @@ async def fetch_user_dm_channel_id(
 ) -> hikari.Snowflakeish:
     from web.constants import REDIS_CLIENT
 
-    redis_key = f"dm_channel_id:{user_id}"
-    dm_channel_id = await REDIS_CLIENT.get(redis_key)
+    dm_channel_id = await REDIS_CLIENT.get(_dm_channel_redis_key(user_id))
     if dm_channel_id is not None:
         return int(dm_channel_id)
 
+    return await create_user_dm_channel_id(user_id, rest=rest)
+
+
+async def fetch_cached_dm_channel_ids(user_ids: Sequence[int]) -> dict[int, int]:
+    """Returns the DM channels Redis already knows about in one round trip.
+
+    Users without a cached channel are left out of
+    the result, see create_user_dm_channel_id.
+    """
+    from web.constants import REDIS_CLIENT
+
+    if not user_ids:
+        return {}
+
+    async with REDIS_CLIENT.pipeline(transaction=False) as pipe:
+        for user_id in user_ids:
+            pipe.get(_dm_channel_redis_key(user_id))
+
+        values = await pipe.execute()
+
+    return {
+        user_id: int(value)
+        for user_id, value in zip(user_ids, values, strict=True)
+        if value is not None
+    }
+
+
+async def create_user_dm_channel_id(
+    user_id: int, *, rest: hikari.api.RESTClient
+) -> hikari.Snowflakeish:
+    from web.constants import REDIS_CLIENT
+
     dm_channel = await rest.create_dm_channel(user_id)
-    await REDIS_CLIENT.set(redis_key, dm_channel.id, ex=timedelta(hours=12))
+    await REDIS_CLIENT.set(
+        _dm_channel_redis_key(user_id), dm_channel.id, ex=DM_CHANNEL_TTL
+    )
     return dm_channel.id
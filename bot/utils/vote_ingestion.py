@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import commons
+
+from bot.utils.periodic_flusher import PeriodicFlusher
+from shared.utils import caching
+
+if TYPE_CHECKING:
+    from shared.tables import SuggestionsVoteTypeEnum
+
+logger = logging.getLogger(__name__)
+_UNKNOWN = object()
+
+
+class VoteOutcome(Enum):
+    CREATED = "Created"
+    CHANGED = "Changed"
+    UNCHANGED = "Unchanged"
+
+
+@dataclass(slots=True)
+class _BufferedVote:
+    vote_type: str
+    voter_display_name: str
+    attempts: int = 0
+
+
+class VoteIngestionBuffer(PeriodicFlusher):
+    """Acknowledges votes from memory and writes them to the DB in batches.
+
+    Notes
+    -----
+    Whether a vote is new, changed or a repeat is decided against the
+    buffered votes, then the votes currently being written, then the
+    voter's existing vote which is looked up and cached on first use.
+    Lookups don't wait on flushes, those made in the same loop
+    iteration are answered by a single query.
+
+    The vote counters are always computed by the database from the
+    rows being replaced so they can't drift if a cached vote is stale.
+
+    Once max_pending_votes are waiting, add writes them itself before
+    returning so a slow database can't grow the buffer without bound.
+
+    Interactions for a guild are always handled by the same cluster,
+    so a buffer per process sees every vote for the suggestions it holds.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: timedelta,
+        max_buffered_votes: int,
+        max_pending_votes: int,
+        max_flush_attempts: int = 3,
+        known_vote_ttl: timedelta = timedelta(minutes=10),
+    ) -> None:
+        super().__init__(flush_interval=flush_interval)
+        self.max_buffered_votes: int = max_buffered_votes
+        self.max_pending_votes: int = max_pending_votes
+        self.max_flush_attempts: int = max_flush_attempts
+        self._pending: dict[tuple[int, int], _BufferedVote] = {}
+        self._flushing: dict[tuple[int, int], _BufferedVote] = {}
+        self._known_votes: caching.LRUTimedCache[tuple[int, int], str | None] = (
+            caching.LRUTimedCache(max_size=50_000, ttl=known_vote_ttl)
+        )
+        self._lookups: dict[tuple[int, int], asyncio.Future[str | None]] = {}
+        self._lookup_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def add(
+        self,
+        *,
+        suggestion_id: int,
+        user_id: int,
+        vote: SuggestionsVoteTypeEnum,
+        voter_display_name: str,
+    ) -> VoteOutcome:
+        key = (suggestion_id, user_id)
+        previous = self._buffered_vote_type(key)
+        if previous is None:
+            existing = await self._get_existing_vote_type(key)
+            # Another vote from this user may have been buffered while we waited
+            previous = self._buffered_vote_type(key) or existing
+
+        if previous == vote.value:
+            return VoteOutcome.UNCHANGED
+
+        self._pending[key] = _BufferedVote(
+            vote_type=vote.value, voter_display_name=voter_display_name
+        )
+        if len(self._pending) >= self.max_pending_votes:
+            await self.flush()
+
+        elif len(self._pending) >= self.max_buffered_votes:
+            self.wake()
+
+        return VoteOutcome.CREATED if previous is None else VoteOutcome.CHANGED
+
+    def _buffered_vote_type(self, key: tuple[int, int]) -> str | None:
+        buffered = self._pending.get(key) or self._flushing.get(key)
+        if buffered is None:
+            return None
+
+        return buffered.vote_type
+
+    async def _get_existing_vote_type(self, key: tuple[int, int]) -> str | None:
+        existing = self._known_votes.get(key, _UNKNOWN)
+        if existing is not _UNKNOWN:
+            return existing
+
+        future = self._lookups.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            if not self._lookups:
+                # Let every vote arriving this iteration join the lookup
+                loop.call_soon(self._start_lookups)
+
+            self._lookups[key] = future
+
+        looked_up = await asyncio.shield(future)
+        # A flush which finished while we waited has the newer vote
+        existing = self._known_votes.get(key, _UNKNOWN)
+        return looked_up if existing is _UNKNOWN else existing
+
+    def _start_lookups(self) -> None:
+        batch, self._lookups = self._lookups, {}
+        task = asyncio.create_task(self._resolve_lookups(batch))
+        self._lookup_tasks.add(task)
+        task.add_done_callback(self._lookup_tasks.discard)
+
+    async def _resolve_lookups(
+        self, batch: dict[tuple[int, int], asyncio.Future[str | None]]
+    ) -> None:
+        try:
+            found = await self._fetch_vote_types(list(batch))
+        except Exception as e:  # noqa: BLE001
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            existing = found.get(key)
+            # Don't replace what a flush wrote since the query ran
+            if self._known_votes.get(key, _UNKNOWN) is _UNKNOWN:
+                self._known_votes.set(key, existing)
+
+            if not future.done():
+                future.set_result(existing)
+
+    @staticmethod
+    async def _fetch_vote_types(
+        keys: list[tuple[int, int]],
+    ) -> dict[tuple[int, int], str]:
+        from shared.tables import SuggestionVotes
+
+        votes_table = SuggestionVotes._meta.get_formatted_tablename()
+        rows = await SuggestionVotes.raw(
+            f"""
+            SELECT v."suggestion", v."user_id", v."vote_type"
+            FROM {votes_table} v
+            JOIN unnest({{}}::integer[], {{}}::bigint[]) AS k("suggestion", "user_id")
+            ON k."suggestion" = v."suggestion" AND k."user_id" = v."user_id"
+            """,  # noqa: S608
+            [suggestion_id for suggestion_id, _ in keys],
+            [user_id for _, user_id in keys],
+        )
+        return {(row["suggestion"], row["user_id"]): row["vote_type"] for row in rows}
+
+    async def flush(self) -> None:
+        """Write all buffered votes and their counter changes in one statement.
+
+        Each suggestion voted on has its message edit queued once
+        the votes are committed, so the edit renders with them.
+        """
+        edited: list[tuple[str, int]] = []
+        async with self._lock:
+            if not self._pending:
+                return
+
+            self._flushing, self._pending = self._pending, {}
+            try:
+                edited = await self._write_votes(self._flushing)
+
+            except Exception as e:  # noqa: BLE001
+                self._requeue_failed_flush(self._flushing, e)
+
+            else:
+                for key, buffered in self._flushing.items():
+                    self._known_votes.set(key, buffered.vote_type)
+
+                logger.debug("Flushed %s buffered votes", len(self._flushing))
+
+            finally:
+                self._flushing = {}
+
+        await self._queue_message_edits(edited)
+
+    @staticmethod
+    async def _queue_message_edits(edited: list[tuple[str, int]]) -> None:
+        from shared.saq.suggestions import queue_suggestion_edit
+
+        for suggestion_id, guild_id in edited:
+            try:
+                await queue_suggestion_edit(suggestion_id, guild_id)
+            except Exception as e:  # noqa: BLE001
+                # The votes are written, the next vote will queue an edit
+                logger.error(
+                    "Failed to queue an edit for %s after flushing votes",
+                    suggestion_id,
+                    extra={"traceback": commons.exception_as_string(e)},
+                )
+
+    def _requeue_failed_flush(
+        self, batch: dict[tuple[int, int], _BufferedVote], e: Exception
+    ) -> None:
+        dropped = 0
+        for key, buffered in batch.items():
+            buffered.attempts += 1
+            if buffered.attempts >= self.max_flush_attempts:
+                dropped += 1
+                continue
+
+            # A newer vote from the same user supersedes this one
+            self._pending.setdefault(key, buffered)
+
+        logger.error(
+            "Failed to flush %s buffered votes, dropped %s",
+            len(batch),
+            dropped,
+            extra={"traceback": commons.exception_as_string(e)},
+        )
+
+    @staticmethod
+    async def _write_votes(
+        batch: dict[tuple[int, int], _BufferedVote],
+    ) -> list[tuple[str, int]]:
+        """Returns the sID and guild id of every suggestion voted on."""
+        from shared.tables import (
+            GuildConfigs,
+            Suggestions,
+            SuggestionVotes,
+            SuggestionsVoteTypeEnum,
+        )
+        from shared.tables.mixins.audit import utc_now
+
+        votes_table = SuggestionVotes._meta.get_formatted_tablename()
+        suggestions_table = Suggestions._meta.get_formatted_tablename()
+        guilds_table = GuildConfigs._meta.get_formatted_tablename()
+        now = utc_now()
+        rows = await SuggestionVotes.raw(
+            f"""
+            WITH incoming AS (
+                SELECT * FROM unnest({{}}::integer[], {{}}::bigint[], {{}}::text[], {{}}::text[])
+                AS t("suggestion", "user_id", "vote_type", "voter_display_name_raw")
+            ),
+            previous AS (
+                SELECT v."id", v."suggestion", v."user_id", v."vote_type"
+                FROM {votes_table} v
+                JOIN incoming i
+                ON i."suggestion" = v."suggestion" AND i."user_id" = v."user_id"
+                FOR UPDATE OF v
+            ),
+            updated AS (
+                UPDATE {votes_table} v SET
+                    "vote_type" = i."vote_type",
+                    "last_modified_at" = {{}},
+                    "voter_display_name_raw" = COALESCE(
+                        v."voter_display_name_raw", i."voter_display_name_raw"
+                    )
+                FROM previous p
+                JOIN incoming i
+                ON i."suggestion" = p."suggestion" AND i."user_id" = p."user_id"
+                WHERE v."id" = p."id"
+            ),
+            inserted AS (
+                INSERT INTO {votes_table} (
+                    "created_at", "last_modified_at", "suggestion",
+                    "user_id", "vote_type", "voter_display_name_raw"
+                )
+                SELECT {{}}, {{}}, i."suggestion", i."user_id",
+                    i."vote_type", i."voter_display_name_raw"
+                FROM incoming i
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM previous p
+                    WHERE p."suggestion" = i."suggestion" AND p."user_id" = i."user_id"
+                )
+            ),
+            deltas AS (
+                SELECT i."suggestion",
+                    SUM(
+                        (i."vote_type" = {{}})::int
+                        - (p."vote_type" IS NOT DISTINCT FROM {{}})::int
+                    ) AS up_votes,
+                    SUM(
+                        (i."vote_type" = {{}})::int
+                        - (p."vote_type" IS NOT DISTINCT FROM {{}})::int
+                    ) AS down_votes
+                FROM incoming i
+                LEFT JOIN previous p
+                ON p."suggestion" = i."suggestion" AND p."user_id" = i."user_id"
+                GROUP BY i."suggestion"
+            )
+            UPDATE {suggestions_table} s
+            SET "up_votes" = s."up_votes" + deltas.up_votes,
+                "down_votes" = s."down_votes" + deltas.down_votes
+            FROM deltas, {guilds_table} g
+            WHERE s."id" = deltas."suggestion" AND g."id" = s."guild_configuration"
+            RETURNING s."sID", g."guild_id"
+            """,  # noqa: S608, E501
+            [suggestion_id for suggestion_id, _ in batch],
+            [user_id for _, user_id in batch],
+            [buffered.vote_type for buffered in batch.values()],
+            [buffered.voter_display_name for buffered in batch.values()],
+            now,
+            now,
+            now,
+            SuggestionsVoteTypeEnum.UpVote.value,
+            SuggestionsVoteTypeEnum.UpVote.value,
+            SuggestionsVoteTypeEnum.DownVote.value,
+            SuggestionsVoteTypeEnum.DownVote.value,
+        )
+        return [(row["sID"], row["guild_id"]) for row in rows]
+
+
+VOTE_BUFFER: VoteIngestionBuffer = VoteIngestionBuffer(
+    flush_interval=timedelta(milliseconds=250),
+    max_buffered_votes=500,
+    max_pending_votes=5_000,
+)
+"""Used by SuggestionMenu.handle_vote when BATCHED_VOTE_INGESTION is enabled."""
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import io
 import logging
-from typing import TYPE_CHECKING, cast
+import math
+from typing import TYPE_CHECKING
 
 import hikari
 
-from bot.constants import LOCALISATIONS
+from bot.constants import LOCALISATIONS, DEFAULT_UP_VOTE, DEFAULT_DOWN_VOTE
+from bot.utils.paginator_state import StatefulPaginator
 
 if TYPE_CHECKING:
     from hikari.api import (
@@ -13,81 +16,33 @@ if TYPE_CHECKING:
         MessageActionRowBuilder,
         TextDisplayComponentBuilder,
     )
-    import lightbulb
+    from shared.tables import SuggestionVotes, SuggestionsVoteTypeEnum
 
 
 log = logging.getLogger(__name__)
+VOTERS_PER_PAGE = 25
 
 
-class ViewVotersPaginator:
-    def __init__(
-        self,
-        *,
-        data: list[str],
-        ctx: lightbulb.Context,
-        locale: hikari.Locale,
-        pid: str,
-        link_id: str,
-        sid: str,
-    ) -> None:
-        self._current_page_index = 0
-        self._paged_data: list[str] = data
-        self._guild_id: int = cast("int", ctx.guild_id)
-        self._rest = ctx.interaction.app.rest
-        self._locale: hikari.Locale = locale
-        self._pid: str = pid
-        self._link_id: str = link_id
-        self.original_interaction: hikari.CommandInteraction = ctx.interaction
-        self.sid = sid
-
-    @property
-    def current_page(self) -> int:
-        """The current page for this paginator."""
-        return self._current_page_index + 1
-
-    @current_page.setter
-    def current_page(self, value: int) -> None:
-        # Wrap around
-        if value > self.total_pages:
-            self._current_page_index = 0
-        elif value <= 0:
-            self._current_page_index = self.total_pages - 1
-        else:
-            self._current_page_index = value - 1
+class ViewVotersPaginator(StatefulPaginator["list[SuggestionVotes]"]):
+    """Streams a suggestions voters a page at a time with an id cursor.
 
-    @property
-    def total_pages(self) -> int:
-        """How many pages exist in this paginator."""
-        return len(self._paged_data)
+    Notes
+    -----
+    The state holds the ids of the first and last vote on the current
+    page and a count of the vote rows, so only the page being shown is
+    ever fetched or rendered. Page turns follow the cursor rather than
+    the count, which is refreshed whenever the paginator wraps around.
 
-    @property
-    def pages(self) -> list[str]:
-        return self._paged_data
+    """
 
-    async def remove_current_page(self) -> None:
-        wrap = self.current_page == self.total_pages
-        self._paged_data.pop(self._current_page_index)
-        if wrap:
-            self.current_page = 1
-
-        if self.total_pages == 0:
-            await self.original_interaction.edit_initial_response(
-                components=[
-                    hikari.impl.TextDisplayComponentBuilder(
-                        content=LOCALISATIONS.get_localized_string(
-                            "menus.view_voters_paginator.responses.expired",
-                            self._locale,
-                        ),
-                    ),
-                ],
-            )
+    kind = "voters"
+    expired_key = "menus.view_voters_paginator.responses.expired"
 
-        else:
-            await self.original_interaction.edit_initial_response(
-                components=await self.format_page(),
-            )
+    @property
+    def total_pages(self) -> int:
+        return max(math.ceil(self._state.total / VOTERS_PER_PAGE), 1)
 
-    async def format_page(
+    async def start(
         self,
     ) -> (
         list[
@@ -97,12 +52,117 @@ class ViewVotersPaginator:
         ]
         | None
     ):
+        """Render the first page, returns None if there are no voters."""
+        await self._refresh_total()
+        votes = await self._fetch_votes()
+        if not votes:
+            return None
+
+        await self._show(votes, 0, edit=False)
+        return self.format_page(votes)
+
+    async def next_page(self) -> None:
+        index = self._state.page_index + 1
+        votes = await self._fetch_votes(after=self._state.cursor_end)
+        if not votes:
+            # Wrap around to the first page
+            await self._refresh_total()
+            index = 0
+            votes = await self._fetch_votes()
+
+        if not votes:
+            await self.stop_paginating()
+            return
+
+        await self._show(votes, index)
+
+    async def previous_page(self) -> None:
+        index = self._state.page_index - 1
+        votes = await self._fetch_votes(before=self._state.cursor)
+        if not votes:
+            # Wrap around to the last page, which may not be full
+            await self._refresh_total()
+            index = self.total_pages - 1
+            votes = await self._fetch_votes(
+                from_end=True,
+                limit=self._state.total - index * VOTERS_PER_PAGE,
+            )
 
-        components: list[
-            ContainerComponentBuilder
-            | MessageActionRowBuilder
-            | TextDisplayComponentBuilder
-        ] = [
+        if not votes:
+            await self.stop_paginating()
+            return
+
+        await self._show(votes, index)
+
+    async def _refresh_total(self) -> None:
+        from shared.tables import SuggestionVotes
+
+        self._state.total = await SuggestionVotes.count_for_suggestion(
+            self._state.suggestion_id, vote_type=self._vote_type
+        )
+
+    @property
+    def _vote_type(self) -> SuggestionsVoteTypeEnum | None:
+        from shared.tables import SuggestionsVoteTypeEnum
+
+        if self._state.vote_type is None:
+            return None
+
+        return SuggestionsVoteTypeEnum(self._state.vote_type)
+
+    async def _fetch_votes(
+        self,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+        from_end: bool = False,
+        limit: int = VOTERS_PER_PAGE,
+    ) -> list[SuggestionVotes]:
+        from shared.tables import SuggestionVotes
+
+        return await SuggestionVotes.fetch_voter_page(
+            self._state.suggestion_id,
+            vote_type=self._vote_type,
+            after=after,
+            before=before,
+            from_end=from_end,
+            limit=max(limit, 1),
+        )
+
+    async def _show(
+        self, votes: list[SuggestionVotes], index: int, *, edit: bool = True
+    ) -> None:
+        index = max(index, 0)
+        self._state.cursor = votes[0].id
+        self._state.cursor_end = votes[-1].id
+        # Votes cast since the count was taken still get a page
+        self._state.total = max(self._state.total, index * VOTERS_PER_PAGE + len(votes))
+        self._state.page_index = min(index, self.total_pages - 1)
+        await self.save()
+        if edit:
+            await self._edit_original_response(self.format_page(votes))
+
+    @staticmethod
+    def _render_votes(votes: list[SuggestionVotes]) -> str:
+        from shared.tables import SuggestionsVoteTypeEnum
+
+        text = io.StringIO()
+        for vote in votes:
+            emoji = (
+                DEFAULT_UP_VOTE
+                if vote.vote_type_enum == SuggestionsVoteTypeEnum.UpVote
+                else DEFAULT_DOWN_VOTE
+            )
+            text.write(f"{emoji} {vote.voter_display_name}\n")
+
+        return text.getvalue()
+
+    def format_page(
+        self, votes: list[SuggestionVotes]
+    ) -> list[
+        ContainerComponentBuilder | MessageActionRowBuilder | TextDisplayComponentBuilder
+    ]:
+        return [
             hikari.impl.TextDisplayComponentBuilder(
                 content=LOCALISATIONS.get_localized_string(
                     "menus.view_voters_paginator.responses.page.footer",
@@ -117,53 +177,30 @@ class ViewVotersPaginator:
                             "menus.view_voters_paginator.responses.page",
                             self._locale,
                             extras={
-                                "SID": self.sid,
-                                "DATA": self.pages[self._current_page_index],
+                                "SID": self._state.sid,
+                                "DATA": self._render_votes(votes),
                             },
                         ),
                     ),
                 ],
             ),
-        ]
-
-        components.extend(
-            [
-                hikari.impl.MessageActionRowBuilder(
-                    components=[
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.SECONDARY,
-                            emoji="\N{BLACK LEFT-POINTING TRIANGLE}\ufe0f",
-                            custom_id=f"v4_queue:back:{self._pid}::{self._link_id}",
-                        ),
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.SECONDARY,
-                            emoji="\N{BLACK SQUARE FOR STOP}\ufe0f",
-                            custom_id=f"v4_queue:stop:{self._pid}::{self._link_id}",
-                        ),
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.SECONDARY,
-                            emoji="\N{BLACK RIGHT-POINTING TRIANGLE}\ufe0f",
-                            custom_id=f"v4_queue:next:{self._pid}::{self._link_id}",
-                        ),
-                    ],
-                ),
-            ],
-        )
-        return components
-
-    async def update_message_with_current_page(self) -> None:
-        await self.original_interaction.edit_initial_response(
-            components=await self.format_page(),
-        )
-
-    async def stop_paginating(self) -> None:
-        await self.original_interaction.edit_initial_response(
-            components=[
-                hikari.impl.TextDisplayComponentBuilder(
-                    content=LOCALISATIONS.get_localized_string(
-                        "menus.view_voters_paginator.responses.expired",
-                        self._locale,
+            hikari.impl.MessageActionRowBuilder(
+                components=[
+                    hikari.impl.InteractiveButtonBuilder(
+                        style=hikari.ButtonStyle.SECONDARY,
+                        emoji="\N{BLACK LEFT-POINTING TRIANGLE}\ufe0f",
+                        custom_id=f"v4_queue:back:{self._pid}::{self._link_id}",
                     ),
-                ),
-            ],
-        )
+                    hikari.impl.InteractiveButtonBuilder(
+                        style=hikari.ButtonStyle.SECONDARY,
+                        emoji="\N{BLACK SQUARE FOR STOP}\ufe0f",
+                        custom_id=f"v4_queue:stop:{self._pid}::{self._link_id}",
+                    ),
+                    hikari.impl.InteractiveButtonBuilder(
+                        style=hikari.ButtonStyle.SECONDARY,
+                        emoji="\N{BLACK RIGHT-POINTING TRIANGLE}\ufe0f",
+                        custom_id=f"v4_queue:next:{self._pid}::{self._link_id}",
+                    ),
+                ],
+            ),
+        ]
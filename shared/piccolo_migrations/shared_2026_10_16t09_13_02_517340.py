@@ -0,0 +1,29 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.engine import engine_finder
+
+ID = "2026-10-16T09:13:02:517340"
+VERSION = "1.36.0"
+DESCRIPTION = "Backfill suggestion vote counters"
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="shared", description=DESCRIPTION
+    )
+
+    async def run():
+        q = """
+            UPDATE suggestions s
+            SET up_votes = (
+                SELECT COUNT(*) FROM suggestion_votes v
+                WHERE v.suggestion = s.id AND v.vote_type = 'UpVote'
+            ),
+            down_votes = (
+                SELECT COUNT(*) FROM suggestion_votes v
+                WHERE v.suggestion = s.id AND v.vote_type = 'DownVote'
+            )
+        """
+        await engine_finder().run_ddl(q)
+
+    manager.add_raw(run)
+    return manager
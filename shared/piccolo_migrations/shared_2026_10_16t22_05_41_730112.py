@@ -0,0 +1,31 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.engine import engine_finder
+
+ID = "2026-10-16T22:05:41:730112"
+VERSION = "1.36.0"
+DESCRIPTION = "Index votes for keyset pagination"
+
+
+async def forwards():
+    # Building the index concurrently can't happen inside a transaction
+    manager = MigrationManager(
+        migration_id=ID,
+        app_name="shared",
+        description=DESCRIPTION,
+        wrap_in_transaction=False,
+    )
+
+    async def run():
+        q = (
+            "create index concurrently if not exists suggestion_votes_suggestion_id "
+            "on suggestion_votes (suggestion, id)"
+        )
+        await engine_finder().run_ddl(q)
+
+    async def run_backwards():
+        q = "drop index concurrently if exists suggestion_votes_suggestion_id"
+        await engine_finder().run_ddl(q)
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+    return manager
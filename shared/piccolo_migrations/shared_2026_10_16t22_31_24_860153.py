@@ -0,0 +1,71 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.engine import engine_finder
+
+ID = "2026-10-16T22:31:24:860153"
+VERSION = "1.36.0"
+DESCRIPTION = "Record autocomplete changes from suggestion triggers"
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="shared", description=DESCRIPTION
+    )
+
+    async def run():
+        engine = engine_finder()
+        await engine.run_ddl(
+            """
+            CREATE OR REPLACE FUNCTION record_autocomplete_change() RETURNS trigger AS $$
+            DECLARE
+                changed RECORD;
+            BEGIN
+                IF TG_OP = 'UPDATE'
+                    AND NEW.state_raw IS NOT DISTINCT FROM OLD.state_raw THEN
+                    RETURN NEW;
+                END IF;
+
+                IF TG_OP = 'DELETE' THEN
+                    changed := OLD;
+                ELSE
+                    changed := NEW;
+                END IF;
+
+                INSERT INTO "autocomplete_changes"
+                    ("guild_id", "sID", "source", "present")
+                SELECT "guild_id", changed."sID", TG_ARGV[0],
+                    TG_OP <> 'DELETE' AND changed.state_raw <> TG_ARGV[1]
+                FROM "guild_configs" WHERE "id" = changed.guild_configuration;
+                RETURN changed;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        for tablename, source in (
+            ("suggestions", "Suggestion"),
+            ("queued_suggestions", "Queued"),
+        ):
+            trigger_name = f"{tablename}_autocomplete_change"
+            await engine.run_ddl(
+                f'DROP TRIGGER IF EXISTS {trigger_name} ON "{tablename}"'
+            )
+            await engine.run_ddl(
+                f"""
+                CREATE TRIGGER {trigger_name}
+                AFTER INSERT OR DELETE OR UPDATE OF state_raw ON "{tablename}"
+                FOR EACH ROW EXECUTE FUNCTION
+                record_autocomplete_change('{source}', 'Cleared')
+                """
+            )
+
+    async def run_backwards():
+        engine = engine_finder()
+        for tablename in ("suggestions", "queued_suggestions"):
+            await engine.run_ddl(
+                f'DROP TRIGGER IF EXISTS {tablename}_autocomplete_change ON "{tablename}"'
+            )
+
+        await engine.run_ddl("DROP FUNCTION IF EXISTS record_autocomplete_change()")
+
+    manager.add_raw(run)
+    manager.add_raw_backwards(run_backwards)
+    return manager
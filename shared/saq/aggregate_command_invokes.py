@@ -1,240 +1,224 @@
-from IPython.utils.decorators import F
-from curses import raw
 import asyncio
-
-import orjson
-from commons import timing
-from piccolo.columns.operators.comparison import GreaterThan, GreaterEqualThan, LessThan
 import datetime
 from collections import defaultdict
-from typing import cast
 
-import arrow
-from piccolo.columns import Where, And
-from piccolo.table import Table
-from pydantic import BaseModel
 from saq.types import Context
 
-from bot.tables import CommandInvokes, AggregateCommandInvokes
-from shared.utils import query_helpers
-
-
-type COMMAND_NAME = str
-type USER_LOCALE = str
-type GUILD_LOCALE = str
-type COMMAND_TYPE = str
-type COUNT = int
-type USER_ID = int
-type GUILD_ID = int
-type INVOKED_AT = datetime.datetime
-
+from bot.tables import (
+    AggregateCommandInvokes,
+    CommandInvokeDailyRollups,
+    CommandInvokes,
+    RollupDimension,
+)
+from shared.tables.mixins.audit import utc_now
+
+VOTE_ACTION = "Suggestion Vote"
+SUMMED_DIMENSIONS: tuple[RollupDimension, ...] = (
+    RollupDimension.ACTION,
+    RollupDimension.ACTION_TYPE,
+    RollupDimension.USER_LOCALE,
+    RollupDimension.GUILD_LOCALE,
+)
+
+
+def _start_of_day(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time(), tzinfo=datetime.UTC)
+
+
+async def roll_up_day(day: datetime.date) -> None:
+    """Count a single UTC day of CommandInvokes into CommandInvokeDailyRollups.
+
+    Re-running this for a day replaces its counts, so the
+    most recent partially rolled up day can safely be redone.
+    """
+    invokes_table = CommandInvokes._meta.get_formatted_tablename()
+    rollups_table = CommandInvokeDailyRollups._meta.get_formatted_tablename()
+    # Replacing the day's rows rather than upserting them means this
+    # doesn't rely on a unique constraint only the migrations create
+    async with CommandInvokeDailyRollups._meta.db.transaction():
+        await CommandInvokeDailyRollups.delete().where(
+            CommandInvokeDailyRollups.day == day
+        )
+        await CommandInvokeDailyRollups.raw(
+            f"""
+            WITH day_invokes AS (
+                SELECT "action", "action_type", "user_locale", "guild_locale",
+                    "user_id", "guild_id"
+                FROM {invokes_table}
+                WHERE "created_at" >= {{}} AND "created_at" < {{}}
+            ),
+            counts AS (
+                SELECT '{RollupDimension.ACTION}' AS dimension, "action" AS value,
+                    COUNT(*) AS total
+                FROM day_invokes GROUP BY "action"
+                UNION ALL
+                SELECT '{RollupDimension.ACTION_TYPE}', "action_type", COUNT(*)
+                FROM day_invokes GROUP BY "action_type"
+                UNION ALL
+                SELECT '{RollupDimension.USER_LOCALE}', "user_locale", COUNT(*)
+                FROM day_invokes WHERE "user_locale" IS NOT NULL GROUP BY "user_locale"
+                UNION ALL
+                SELECT '{RollupDimension.GUILD_LOCALE}', "guild_locale", COUNT(*)
+                FROM day_invokes WHERE "guild_locale" IS NOT NULL GROUP BY "guild_locale"
+                UNION ALL
+                SELECT '{RollupDimension.USER}', "user_id"::text, COUNT(*)
+                FROM day_invokes GROUP BY "user_id"
+                UNION ALL
+                SELECT '{RollupDimension.GUILD}', "guild_id"::text, COUNT(*)
+                FROM day_invokes WHERE "guild_id" IS NOT NULL GROUP BY "guild_id"
+                UNION ALL
+                SELECT '{RollupDimension.VOTER}', "user_id"::text, COUNT(*)
+                FROM day_invokes WHERE "action" = {{}} GROUP BY "user_id"
+            )
+            INSERT INTO {rollups_table} ("day", "dimension", "value", "total")
+            SELECT {{}}, dimension, value, total FROM counts
+            """,  # noqa: S608
+            _start_of_day(day),
+            _start_of_day(day + datetime.timedelta(days=1)),
+            VOTE_ACTION,
+            day,
+        )
 
-class RawComputedData(BaseModel):
-    """The base data to store alongside computed stats."""
 
-    data_for_week_starting: datetime.datetime
-    actions: dict[COMMAND_NAME, COUNT] = defaultdict(lambda: 0)
-    action_types: dict[COMMAND_TYPE, COUNT] = defaultdict(lambda: 0)
-    user_locales: dict[USER_LOCALE, COUNT] = defaultdict(lambda: 0)
-    guild_locales: dict[GUILD_LOCALE, COUNT] = defaultdict(lambda: 0)
-    user_usage_counters: dict[USER_ID, list[INVOKED_AT]] = defaultdict(list)
-    guild_usage_counters: dict[GUILD_ID, list[INVOKED_AT]] = defaultdict(list)
-    actions_invoked_by: dict[COMMAND_NAME, dict[USER_ID, list[INVOKED_AT]]] = defaultdict(
-        lambda: defaultdict(list)
-    )
-    action_types_invoked_by: dict[COMMAND_TYPE, dict[USER_ID, list[INVOKED_AT]]] = (
-        defaultdict(lambda: defaultdict(list))
+async def compose_week(week_starting: datetime.date) -> AggregateCommandInvokes:
+    """Build a weeks aggregate from its seven daily rollups."""
+    rollups_table = CommandInvokeDailyRollups._meta.get_formatted_tablename()
+    week_ending = week_starting + datetime.timedelta(weeks=1)
+    summed_rows = await CommandInvokeDailyRollups.raw(
+        f"""
+        SELECT "dimension", "value", SUM("total") AS total
+        FROM {rollups_table}
+        WHERE "day" >= {{}} AND "day" < {{}} AND "dimension" = ANY({{}})
+        GROUP BY "dimension", "value"
+        """,  # noqa: S608
+        week_starting,
+        week_ending,
+        [dimension.value for dimension in SUMMED_DIMENSIONS],
     )
-
-
-async def compute_base_data_for_week(
-    ctx: Context, week_starting: arrow.Arrow
-) -> RawComputedData:
-    raw_data = RawComputedData(data_for_week_starting=week_starting.datetime)
-    where_classes = And(
-        Where(
-            CommandInvokes.created_at, week_starting.datetime, operator=GreaterEqualThan
+    summed: dict[str, dict[str, int]] = defaultdict(dict)
+    for row in summed_rows:
+        summed[row["dimension"]][row["value"]] = int(row["total"])
+
+    # A user only voted if every invocation they made was a vote
+    distinct_rows = await CommandInvokeDailyRollups.raw(
+        f"""
+        WITH week AS (
+            SELECT "dimension", "value", "total"
+            FROM {rollups_table}
+            WHERE "day" >= {{}} AND "day" < {{}}
         ),
-        Where(
-            CommandInvokes.created_at,
-            week_starting.shift(weeks=1).datetime,
-            operator=LessThan,
-        ),
-    )
-    await ctx["job"].update()
-    async for row in query_helpers.iterate_over_table(
-        CommandInvokes, where_clause=where_classes
-    ):
-        raw_data.actions[cast("COMMAND_NAME", row.action)] += 1
-        raw_data.action_types[cast("COMMAND_TYPE", row.action_type)] += 1
-        raw_data.user_locales[cast("USER_LOCALE", row.user_locale)] += 1
-        if row.guild_locale is not None:
-            raw_data.guild_locales[cast("GUILD_LOCALE", row.guild_locale)] += 1
-            raw_data.user_usage_counters[cast("USER_ID", row.user_id)].append(
-                cast(
-                    "INVOKED_AT",
-                    row.created_at,
-                )
-            )
-        if row.guild_id is not None:
-            raw_data.guild_usage_counters[cast("GUILD_ID", row.guild_id)].append(
-                cast(
-                    "INVOKED_AT",
-                    row.created_at,
-                )
-            )
-        raw_data.actions_invoked_by[cast("COMMAND_NAME", row.action)][
-            cast("USER_ID", row.user_id)
-        ].append(
-            cast(
-                "INVOKED_AT",
-                row.created_at,
-            )
+        per_user AS (
+            SELECT
+                SUM("total") FILTER (WHERE "dimension" = '{RollupDimension.USER}')
+                    AS invokes,
+                SUM("total") FILTER (WHERE "dimension" = '{RollupDimension.VOTER}')
+                    AS votes
+            FROM week
+            WHERE "dimension" IN ('{RollupDimension.USER}', '{RollupDimension.VOTER}')
+            GROUP BY "value"
         )
-        raw_data.action_types_invoked_by[cast("COMMAND_TYPE", row.action_type)][
-            cast("USER_ID", row.user_id)
-        ].append(
-            cast(
-                "INVOKED_AT",
-                row.created_at,
-            )
-        )
-        await ctx["job"].update()
-
-    return raw_data
-
-
-class WeeklyAggregateData(BaseModel):
-    total_users_seen: int = 0
-    total_guilds_seen: int = 0
-    total_voters_seen: int = 0
-    total_users_who_only_voted: int = 0
-    actions: dict[COMMAND_NAME, COUNT] = defaultdict(lambda: 0)
-    action_types: dict[COMMAND_TYPE, COUNT] = defaultdict(lambda: 0)
-    user_locales: dict[USER_LOCALE, COUNT] = defaultdict(lambda: 0)
-    guild_locales: dict[GUILD_LOCALE, COUNT] = defaultdict(lambda: 0)
-    raw_data: RawComputedData
-    data_for_week_starting: datetime.datetime
-
-
-async def calculate_weekly_aggregate(
-    ctx: Context, raw_data: RawComputedData
-) -> WeeklyAggregateData:
-    await ctx["job"].update()
-    data = WeeklyAggregateData(
-        raw_data=raw_data, data_for_week_starting=raw_data.data_for_week_starting
+        SELECT
+            (SELECT COUNT(DISTINCT "value") FROM week
+                WHERE "dimension" = '{RollupDimension.USER}') AS users,
+            (SELECT COUNT(DISTINCT "value") FROM week
+                WHERE "dimension" = '{RollupDimension.GUILD}') AS guilds,
+            (SELECT COUNT(*) FROM per_user WHERE votes IS NOT NULL) AS voters,
+            (SELECT COUNT(*) FROM per_user WHERE votes = invokes) AS only_voted
+        """,  # noqa: S608
+        week_starting,
+        week_ending,
     )
-    data.total_users_seen = len(raw_data.user_usage_counters.keys())
-    data.total_guilds_seen = len(raw_data.guild_usage_counters.keys())
-    data.user_locales = raw_data.user_locales
-    data.guild_locales = raw_data.guild_locales
-    data.actions = raw_data.actions
-    data.action_types = raw_data.action_types
-
-    users_seen_voting = set(
-        raw_data.actions_invoked_by[cast("COMMAND_NAME", "Suggestion Vote")].keys()
-    )
-    users_seen_running_commands: set = set()
-    for k, v in raw_data.actions_invoked_by.items():
-        if k == "Suggestion Vote":
-            continue
-        users_seen_running_commands.update(v)
-
-    data.total_voters_seen = len(users_seen_voting)
-    data.total_users_who_only_voted = len(
-        users_seen_voting.difference(users_seen_running_commands)
+    distinct = distinct_rows[0]
+    return AggregateCommandInvokes(
+        total_users_seen=distinct["users"],
+        total_guilds_seen=distinct["guilds"],
+        total_voters_seen=distinct["voters"],
+        total_users_who_only_voted=distinct["only_voted"],
+        actions=summed[RollupDimension.ACTION],
+        action_types=summed[RollupDimension.ACTION_TYPE],
+        user_locales=summed[RollupDimension.USER_LOCALE],
+        guild_locales=summed[RollupDimension.GUILD_LOCALE],
+        raw_data={
+            "composed_from_daily_rollups": [
+                week_starting.isoformat(),
+                (week_ending - datetime.timedelta(days=1)).isoformat(),
+            ]
+        },
+        data_for_week_starting=_start_of_day(week_starting),
     )
 
-    return data
 
+async def _first_day_to_roll_up() -> datetime.date | None:
+    last_rolled_up = await CommandInvokeDailyRollups.raw(
+        "SELECT MAX(day) FROM command_invoke_daily_rollups"
+    )
+    if last_rolled_up[0]["max"] is not None:
+        # The last day rolled up may only have been partially complete
+        return last_rolled_up[0]["max"]
 
-def stringify_keys(data: dict) -> dict:
-    """Make compliant JSON."""
-    return orjson.loads(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    first_invoke = await CommandInvokes.raw("SELECT MIN(created_at) FROM command_invokes")
+    if first_invoke[0]["min"] is None:
+        return None
 
+    return first_invoke[0]["min"].astimezone(datetime.UTC).date()
 
-async def compute_aggregate_command_invokes(
-    ctx: Context, *, force_load_short_week: bool = False
-) -> None:
-    from web.constants import REDIS_CLIENT
 
-    min_datetime_str = await CommandInvokes.raw(
-        "SELECT MIN(created_at) FROM command_invokes"
-    )
-    max_datetime_str = await CommandInvokes.raw(
-        "SELECT MAX(created_at) FROM command_invokes"
+async def _first_week_to_compose() -> datetime.date:
+    week_already_done = await AggregateCommandInvokes.raw(
+        "SELECT MAX(data_for_week_starting) FROM aggregate_command_invokes"
     )
-    if min_datetime_str[0]["min"] is None:
-        # No command data yet
-        return
+    if week_already_done[0]["max"] is None:
+        first_rolled_up = await CommandInvokeDailyRollups.raw(
+            "SELECT MIN(day) FROM command_invoke_daily_rollups"
+        )
+        return first_rolled_up[0]["min"]
 
-    min_week = arrow.get(min_datetime_str[0]["min"])
-    max_week = arrow.get(max_datetime_str[0]["max"])
+    # Weeks computed before daily rollups may not start at midnight
+    last_week: datetime.datetime = week_already_done[0]["max"]
+    return (last_week.astimezone(datetime.UTC) + datetime.timedelta(weeks=1)).date()
 
-    week_already_done_str = await CommandInvokes.raw(
-        "SELECT MAX(data_for_week_starting) FROM aggregate_command_invokes"
-    )
-    if week_already_done_str and week_already_done_str[0]["max"] is not None:
-        current_week = arrow.get(week_already_done_str[0]["max"]).shift(weeks=1)
-
-        # If less then a week of data left to compute we
-        # finish up and wait until we have an actual weeks worth
-        if (
-            timing.is_within_next_(
-                current_week.datetime,
-                max_week.datetime,
-                datetime.timedelta(weeks=1),
-            )
-            and not force_load_short_week
-        ):
-            return
 
-    else:
-        # If no aggregate data, start from start
-        current_week = min_week
+async def compute_aggregate_command_invokes(
+    ctx: Context, *, force_load_short_week: bool = False
+) -> None:
+    from web.constants import REDIS_CLIENT
 
-    # Expensive call, dont want to run duplicates and clog saq
+    # Don't want to run duplicates and clog saq
     key = "saq:compute_aggregate_command_invokes_is_running"
     already_running = await REDIS_CLIENT.get(key)
     if already_running:
         return
 
     await REDIS_CLIENT.set(key, 1, ex=datetime.timedelta(hours=6))
+    try:
+        first_day = await _first_day_to_roll_up()
+        if first_day is None:
+            # No command data yet
+            return
 
-    raw_data_rows: list[RawComputedData] = []
-    while not timing.is_in_the_past(current_week.datetime, max_week.datetime):
-        raw_data_rows.append(await compute_base_data_for_week(ctx, current_week))
-        current_week = current_week.shift(weeks=1)
-
-        # If less then a week of data left to compute we
-        # finish up and wait until we have an actual weeks worth
-        if (
-            timing.is_within_next_(
-                current_week.datetime,
-                max_week.datetime,
-                datetime.timedelta(weeks=1),
-            )
-            and not force_load_short_week
-        ):
-            break
-
-    aggregate_rows: list[WeeklyAggregateData] = [
-        await calculate_weekly_aggregate(ctx, raw_data) for raw_data in raw_data_rows
-    ]
-    for row in aggregate_rows:
-        db_row = AggregateCommandInvokes(
-            total_users_seen=row.total_users_seen,
-            total_guilds_seen=row.total_guilds_seen,
-            total_voters_seen=row.total_voters_seen,
-            total_users_who_only_voted=row.total_users_who_only_voted,
-            actions=stringify_keys(row.actions),
-            action_types=stringify_keys(row.action_types),
-            user_locales=stringify_keys(row.user_locales),
-            guild_locales=stringify_keys(row.guild_locales),
-            raw_data=stringify_keys(row.raw_data.model_dump()),
-            data_for_week_starting=row.data_for_week_starting,
-        )
-        await db_row.save()
+        today = utc_now().date()
+        day = first_day
+        while day <= today:
+            await roll_up_day(day)
+            await ctx["job"].update()
+            day += datetime.timedelta(days=1)
+
+        week_starting = await _first_week_to_compose()
+        while week_starting <= today:
+            # Wait until we have an actual weeks worth
+            # unless asked to finish up with what we have
+            if (
+                week_starting + datetime.timedelta(weeks=1) > today
+                and not force_load_short_week
+            ):
+                break
+
+            await (await compose_week(week_starting)).save()
+            await ctx["job"].update()
+            week_starting += datetime.timedelta(weeks=1)
+
+    finally:
+        await REDIS_CLIENT.delete(key)
 
 
 if __name__ == "__main__":
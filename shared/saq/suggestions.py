@@ -1,4 +1,5 @@
-from typing import cast
+from collections.abc import AsyncGenerator
+from typing import NamedTuple, cast
 
 from shared.saq.worker import SAQ_QUEUE
 import contextlib
@@ -11,8 +12,11 @@ import hikari
 
 from bot import constants as b_constants
 from shared import utils
-from shared.utils import query_helpers
+from shared.utils import channel_rate_limits
+from shared.utils.autocomplete import AutocompleteIndex
 from shared.tables import (
+    AutocompleteChanges,
+    AutocompleteSourceEnum,
     Suggestions,
     QueuedSuggestions,
     SuggestionStateEnum,
@@ -20,9 +24,64 @@ from shared.tables import (
 )
 from shared.utils.configs import ensure_guild_config
 from web import constants
-from web.constants import REDIS_CLIENT
 
 log = logging.getLogger(__name__)
+AUTOCOMPLETE_INDEXES: dict[AutocompleteSourceEnum, tuple[AutocompleteIndex, ...]] = {
+    AutocompleteSourceEnum.Suggestion: (
+        "suggestion_sid_autocomplete_index",
+        "shared_sid_autocomplete_index",
+    ),
+    AutocompleteSourceEnum.Queued: (
+        "queue_sid_autocomplete_index",
+        "shared_sid_autocomplete_index",
+    ),
+}
+AUTOCOMPLETE_CHANGES_BATCH_SIZE = 5_000
+EDIT_DELAY_COLD = timedelta(seconds=1)
+EDIT_DELAY_HOT = timedelta(seconds=10)
+EDIT_RATE_WINDOW = timedelta(minutes=1)
+"""Edits requested within this long of each other count towards how hot it is"""
+
+
+class SuggestionEditFlags(NamedTuple):
+    exclude_buttons: bool = False
+    as_resolved: bool = False
+
+
+def _pending_edit_key(suggestion_id: str) -> str:
+    return f"saq:suggestion_edit_flags:{suggestion_id}"
+
+
+def _claimed_edit_key(suggestion_id: str, job_key: str) -> str:
+    return f"{_pending_edit_key(suggestion_id)}:claimed:{job_key}"
+
+
+def suggestion_edit_delay(recent_edits: int) -> timedelta:
+    """How long to wait before editing, so busy suggestions are batched.
+
+    A suggestion nobody else is touching is edited almost straight
+    away, each extra edit within EDIT_RATE_WINDOW waits a little
+    longer up until EDIT_DELAY_HOT.
+    """
+    return min(EDIT_DELAY_COLD * max(recent_edits, 1), EDIT_DELAY_HOT)
+
+
+async def _enqueue_suggestion_edit(
+    suggestion_id: str, guild_id: int, delay: timedelta
+) -> None:
+    from shared.saq.worker import SAQ_QUEUE
+
+    try:
+        await SAQ_QUEUE.enqueue(
+            "edit_suggestion_message",
+            suggestion_id=suggestion_id,
+            guild_id=guild_id,
+            scheduled=time.time() + delay.total_seconds(),
+        )
+    except Exception:
+        # Otherwise every later edit would merge into a job which doesn't exist
+        await constants.REDIS_CLIENT.srem(_pending_edit_key(suggestion_id), "pending")
+        raise
 
 
 async def queue_suggestion_edit(
@@ -31,28 +90,144 @@ async def queue_suggestion_edit(
     exclude_buttons: bool = False,
     as_resolved: bool = False,
 ) -> None:
-    redis_key = f"saq:queue_suggestion_edit:{suggestion_id}"
-    result = await REDIS_CLIENT.set(
-        redis_key, suggestion_id, nx=True, ex=timedelta(seconds=9)
-    )
-    if result is None:
-        # There is already a queued edit
+    """Queue an edit, merging it into any edit which is already queued.
+
+    Notes
+    -----
+    Flags are only ever set, never cleared, while an edit is pending
+    so the job renders with every flag any caller asked for. They
+    live until that job claims them rather than for a fixed time,
+    so a backed up queue can't drop them.
+    """
+    pending_key = _pending_edit_key(suggestion_id)
+    rate_key = f"saq:suggestion_edit_rate:{suggestion_id}"
+    async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        if exclude_buttons:
+            pipe.sadd(pending_key, "exclude_buttons")
+        if as_resolved:
+            pipe.sadd(pending_key, "as_resolved")
+
+        pipe.sadd(pending_key, "pending")
+        pipe.incr(rate_key)
+        pipe.expire(rate_key, EDIT_RATE_WINDOW)
+        *_, newly_pending, recent_edits, _ = await pipe.execute()
+
+    if not newly_pending:
+        # There is already a queued edit which will pick these flags up
         return
 
-    from shared.saq.worker import SAQ_QUEUE
+    await _enqueue_suggestion_edit(
+        suggestion_id, guild_id, suggestion_edit_delay(recent_edits)
+    )
+
 
-    await SAQ_QUEUE.enqueue(
-        "edit_suggestion_message",
-        suggestion_id=suggestion_id,
-        guild_id=guild_id,
-        exclude_buttons=exclude_buttons,
-        as_resolved=as_resolved,
-        scheduled=time.time() + 10,
+async def claim_suggestion_edit_flags(
+    suggestion_id: str, job_key: str, *, ttl: timedelta | None = None
+) -> SuggestionEditFlags:
+    """Claim the flags for a pending edit so later edits queue a new job.
+
+    The flags are moved under job_key rather than deleted, they are
+    only removed by release_suggestion_edit_flags once the edit has
+    been made. Claiming again with the same job_key picks them back up.
+    """
+    pending_key = _pending_edit_key(suggestion_id)
+    claimed_key = _claimed_edit_key(suggestion_id, job_key)
+    async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        pipe.sunionstore(claimed_key, [claimed_key, pending_key])
+        pipe.srem(claimed_key, "pending")
+        pipe.delete(pending_key)
+        if ttl is not None:
+            pipe.expire(claimed_key, ttl)
+        pipe.smembers(claimed_key)
+        *_, flags = await pipe.execute()
+
+    return SuggestionEditFlags(
+        exclude_buttons=b"exclude_buttons" in flags,
+        as_resolved=b"as_resolved" in flags,
     )
 
 
+async def release_suggestion_edit_flags(suggestion_id: str, job_key: str) -> None:
+    """Forget claimed flags now the edit using them has been made."""
+    await constants.REDIS_CLIENT.delete(_claimed_edit_key(suggestion_id, job_key))
+
+
+async def return_suggestion_edit_flags(
+    suggestion_id: str, job_key: str, *, mark_pending: bool = False
+) -> bool:
+    """Hand claimed flags back so the next edit renders with them.
+
+    Returns
+    -------
+    bool
+        Whether this marked the edit as pending, in which case
+        the caller is responsible for queueing the job.
+    """
+    pending_key = _pending_edit_key(suggestion_id)
+    claimed_key = _claimed_edit_key(suggestion_id, job_key)
+    async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        pipe.sunionstore(pending_key, [pending_key, claimed_key])
+        pipe.delete(claimed_key)
+        if mark_pending:
+            pipe.sadd(pending_key, "pending")
+        results = await pipe.execute()
+
+    return mark_pending and bool(results[-1])
+
+
+async def defer_suggestion_edit(
+    suggestion_id: str,
+    guild_id: int,
+    delay: timedelta,
+    job_key: str,
+) -> None:
+    """Put a claimed edit back as pending and run it again after delay.
+
+    Edits queued in the meantime merge into this one rather than
+    queueing jobs of their own which would also have to wait.
+    """
+    if await return_suggestion_edit_flags(suggestion_id, job_key, mark_pending=True):
+        await _enqueue_suggestion_edit(suggestion_id, guild_id, delay)
+
+
 async def edit_suggestion_message(
-    _, suggestion_id: str, guild_id: int, exclude_buttons: bool, as_resolved: bool
+    ctx,
+    suggestion_id: str,
+    guild_id: int,
+    exclude_buttons: bool = False,
+    as_resolved: bool = False,
+) -> None:
+    job = ctx["job"]
+    # Jobs queued before flags were merged in redis still pass them directly
+    flags = await claim_suggestion_edit_flags(
+        suggestion_id,
+        job.key,
+        # A worker dying mid job can't hand them back, so hold them no
+        # longer than the job itself may run for
+        ttl=timedelta(seconds=job.timeout) if job.timeout else None,
+    )
+    try:
+        await _edit_suggestion_message(
+            suggestion_id,
+            guild_id,
+            job.key,
+            exclude_buttons=exclude_buttons or flags.exclude_buttons,
+            as_resolved=as_resolved or flags.as_resolved,
+        )
+    except BaseException:
+        await return_suggestion_edit_flags(suggestion_id, job.key)
+        raise
+
+    await release_suggestion_edit_flags(suggestion_id, job.key)
+
+
+async def _edit_suggestion_message(
+    suggestion_id: str,
+    guild_id: int,
+    job_key: str,
+    *,
+    exclude_buttons: bool,
+    as_resolved: bool,
 ) -> None:
     suggestion = await Suggestions.fetch_suggestion(suggestion_id, guild_id)
     if suggestion is None:
@@ -73,20 +248,20 @@ async def edit_suggestion_message(
         )
         return
 
-    async with constants.DISCORD_REST_CLIENT.acquire(
+    async with constants.DISCORD_EDIT_REST_CLIENT.acquire(
         constants.BOT_TOKEN, hikari.TokenType.BOT
     ) as client:
         guild_config = await ensure_guild_config(suggestion.guild_id)
-        components = await suggestion.as_components(
-            guild_config=guild_config,
-            locale=guild_config.primary_language,
-            rest=client,
-            localisations=b_constants.LOCALISATIONS,
-            exclude_buttons=exclude_buttons,
-            as_resolved=as_resolved,
-        )
 
-        try:
+        async def edit() -> None:
+            components = await suggestion.as_components(
+                guild_config=guild_config,
+                locale=guild_config.primary_language,
+                rest=client,
+                localisations=b_constants.LOCALISATIONS,
+                exclude_buttons=exclude_buttons,
+                as_resolved=as_resolved,
+            )
             await client.edit_message(
                 suggestion.channel_id,
                 suggestion.message_id,
@@ -95,6 +270,11 @@ async def edit_suggestion_message(
                 # to ensure we remain backwards compatible
                 embeds=None,
             )
+
+        try:
+            wait = await channel_rate_limits.dispatch_channel_edit(
+                suggestion.channel_id, edit
+            )
         except hikari.NotFoundError:
             log.error(
                 "Suggestion was not found when attempting to edit",
@@ -112,51 +292,144 @@ async def edit_suggestion_message(
                 "notify_guild_of_missing_suggestion_permissions",
                 guild_id=guild_config.guild_id,
             )
+        else:
+            if wait > 0:
+                # Free this worker slot for other channels rather than
+                # sleeping until this channel has capacity again
+                await defer_suggestion_edit(
+                    suggestion_id, guild_id, timedelta(seconds=wait), job_key
+                )
 
 
-async def populate_sid_autocomplete(ctx):
-    """Populates autocomplete of all queued and regular suggestion sids when called.
+async def _iterate_autocomplete_entries(
+    page_size: int = 5_000,
+) -> AsyncGenerator[tuple[int, str, tuple[AutocompleteIndex, ...]]]:
+    """Yield every non cleared suggestion as (guild_id, sID, indexes).
 
-    We shouldn't need to do this often given they add themselves but it
-    will help ensure the consistency of data if I miss something
+    Only the columns autocomplete needs are selected, walking
+    each table by id so no page has to be offset into.
     """
-    await utils.delete_autocomplete_cache(ctx["job"])
-    for table in [Suggestions, QueuedSuggestions]:
-        async for row in query_helpers.iterate_over_table(
-            table,
-            [table.guild_configuration],
-        ):
-            # Won't duplicate entries if already present :)
-            if isinstance(row, Suggestions):
-                if row.state == SuggestionStateEnum.CLEARED:
-                    # Dont add cleared suggestions to autocomplete
-                    continue
-
-                await utils.cache_sid_in_autocomplete(
-                    guild_id=row.guild_configuration.guild_id,
-                    suggestion_id=row.sID,
-                    index="suggestion_sid_autocomplete_index",
-                )
-                await utils.cache_sid_in_autocomplete(
-                    guild_id=row.guild_configuration.guild_id,
-                    suggestion_id=row.sID,
-                    index="shared_sid_autocomplete_index",
+    tables = (
+        (
+            Suggestions,
+            SuggestionStateEnum.CLEARED.value,
+            AUTOCOMPLETE_INDEXES[AutocompleteSourceEnum.Suggestion],
+        ),
+        (
+            QueuedSuggestions,
+            QueuedSuggestionStateEnum.CLEARED.value,
+            AUTOCOMPLETE_INDEXES[AutocompleteSourceEnum.Queued],
+        ),
+    )
+    for table, cleared_state, indexes in tables:
+        cursor = 0
+        while True:
+            rows = (
+                await table.select(
+                    table.id,
+                    table.sID,
+                    table.guild_configuration.guild_id.as_alias("guild_id"),
                 )
-            else:
-                if row.state == QueuedSuggestionStateEnum.CLEARED:
-                    # Dont add cleared suggestions to autocomplete
-                    continue
+                .where(table.id > cursor)
+                # Dont add cleared suggestions to autocomplete
+                .where(table.state_raw != cleared_state)
+                .order_by(table.id)
+                .limit(page_size)
+            )
+            for row in rows:
+                yield row["guild_id"], row["sID"], indexes
 
-                await utils.cache_sid_in_autocomplete(
-                    guild_id=row.guild_configuration.guild_id,
-                    suggestion_id=row.sID,
-                    index="queue_sid_autocomplete_index",
-                )
-                await utils.cache_sid_in_autocomplete(
-                    guild_id=row.guild_configuration.guild_id,
+            if len(rows) < page_size:
+                break
+
+            cursor = rows[-1]["id"]
+
+
+async def sync_autocomplete_changes(ctx) -> int:
+    """Apply everything recorded in AutocompleteChanges to autocomplete.
+
+    Returns how many changes were consumed.
+    """
+    # Applying batches out of order could resurrect removed sIDs
+    key = "saq:sync_autocomplete_changes_is_running"
+    token = await utils.acquire_lock(key, timedelta(minutes=10))
+    if token is None:
+        return 0
+
+    consumed = 0
+    try:
+        # Stop if the lock expired, another run may own the outbox now
+        while await utils.holds_lock(key, token):
+            rows = await AutocompleteChanges.fetch_oldest(AUTOCOMPLETE_CHANGES_BATCH_SIZE)
+            if not rows:
+                break
+
+            # Only the latest change per sID matters
+            latest: dict[tuple[AutocompleteSourceEnum, str], AutocompleteChanges] = {}
+            for row in rows:
+                latest[(row.source_enum, row.sID)] = row
+
+            await utils.apply_autocomplete_changes(
+                utils.AutocompleteChange(
+                    guild_id=row.guild_id,
                     suggestion_id=row.sID,
-                    index="shared_sid_autocomplete_index",
+                    indexes=AUTOCOMPLETE_INDEXES[source],
+                    present=row.present,
                 )
+                for (source, _), row in latest.items()
+            )
+            await AutocompleteChanges.delete_consumed([row.id for row in rows])
+            consumed += len(rows)
+            await ctx["job"].update()
+            if len(rows) < AUTOCOMPLETE_CHANGES_BATCH_SIZE:
+                break
+
+    finally:
+        # Only release our own lock, not one taken after ours expired
+        await utils.release_lock(key, token)
+
+    return consumed
+
+
+async def populate_sid_autocomplete(ctx):
+    """Rebuild autocomplete for every queued and regular suggestion sid.
+
+    Day to day autocomplete is kept up to date by sync_autocomplete_changes,
+    this is a consistency check so any drift it finds is worth looking into
+    """
+    started_at = time.perf_counter()
+    result = await utils.rebuild_autocomplete_cache(
+        _iterate_autocomplete_entries(), ctx["job"]
+    )
+    log.log(
+        logging.WARNING if result.drifted_keys else logging.INFO,
+        "Rebuilt autocomplete for %s suggestions in %.2fs, %s indexes had drifted",
+        result.written,
+        time.perf_counter() - started_at,
+        result.drifted_keys,
+        extra={
+            "autocomplete.written": result.written,
+            "autocomplete.drifted_keys": result.drifted_keys,
+            "autocomplete.drifted_entries": result.drifted_entries,
+        },
+    )
+
+
+async def repair_suggestion_vote_counts(_) -> int:
+    """Recompute every suggestions vote counters from its votes.
+
+    The counters are maintained as votes are cast so this should
+    find nothing, anything it does repair is worth looking into
+    """
+    repaired = await Suggestions.repair_vote_counts()
+    if repaired:
+        log.warning(
+            "Repaired vote counters for %s suggestions",
+            repaired,
+            extra={"suggestion.repaired_count": repaired},
+        )
+
+    return repaired
 
 
 async def test_message_send(_):
@@ -1,11 +1,10 @@
-import inspect
 import logging
 
 import hikari
 
 from bot.constants import LOCALISATIONS
-from bot.utils import cv2, HandleClientHTTPResponse
-from bot.utils.users import fetch_user_dm_channel_id
+from bot.utils import cv2
+from bot.utils.notifications import RenderedMessages, fan_out_notification
 from shared.tables import Suggestions, QueuedSuggestions
 from shared.utils import configs
 from web import constants
@@ -25,39 +24,30 @@ async def queued_suggestion_resolved_notifications(_, suggestion_id: str, guild_
         )
         return
 
-    user_config = await configs.ensure_user_config(suggestion.author_id)
+    recipients = [await configs.ensure_user_config(suggestion.author_id)]
     async with constants.DISCORD_REST_CLIENT.acquire(
         constants.BOT_TOKEN, hikari.TokenType.BOT
     ) as client:
-        try:
-            dm_channel = await fetch_user_dm_channel_id(user_config.user_id, rest=client)
+
+        async def render(locale: hikari.Locale) -> RenderedMessages:
             (
                 message_components,
                 suggestion_components,
             ) = await cv2.build_queued_user_resolution_notification(
-                user_config=user_config, suggestion=suggestion, rest=client
-            )
-            async with HandleClientHTTPResponse(
-                inspect.currentframe().f_code.co_name,  # ty:ignore[unresolved-attribute],
-                f"queued_suggestion_id={suggestion.id}",
-            ):
-                await client.create_message(dm_channel, components=message_components)
-                if suggestion_components is not None:
-                    await client.create_message(
-                        dm_channel, components=suggestion_components
-                    )
-
-        except hikari.ForbiddenError:
-            # I'd consider it 'fine' if the bot can't send this message
-            logger.debug(
-                "Failed to dm user about a queued suggestion resolution",
-                extra={
-                    "interaction.user.id": suggestion.author_id,
-                    "interaction.guild.id": suggestion.guild_id,
-                    "suggestion.id": suggestion_id,
-                    "suggestion.type": "queued",
-                },
+                locale=locale, suggestion=suggestion, rest=client
             )
+            if suggestion_components is None:
+                return [message_components]
+
+            return [message_components, suggestion_components]
+
+        await fan_out_notification(
+            recipients,
+            render,
+            rest=client,
+            caller_name="queued_suggestion_resolved_notifications",
+            context=f"queued_suggestion_id={suggestion.id}",
+        )
 
 
 async def suggestion_resolved_notifications(_, suggestion_id: str, guild_id: int):
@@ -74,37 +64,32 @@ async def suggestion_resolved_notifications(_, suggestion_id: str, guild_id: int
         return
 
     guild_config = await configs.ensure_guild_config(guild_id)
+    if guild_config.generic_dm_messages_disabled:
+        return
+
     user_config = await configs.ensure_user_config(suggestion.author_id)
-    if (
-        guild_config.generic_dm_messages_disabled
-        or user_config.generic_dm_messages_disabled
-    ):
+    if user_config.generic_dm_messages_disabled:
         return
 
+    recipients = [user_config]
     async with constants.DISCORD_REST_CLIENT.acquire(
         constants.BOT_TOKEN, hikari.TokenType.BOT
     ) as client:
-        try:
-            dm_channel = await fetch_user_dm_channel_id(user_config.user_id, rest=client)
-            message_components = await cv2.build_user_resolution_notification(
-                user_config=user_config, suggestion=suggestion
-            )
-            async with HandleClientHTTPResponse(
-                inspect.currentframe().f_code.co_name,  # ty:ignore[unresolved-attribute],
-                f"suggestion_id={suggestion.id}",
-            ):
-                await client.create_message(dm_channel, components=message_components)
-
-        except (hikari.ForbiddenError,):
-            # I'd consider it 'fine' if the bot can't send this message
-            logger.debug(
-                "Failed to dm user about a suggestion resolution",
-                extra={
-                    "interaction.user.id": suggestion.author_id,
-                    "interaction.guild.id": suggestion.guild_id,
-                    "suggestion.id": suggestion_id,
-                },
-            )
+
+        async def render(locale: hikari.Locale) -> RenderedMessages:
+            return [
+                await cv2.build_user_resolution_notification(
+                    locale=locale, suggestion=suggestion
+                )
+            ]
+
+        await fan_out_notification(
+            recipients,
+            render,
+            rest=client,
+            caller_name="suggestion_resolved_notifications",
+            context=f"suggestion_id={suggestion.id}",
+        )
 
 
 async def notify_users_of_new_suggestion(_, suggestion_id: str, guild_id: int):
@@ -121,41 +106,35 @@ async def notify_users_of_new_suggestion(_, suggestion_id: str, guild_id: int):
         return
 
     guild_config = await configs.ensure_guild_config(guild_id)
+    if guild_config.generic_dm_messages_disabled:
+        return
+
     user_config = await configs.ensure_user_config(suggestion.author_id)
-    if (
-        guild_config.generic_dm_messages_disabled
-        or user_config.generic_dm_messages_disabled
-    ):
+    if user_config.generic_dm_messages_disabled:
         return
 
+    recipients = [user_config]
     async with constants.DISCORD_REST_CLIENT.acquire(
         constants.BOT_TOKEN, hikari.TokenType.BOT
     ) as client:
-        try:
-            dm_channel = await fetch_user_dm_channel_id(user_config.user_id, rest=client)
+
+        async def render(locale: hikari.Locale) -> RenderedMessages:
             components = await cv2.build_new_suggestion_notification(
-                user_config=user_config, suggestion=suggestion
+                locale=locale, suggestion=suggestion
             )
             suggestion_components = await suggestion.as_components(
                 rest=client,
-                locale=user_config.primary_language,
+                locale=locale,
                 localisations=LOCALISATIONS,
                 exclude_buttons=True,
                 exclude_votes=True,
             )
-            async with HandleClientHTTPResponse(
-                inspect.currentframe().f_code.co_name,  # ty:ignore[unresolved-attribute],
-                f"suggestion_id={suggestion.id}",
-            ):
-                await client.create_message(dm_channel, components=components)
-                await client.create_message(dm_channel, components=suggestion_components)
-        except hikari.ForbiddenError:
-            # I'd consider it 'fine' if the bot can't send this message
-            logger.debug(
-                "Failed to dm user about a suggestion",
-                extra={
-                    "interaction.user.id": suggestion.author_id,
-                    "interaction.guild.id": suggestion.guild_id,
-                    "suggestion.id": suggestion_id,
-                },
-            )
+            return [components, suggestion_components]
+
+        await fan_out_notification(
+            recipients,
+            render,
+            rest=client,
+            caller_name="notify_users_of_new_suggestion",
+            context=f"suggestion_id={suggestion.id}",
+        )
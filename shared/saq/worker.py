@@ -9,6 +9,8 @@ from piccolo_api.session_auth.tables import SessionsBase
 from saq import Queue
 from saq.types import Context
 
+from shared.utils import caching, http
+from shared.utils.ntfy import NTFY_NOTIFIER
 from web import constants
 from web.tables import APIToken
 from web.util.table_mixins import utc_now
@@ -76,14 +78,21 @@ async def startup(_):
     # Ensure logger is started in SAQ process
     constants.configure_otel(constants.DASHBOARD_SERVICE_NAME)
     await constants.DISCORD_REST_CLIENT.start()
+    await constants.DISCORD_EDIT_REST_CLIENT.start()
+    caching.start_invalidation_listener()
+    NTFY_NOTIFIER.start()
     await SAQ_QUEUE.enqueue("log_current_valid_sessions")
     await SAQ_QUEUE.enqueue("log_current_api_tokens")
-    await SAQ_QUEUE.enqueue("populate_sid_autocomplete")
+    await SAQ_QUEUE.enqueue("sync_autocomplete_changes")
     await SAQ_QUEUE.enqueue("compute_aggregate_command_invokes")
 
 
 async def shutdown(_):
     await constants.DISCORD_REST_CLIENT.close()
+    await constants.DISCORD_EDIT_REST_CLIENT.close()
+    await caching.stop_invalidation_listener()
+    await NTFY_NOTIFIER.stop()
+    await http.close_http_clients()
 
 
 SAQ_TIMEOUT = int(datetime.timedelta(hours=1).total_seconds())
@@ -4,6 +4,10 @@ from shared.tables.guild_config import GuildConfigs
 from shared.tables.queued_suggestion import QueuedSuggestions, QueuedSuggestionStateEnum
 from shared.tables.suggestion import Suggestions, SuggestionStateEnum
 from shared.tables.suggestions_vote import SuggestionVotes, SuggestionsVoteTypeEnum
+from shared.tables.autocomplete_change import (
+    AutocompleteChanges,
+    AutocompleteSourceEnum,
+)
 
 __all__ = [
     "UserConfigs",
@@ -15,4 +19,6 @@ __all__ = [
     "QueuedSuggestions",
     "PremiumGuildConfigs",
     "QueuedSuggestionStateEnum",
+    "AutocompleteChanges",
+    "AutocompleteSourceEnum",
 ]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Self, TYPE_CHECKING
+
+from piccolo.columns import Serial, BigInt, Varchar, Boolean
+from piccolo.table import Table
+
+
+class AutocompleteSourceEnum(Enum):
+    Suggestion = "Suggestion"
+    Queued = "Queued"
+
+
+class AutocompleteChanges(Table):
+    """An outbox of sIDs to add to or remove from autocomplete.
+
+    Notes
+    -----
+    Rows are written by triggers on the suggestion tables whenever
+    a row is created, deleted or changes state. They are consumed
+    and deleted by the sync_autocomplete_changes SAQ job.
+    """
+
+    if TYPE_CHECKING:
+        id: Serial
+
+    guild_id = BigInt(help_text="The guild whose autocomplete this belongs to")
+    sID = Varchar(help_text="The suggestion or queued suggestion sID")
+    source = Varchar(length=10, choices=AutocompleteSourceEnum)
+    present = Boolean(help_text="True if the sID should be suggested, False to remove it")
+
+    @property
+    def source_enum(self) -> AutocompleteSourceEnum:
+        return AutocompleteSourceEnum(self.source)
+
+    @classmethod
+    async def fetch_oldest(cls, limit: int) -> list[Self]:
+        return await cls.objects().order_by(cls.id).limit(limit)
+
+    @classmethod
+    async def delete_consumed(cls, ids: list[int]) -> None:
+        # Deleting by id rather than up to an id means rows
+        # from transactions which commit late aren't lost
+        await cls.delete().where(cls.id.is_in(ids))
@@ -21,7 +21,7 @@ from piccolo.columns import (
 )
 from piccolo.table import Table
 
-from shared.tables.mixins import AuditMixin
+from shared.tables.mixins import AuditMixin, GuildConfigCacheMixin
 from shared.tables.mixins.audit import utc_now
 from web.constants import REDIS_CLIENT
 from bot import utils
@@ -39,7 +39,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-class GuildConfigs(AuditMixin, Table):
+class GuildConfigs(GuildConfigCacheMixin, AuditMixin, Table):
     guild_id = BigInt(
         unique=True,
         index=True,
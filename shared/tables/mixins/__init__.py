@@ -1,3 +1,4 @@
 from .audit import AuditMixin
+from .cache_invalidation import GuildConfigCacheMixin, UserConfigCacheMixin
 
-__all__ = ["AuditMixin"]
+__all__ = ["AuditMixin", "GuildConfigCacheMixin", "UserConfigCacheMixin"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+from piccolo.utils.sync import run_sync
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Generator, Sequence
+
+    from piccolo.query import Query
+
+
+class _AfterRunQuery:
+    """Proxies a save query, running callback once the query has run.
+
+    Notes
+    -----
+    Piccolo has no success callbacks for inserts or updates and its
+    queries use slots, so this wraps the query rather than patching it.
+    Chained calls which return the query are wrapped again so
+    ``await obj.save().run()`` and friends keep working.
+
+    """
+
+    __slots__ = ("_callback", "_query")
+
+    def __init__(self, query: Query, callback: Callable[[], Awaitable[None]]) -> None:
+        self._query: Query = query
+        self._callback: Callable[[], Awaitable[None]] = callback
+
+    def __getattr__(self, name: str) -> object:
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def chained(*args: object, **kwargs: object) -> object:
+            result = attr(*args, **kwargs)
+            if result is self._query:
+                return _AfterRunQuery(result, self._callback)
+
+            return result
+
+        return chained
+
+    def __str__(self) -> str:
+        return str(self._query)
+
+    def __await__(self) -> Generator[None, None, object]:
+        return self.run().__await__()
+
+    async def run(self, node: str | None = None, in_pool: bool = True) -> object:
+        response = await self._query.run(node=node, in_pool=in_pool)
+        await self._callback()
+        return response
+
+    def run_sync(self, node: str | None = None, in_pool: bool = False) -> object:
+        return run_sync(self.run(node=node, in_pool=in_pool))
+
+
+class GuildConfigCacheMixin:
+    """Invalidates cached guild configurations whenever a row is saved."""
+
+    guild_id: Any
+
+    def save(self, columns: Sequence[Any] | None = None) -> Query:
+        from shared.utils import configs
+
+        return _AfterRunQuery(  # ty:ignore[invalid-return-type]
+            super().save(columns),  # ty:ignore[unresolved-attribute]
+            lambda: configs.invalidate_guild_config(self.guild_id),
+        )
+
+
+class UserConfigCacheMixin:
+    """Writes saved user configurations through to the user config cache."""
+
+    def save(self, columns: Sequence[Any] | None = None) -> Query:
+        from shared.utils import configs
+
+        return _AfterRunQuery(  # ty:ignore[invalid-return-type]
+            super().save(columns),  # ty:ignore[unresolved-attribute]
+            lambda: configs.write_through_user_config(self),  # ty:ignore[invalid-argument-type]
+        )
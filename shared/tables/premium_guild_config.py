@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 from piccolo.columns import Text, Integer, BigInt, Serial
 from piccolo.table import Table
 
-from shared.tables.mixins import AuditMixin
+from shared.tables.mixins import AuditMixin, GuildConfigCacheMixin
 
 
 class CooldownPeriod(str, Enum):
@@ -30,7 +30,7 @@ class CooldownPeriod(str, Enum):
             raise NotImplementedError
 
 
-class PremiumGuildConfigs(AuditMixin, Table):
+class PremiumGuildConfigs(GuildConfigCacheMixin, AuditMixin, Table):
     if TYPE_CHECKING:
         id: Serial
 
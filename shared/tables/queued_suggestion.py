@@ -25,6 +25,7 @@ from piccolo.columns.operators import Equal
 from piccolo.table import Table
 
 from bot import utils
+from bot.utils import fragments
 from bot.localisation import Localisation
 from bot.utils.id import generate_id
 from shared.saq.worker import SAQ_QUEUE
@@ -174,6 +175,66 @@ class QueuedSuggestions(Table, AuditMixin):
         )
         return await query
 
+    @classmethod
+    async def fetch_adjacent_pending(
+        cls, guild_id: int, cursor: int | None, *, forwards: bool = True
+    ) -> typing.Self | None:
+        """Fetch the pending queued suggestion after or before an id.
+
+        Parameters
+        ----------
+        guild_id: int
+            The guild whose queue to page through.
+        cursor: int | None
+            The id to start from, exclusive. None starts from
+            the first or last pending queued suggestion.
+        forwards: bool
+            Whether to fetch the next or the previous queued suggestion.
+        """
+        query = cls.objects(
+            QueuedSuggestions.user_configuration,
+            QueuedSuggestions.guild_configuration,
+            QueuedSuggestions.related_suggestion,
+        ).where(
+            And(
+                Where(
+                    QueuedSuggestions.state_raw,
+                    QueuedSuggestionStateEnum.PENDING,
+                    operator=Equal,
+                ),
+                Where(
+                    QueuedSuggestions.guild_configuration.guild_id,
+                    guild_id,
+                    operator=Equal,
+                ),
+            )
+        )
+        if cursor is not None:
+            query = query.where(
+                QueuedSuggestions.id > cursor
+                if forwards
+                else QueuedSuggestions.id < cursor
+            )
+
+        return await query.order_by(QueuedSuggestions.id, ascending=forwards).first()
+
+    @classmethod
+    async def count_pending_for_guild(cls, guild_id: int) -> int:
+        return await cls.count().where(
+            And(
+                Where(
+                    QueuedSuggestions.state_raw,
+                    QueuedSuggestionStateEnum.PENDING,
+                    operator=Equal,
+                ),
+                Where(
+                    QueuedSuggestions.guild_configuration.guild_id,
+                    guild_id,
+                    operator=Equal,
+                ),
+            )
+        )
+
     # noinspection PyPep8Naming
     @classmethod
     async def fetch_queued_suggestion(
@@ -299,12 +360,7 @@ class QueuedSuggestions(Table, AuditMixin):
 
             components.append(hikari.impl.MediaGalleryComponentBuilder(items=items))
 
-        components.append(
-            hikari.impl.SeparatorComponentBuilder(
-                divider=True,
-                spacing=hikari.SpacingType.SMALL,
-            )
-        )
+        components.append(fragments.divider())
         await utils.insert_user_segment(
             user_id=self.author_id,
             components=components,
@@ -316,12 +372,7 @@ class QueuedSuggestions(Table, AuditMixin):
 
         if self.state is QueuedSuggestionStateEnum.REJECTED:
             # Means it's been rejected so we should show it
-            components.append(
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                )
-            )
+            components.append(fragments.divider())
             content = io.StringIO()
             if self.resolved_note is not None:
                 content.write(
@@ -365,7 +416,7 @@ class QueuedSuggestions(Table, AuditMixin):
                     ),
                     locale,
                     extras=extras,
-                ),
+                )
             )
         )
 
@@ -383,31 +434,23 @@ class QueuedSuggestions(Table, AuditMixin):
         )
         if include_buttons:
             if paginator_id:
-                approved = f"v4_queue:approve:{paginator_id}:{self.sID}:{link_id}"
-                rejected = f"v4_queue:reject:{paginator_id}:{self.sID}:{link_id}"
+                # Paginator ids are unique to each render so aren't worth caching
+                data.append(
+                    fragments.build_queue_buttons(
+                        localisations,
+                        locale,
+                        approve_id=f"v4_queue:approve:{paginator_id}:{self.sID}:{link_id}",  # noqa: E501
+                        reject_id=f"v4_queue:reject:{paginator_id}:{self.sID}:{link_id}",
+                    )
+                )
             else:
-                approved = f"v4_queued_suggestion:approve:{self.sID}"
-                rejected = f"v4_queued_suggestion:reject:{self.sID}"
-
-            data.append(
-                hikari.impl.MessageActionRowBuilder(
-                    components=[
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.SUCCESS,
-                            label=localisations.get_localized_string(
-                                "values.suggest.queue_approve", locale
-                            ),
-                            custom_id=approved,
-                        ),
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.DANGER,
-                            label=localisations.get_localized_string(
-                                "values.suggest.queue_reject", locale
-                            ),
-                            custom_id=rejected,
-                        ),
-                    ]
+                data.append(
+                    fragments.queue_buttons(
+                        localisations,
+                        locale,
+                        approve_id=f"v4_queued_suggestion:approve:{self.sID}",
+                        reject_id=f"v4_queued_suggestion:reject:{self.sID}",
+                    )
                 )
-            )
 
         return data
@@ -14,6 +14,7 @@ from piccolo.columns import (
     BigInt,
     Timestamptz,
     Array,
+    Integer,
     Where,
     And,
     OnDelete,
@@ -23,6 +24,7 @@ from piccolo.columns.operators import Equal
 from piccolo.table import Table
 
 from bot import constants, utils
+from bot.utils import fragments
 from bot.constants import (
     REJECTED_COLOR,
     APPROVED_COLOR,
@@ -39,6 +41,9 @@ from shared.tables import (
 from shared.tables.mixins import AuditMixin
 from bot.utils import generate_id
 
+if typing.TYPE_CHECKING:
+    from shared.tables import SuggestionsVoteTypeEnum
+
 
 class SuggestionStateEnum(Enum):
     PENDING = "Pending"
@@ -154,6 +159,17 @@ class Suggestions(Table, AuditMixin):
     author_display_name = Text(
         help_text="How should we display the author? Either name or <Anonymous>",
     )
+    # Denormalised from SuggestionVotes so rendering doesn't need to count
+    up_votes = Integer(
+        default=0,
+        help_text="How many up votes this suggestion has. "
+        "Maintained alongside SuggestionVotes",
+    )
+    down_votes = Integer(
+        default=0,
+        help_text="How many down votes this suggestion has. "
+        "Maintained alongside SuggestionVotes",
+    )
 
     @property
     def footer_sid(self) -> str:
@@ -269,6 +285,104 @@ class Suggestions(Table, AuditMixin):
     def is_anonymous(self) -> bool:
         return self.author_display_name == "Anonymous"
 
+    async def record_vote_change(
+        self,
+        *,
+        added: "SuggestionsVoteTypeEnum",
+        removed: "SuggestionsVoteTypeEnum | None" = None,
+    ) -> None:
+        """Update the vote counters for a new or changed vote.
+
+        This should be called within the same transaction
+        as the change to the underlying SuggestionVotes row.
+        """
+        from shared.tables import SuggestionsVoteTypeEnum
+
+        deltas = {
+            Suggestions.up_votes: 0,
+            Suggestions.down_votes: 0,
+        }
+        for vote_type, delta in ((added, 1), (removed, -1)):
+            if vote_type is SuggestionsVoteTypeEnum.UpVote:
+                deltas[Suggestions.up_votes] += delta
+            elif vote_type is SuggestionsVoteTypeEnum.DownVote:
+                deltas[Suggestions.down_votes] += delta
+
+        result = (
+            await Suggestions.update(
+                {column: column + delta for column, delta in deltas.items()}
+            )
+            .where(Suggestions.id == self.id)
+            .returning(Suggestions.up_votes, Suggestions.down_votes)
+        )
+        self.up_votes = result[0]["up_votes"]
+        self.down_votes = result[0]["down_votes"]
+
+    @classmethod
+    async def repair_vote_counts(cls, *, batch_size: int = 5_000) -> int:
+        """Recompute the vote counters from SuggestionVotes.
+
+        Returns the number of suggestions whose counters had drifted.
+
+        Notes
+        -----
+        Each batch of suggestions is locked before its votes are counted,
+        so a vote being recorded either lands before the count or waits
+        and adjusts the repaired counter afterwards rather than being lost.
+
+        """
+        from shared.tables import SuggestionVotes, SuggestionsVoteTypeEnum
+
+        suggestions_table = cls._meta.get_formatted_tablename()
+        votes_table = SuggestionVotes._meta.get_formatted_tablename()
+        repaired = 0
+        last_id = 0
+        while True:
+            async with cls._meta.db.transaction():
+                batch = (
+                    await cls.select(cls.id)
+                    .where(cls.id > last_id)
+                    .order_by(cls.id)
+                    .limit(batch_size)
+                    .lock_rows()
+                    .output(as_list=True)
+                )
+                if not batch:
+                    return repaired
+
+                last_id = batch[-1]
+                # Each statement reads a fresh snapshot, so these counts
+                # include every vote committed before the lock was taken
+                rows = await cls.raw(
+                    f"""
+                    WITH counts AS (
+                        SELECT s."id",
+                            (
+                                SELECT COUNT(*) FROM {votes_table} v
+                                WHERE v."suggestion" = s."id" AND v."vote_type" = {{}}
+                            ) AS up_votes,
+                            (
+                                SELECT COUNT(*) FROM {votes_table} v
+                                WHERE v."suggestion" = s."id" AND v."vote_type" = {{}}
+                            ) AS down_votes
+                        FROM {suggestions_table} s
+                        WHERE s."id" >= {{}} AND s."id" <= {{}}
+                    )
+                    UPDATE {suggestions_table}
+                    SET "up_votes" = counts.up_votes, "down_votes" = counts.down_votes
+                    FROM counts
+                    WHERE {suggestions_table}."id" = counts."id"
+                    AND ({suggestions_table}."up_votes", {suggestions_table}."down_votes")
+                        IS DISTINCT FROM (counts.up_votes, counts.down_votes)
+                    RETURNING {suggestions_table}."id"
+                    """,  # noqa: S608
+                    SuggestionsVoteTypeEnum.UpVote.value,
+                    SuggestionsVoteTypeEnum.DownVote.value,
+                    batch[0],
+                    last_id,
+                )
+                repaired += len(rows)
+
     async def queue_message_edit(
         self, *, exclude_buttons: bool = False, as_resolved: bool = False
     ):
@@ -333,12 +447,7 @@ class Suggestions(Table, AuditMixin):
             ]
             components.append(hikari.impl.MediaGalleryComponentBuilder(items=items))
 
-        components.append(
-            hikari.impl.SeparatorComponentBuilder(
-                divider=True,
-                spacing=hikari.SpacingType.SMALL,
-            )
-        )
+        components.append(fragments.divider())
         await utils.insert_user_segment(
             user_id=self.author_id,
             components=components,
@@ -349,12 +458,7 @@ class Suggestions(Table, AuditMixin):
         )
 
         if self.moderator_note:
-            components.append(
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                )
-            )
+            components.append(fragments.divider())
             content = localisations.get_localized_string(
                 "components.suggestions.moderator_note",
                 locale,
@@ -367,12 +471,7 @@ class Suggestions(Table, AuditMixin):
             components.append(hikari.impl.TextDisplayComponentBuilder(content=content))
 
         if self.state is not SuggestionStateEnum.PENDING:
-            components.append(
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                )
-            )
+            components.append(fragments.divider())
             content = io.StringIO()
             if self.resolved_note is not None and self.resolved_note:
                 content.write(
@@ -412,29 +511,12 @@ class Suggestions(Table, AuditMixin):
             )
 
         if not exclude_votes:
-            components.append(
-                hikari.impl.SeparatorComponentBuilder(
-                    divider=True,
-                    spacing=hikari.SpacingType.SMALL,
-                )
-            )
+            components.append(fragments.divider())
             votes = io.StringIO()
-            from shared.tables import SuggestionVotes, SuggestionsVoteTypeEnum
-
-            up_votes = (
-                await SuggestionVotes.count()
-                .where(SuggestionVotes.suggestion == self)
-                .where(SuggestionVotes.vote_type == SuggestionsVoteTypeEnum.UpVote)
-            )
-            votes.write(f"{constants.DEFAULT_UP_VOTE.mention}: **{up_votes}**\n")
-
-            down_votes = (
-                await SuggestionVotes.count()
-                .where(SuggestionVotes.suggestion == self)
-                .where(SuggestionVotes.vote_type == SuggestionsVoteTypeEnum.DownVote)
-            )
-            votes.write(f"{constants.DEFAULT_DOWN_VOTE.mention}: **{down_votes}**")
+            votes.write(f"{constants.DEFAULT_UP_VOTE.mention}: **{self.up_votes}**\n")
+            votes.write(f"{constants.DEFAULT_DOWN_VOTE.mention}: **{self.down_votes}**")
 
+            # Vote counts differ between suggestions, so caching them gains nothing
             components.append(
                 hikari.impl.TextDisplayComponentBuilder(
                     content=localisations.get_localized_string(
@@ -482,7 +564,7 @@ class Suggestions(Table, AuditMixin):
                     locale,
                     extras=extras,
                     guild_config=guild_config,
-                ),
+                )
             )
         )
 
@@ -497,21 +579,6 @@ class Suggestions(Table, AuditMixin):
             )
         )
         if not exclude_buttons:
-            result.append(
-                hikari.impl.MessageActionRowBuilder(
-                    components=[
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.SECONDARY,
-                            emoji=constants.DEFAULT_UP_VOTE,
-                            custom_id=f"v4_suggestions_up_vote:{self.sID}",
-                        ),
-                        hikari.impl.InteractiveButtonBuilder(
-                            style=hikari.ButtonStyle.SECONDARY,
-                            emoji=constants.DEFAULT_DOWN_VOTE,
-                            custom_id=f"v4_suggestions_down_vote:{self.sID}",
-                        ),
-                    ]
-                )
-            )
+            result.append(fragments.vote_buttons(self.sID))
 
         return result
@@ -64,15 +64,60 @@ class SuggestionVotes(Table, AuditMixin):
         self.vote_type = value.value
 
     @classmethod
-    async def fetch_votes_for_suggestion(
-        cls, suggestion, *, vote_type: SuggestionsVoteTypeEnum | None = None
-    ) -> list[Self]:
-        query = cls.objects().where(cls.suggestion == suggestion)
+    async def count_for_suggestion(
+        cls, suggestion_id: int, *, vote_type: SuggestionsVoteTypeEnum | None = None
+    ) -> int:
+        query = cls.count().where(cls.suggestion == suggestion_id)
         if vote_type is not None:
-            query = query.where(cls.vote_type == vote_type)
+            query = query.where(cls.vote_type == vote_type.value)
 
         return await query
 
+    @classmethod
+    async def fetch_voter_page(
+        cls,
+        suggestion_id: int,
+        *,
+        vote_type: SuggestionsVoteTypeEnum | None = None,
+        after: int | None = None,
+        before: int | None = None,
+        from_end: bool = False,
+        limit: int = 25,
+    ) -> list[Self]:
+        """Keyset paginate a suggestions votes by id, always returned in id order.
+
+        Parameters
+        ----------
+        suggestion_id: int
+            The suggestion whose votes to page through.
+        vote_type: SuggestionsVoteTypeEnum | None
+            Only include votes of this type.
+        after: int | None
+            Return the votes after this id.
+        before: int | None
+            Return the votes before this id.
+        from_end: bool
+            With neither cursor, return the last votes instead of the first.
+        limit: int
+            The most votes to return.
+        """
+        query = cls.objects().where(cls.suggestion == suggestion_id)
+        if vote_type is not None:
+            query = query.where(cls.vote_type == vote_type.value)
+
+        if after is not None:
+            query = query.where(cls.id > after)
+
+        if before is not None:
+            query = query.where(cls.id < before)
+
+        descending = before is not None or (after is None and from_end)
+        votes = await query.order_by(cls.id, ascending=not descending).limit(limit)
+        if descending:
+            votes.reverse()
+
+        return votes
+
     @classmethod
     async def get_or_create(
         cls,
@@ -2,10 +2,10 @@ import hikari
 from piccolo.table import Table
 from piccolo.columns import BigInt, Boolean, Text
 
-from shared.tables.mixins import AuditMixin
+from shared.tables.mixins import AuditMixin, UserConfigCacheMixin
 
 
-class UserConfigs(AuditMixin, Table):
+class UserConfigs(UserConfigCacheMixin, AuditMixin, Table):
     user_id = BigInt(
         unique=True,
         index=True,
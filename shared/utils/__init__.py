@@ -1,30 +1,44 @@
 from .r2 import upload_file_to_r2
 from .autocomplete import (
-    cache_sid_in_autocomplete,
+    ALL_AUTOCOMPLETE_INDEXES,
+    AutocompleteChange,
+    apply_autocomplete_changes,
     get_sid_autocomplete_for_guild,
     delete_autocomplete_cache,
-    delete_autocomplete_cache_sid,
+    rebuild_autocomplete_cache,
 )
 from .redis import (
+    acquire_lock,
+    apply_cluster_guild_changes,
     get_accurate_guild_count,
+    publish_cluster_guilds,
     cache_guild_queue_info,
     get_guild_queue_info,
     get_cached_interaction_id,
     set_cached_interaction_id,
+    holds_lock,
+    release_lock,
 )
 
 __all__ = [
+    "acquire_lock",
+    "apply_cluster_guild_changes",
+    "ALL_AUTOCOMPLETE_INDEXES",
+    "AutocompleteChange",
+    "apply_autocomplete_changes",
     "cache_guild_queue_info",
-    "cache_sid_in_autocomplete",
     "configs",
     "delete_autocomplete_cache",
-    "delete_autocomplete_cache_sid",
     "get_accurate_guild_count",
     "get_cached_interaction_id",
     "get_guild_queue_info",
     "get_sid_autocomplete_for_guild",
+    "holds_lock",
     "ntfy",
+    "publish_cluster_guilds",
     "query_helpers",
+    "rebuild_autocomplete_cache",
+    "release_lock",
     "set_cached_interaction_id",
     "upload_file_to_r2",
 ]
@@ -1,66 +1,423 @@
+import asyncio
+import bisect
+import functools
+import logging
+import time
+from collections.abc import AsyncIterable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import timedelta
 from litestar_saq import Job
 from itertools import batched
-from typing import Literal
+from typing import Any, Literal, NamedTuple
 
-from redis.commands.search.suggestion import Suggestion
+import orjson
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
 
-from web.constants import REDIS_CLIENT
+from shared.utils import caching
+from web import constants
 
+log = logging.getLogger(__name__)
 
-async def delete_autocomplete_cache(saq_job: Job | None = None) -> None:
-    """Deletes the autocomplete cache."""
+
+AutocompleteIndex = Literal[
+    "shared_sid_autocomplete_index",
+    "queue_sid_autocomplete_index",
+    "suggestion_sid_autocomplete_index",
+]
+ALL_AUTOCOMPLETE_INDEXES: tuple[AutocompleteIndex, ...] = (
+    "shared_sid_autocomplete_index",
+    "queue_sid_autocomplete_index",
+    "suggestion_sid_autocomplete_index",
+)
+REBUILD_BATCH_SIZE = 5_000
+APPLY_BATCH_SIZE = 500
+"""How many changes are applied per MULTI."""
+PREFIX_CACHE_SIDS = 2_000
+"""How many of a guilds most recent sIDs are held per index."""
+PREFIX_CACHE_REFRESH_AFTER = timedelta(seconds=30)
+REBUILD_RUNNING_KEY = "ac_rebuild_running"
+REBUILD_JOURNAL_KEY = "ac_rebuild_journal"
+"""A list of every change applied while a rebuild runs, oldest first."""
+REBUILD_TTL = timedelta(hours=1)
+
+
+class AutocompleteChange(NamedTuple):
+    guild_id: int
+    suggestion_id: str
+    indexes: tuple[AutocompleteIndex, ...]
+    present: bool = True
+    """True to add the sID to the indexes, False to remove it."""
+
+
+class _JournaledChange(NamedTuple):
+    key: str
+    suggestion_id: str
+    present: bool
+
+
+@dataclass(slots=True)
+class AutocompleteRebuild:
+    written: int = 0
+    """How many suggestions were written."""
+    drifted_keys: int = 0
+    """How many indexes held a different number of entries to the rebuild."""
+    drifted_entries: int = 0
+    """The total difference in entry counts, a lower bound on actual drift."""
+
+
+@dataclass(slots=True)
+class _CachedSids:
+    sids: list[str]
+    """Sorted so prefixes can be found with a binary search."""
+    complete: bool
+    """False if the guild has more sIDs than are held."""
+    loaded_at: float
+
+    def matching(self, prefix: str, limit: int) -> list[str] | None:
+        """Returns None if sIDs which aren't held may also match."""
+        matches: list[str] = []
+        start = bisect.bisect_left(self.sids, prefix)
+        for sid in self.sids[start : start + limit]:
+            if not sid.startswith(prefix):
+                break
+
+            matches.append(sid)
+
+        if len(matches) < limit and not self.complete:
+            return None
+
+        return matches
+
+
+_PREFIX_CACHE: caching.LRUTimedCache[str, _CachedSids] = caching.LRUTimedCache(
+    max_size=1_000, ttl=timedelta(minutes=5)
+)
+caching.register_invalidation_target("sid_autocomplete", _PREFIX_CACHE)
+_REFRESH_TASKS: dict[str, asyncio.Task] = {}
+
+
+def _prefix_cache_key(guild_id: int, index: AutocompleteIndex) -> str:
+    return f"{guild_id}:{index}"
+
+
+async def _fetch_recent_sids(guild_id: int, index: AutocompleteIndex) -> _CachedSids:
+    from shared.tables import (
+        QueuedSuggestions,
+        QueuedSuggestionStateEnum,
+        Suggestions,
+        SuggestionStateEnum,
+    )
+
+    tables = []
+    if index != "queue_sid_autocomplete_index":
+        tables.append((Suggestions, SuggestionStateEnum.CLEARED.value))
+    if index != "suggestion_sid_autocomplete_index":
+        tables.append((QueuedSuggestions, QueuedSuggestionStateEnum.CLEARED.value))
+
+    sids: list[str] = []
+    complete = True
+    for table, cleared_state in tables:
+        rows: list[str] = (
+            await table.select(table.sID)
+            .where(table.guild_configuration.guild_id == guild_id)
+            .where(table.state_raw != cleared_state)
+            .order_by(table.id, ascending=False)
+            .limit(PREFIX_CACHE_SIDS + 1)
+            .output(as_list=True)
+        )
+        if len(rows) > PREFIX_CACHE_SIDS:
+            complete = False
+            rows = rows[:PREFIX_CACHE_SIDS]
+
+        sids.extend(rows)
+
+    sids.sort()
+    return _CachedSids(sids=sids, complete=complete, loaded_at=time.monotonic())
+
+
+async def _refresh_prefix_cache(guild_id: int, index: AutocompleteIndex) -> None:
+    key = _prefix_cache_key(guild_id, index)
+    generation = _PREFIX_CACHE.generation
+    try:
+        cached = await _fetch_recent_sids(guild_id, index)
+    except Exception:  # noqa: BLE001
+        log.debug("Failed to refresh the sID prefix cache", exc_info=True)
+        return
+
+    _PREFIX_CACHE.set(key, cached, generation=generation)
+
+
+def _schedule_prefix_cache_refresh(guild_id: int, index: AutocompleteIndex) -> None:
+    key = _prefix_cache_key(guild_id, index)
+    if key in _REFRESH_TASKS:
+        return
+
+    task = asyncio.create_task(_refresh_prefix_cache(guild_id, index))
+    _REFRESH_TASKS[key] = task
+    task.add_done_callback(lambda _: _REFRESH_TASKS.pop(key, None))
+
+
+async def _unlink_matching(pattern: str, saq_job: Job | None = None) -> None:
     keys_present: list[str] = []
-    async for item in REDIS_CLIENT.scan_iter("ac:*", count=1000):
+    async for item in constants.REDIS_CLIENT.scan_iter(pattern, count=1000):
         keys_present.append(item)
         if saq_job is not None:
             await saq_job.update()
 
     for keys in batched(keys_present, n=1000):
-        await REDIS_CLIENT.unlink(*keys)
+        await constants.REDIS_CLIENT.unlink(*keys)
         if saq_job is not None:
             await saq_job.update()
 
 
-async def delete_autocomplete_cache_sid(suggestion_id: str, guild_id: int) -> None:
-    """Deletes the autocomplete cache sid from all caches."""
-    index = [
-        "shared_sid_autocomplete_index",
-        "queue_sid_autocomplete_index",
-        "suggestion_sid_autocomplete_index",
-    ]
-    for idx in index:
-        await REDIS_CLIENT.ft(idx).sugdel(
-            f"ac:{guild_id}:{idx}", suggestion_id
-        )  # ty:ignore[invalid-await]
+async def delete_autocomplete_cache(saq_job: Job | None = None) -> None:
+    """Deletes the autocomplete cache."""
+    await _unlink_matching("ac:*", saq_job)
 
 
-async def cache_sid_in_autocomplete(
+async def rebuild_autocomplete_cache(
+    entries: AsyncIterable[tuple[int, str, tuple[AutocompleteIndex, ...]]],
+    saq_job: Job | None = None,
     *,
-    guild_id: int,
-    suggestion_id: str,
-    index: Literal[
-        "shared_sid_autocomplete_index",
-        "queue_sid_autocomplete_index",
-        "suggestion_sid_autocomplete_index",
-    ],
-):
-    await REDIS_CLIENT.ft(index).sugadd(
-        f"ac:{guild_id}:{index}", Suggestion(string=suggestion_id)
-    )
+    batch_size: int = REBUILD_BATCH_SIZE,
+) -> AutocompleteRebuild:
+    """Rebuild every autocomplete index from scratch without emptying them.
+
+    Parameters
+    ----------
+    entries
+        The guild id, sID and indexes to place each suggestion in.
+    saq_job
+        Kept alive between batches if provided.
+    batch_size
+        How many commands to send per pipeline round trip.
+
+    Returns
+    -------
+    AutocompleteRebuild
+        How much was written and how far the live indexes had drifted.
+
+    Notes
+    -----
+    Entries are written into shadow keys which are then renamed
+    over the live keys, so autocomplete always has results while
+    this runs. Live keys with nothing left to suggest are removed.
+
+    Changes applied while this runs are journaled and replayed onto
+    the shadow keys as they are renamed, so none of them are lost.
+    """
+    # Anything left from a rebuild which failed part way through
+    await _unlink_matching("ac_rebuild:*", saq_job)
+    async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        pipe.delete(REBUILD_JOURNAL_KEY)
+        pipe.set(REBUILD_RUNNING_KEY, 1, ex=REBUILD_TTL)
+        await pipe.execute()
+
+    try:
+        return await _rebuild_autocomplete_cache(entries, saq_job, batch_size)
+    finally:
+        await constants.REDIS_CLIENT.delete(REBUILD_RUNNING_KEY, REBUILD_JOURNAL_KEY)
+
+
+async def _rebuild_autocomplete_cache(
+    entries: AsyncIterable[tuple[int, str, tuple[AutocompleteIndex, ...]]],
+    saq_job: Job | None,
+    batch_size: int,
+) -> AutocompleteRebuild:
+    result = AutocompleteRebuild()
+    written_keys: set[str] = set()
+    async with constants.REDIS_CLIENT.pipeline(transaction=False) as pipe:
+        queued = 0
+        async for guild_id, suggestion_id, indexes in entries:
+            for index in indexes:
+                key = f"ac:{guild_id}:{index}"
+                written_keys.add(key)
+                pipe.execute_command("FT.SUGADD", f"ac_rebuild:{key}", suggestion_id, 1.0)
+                queued += 1
+
+            result.written += 1
+            if queued >= batch_size:
+                pipe.expire(REBUILD_RUNNING_KEY, REBUILD_TTL)
+                await pipe.execute()
+                queued = 0
+                if saq_job is not None:
+                    await saq_job.update()
+
+        if queued:
+            await pipe.execute()
+
+    for keys in batched(written_keys, n=1000):
+        _, responses = await _run_with_journal(functools.partial(_queue_swap_in, keys))
+        live_lengths = responses[: len(keys)]
+        rebuilt_lengths = responses[-2 * len(keys) : -len(keys)]
+        for rebuilt_length, live_length in zip(
+            rebuilt_lengths, live_lengths, strict=True
+        ):
+            if rebuilt_length != live_length:
+                result.drifted_keys += 1
+                result.drifted_entries += abs(rebuilt_length - live_length)
+
+        if saq_job is not None:
+            await saq_job.update()
+
+    stale_keys: list[str] = []
+    async for key in constants.REDIS_CLIENT.scan_iter("ac:*", count=1000):
+        name = key.decode() if isinstance(key, bytes) else key
+        if name not in written_keys:
+            stale_keys.append(name)
+
+    for keys in batched(stale_keys, n=1000):
+        unlinked, responses = await _run_with_journal(
+            functools.partial(_queue_unlink_stale, keys)
+        )
+        result.drifted_keys += len(unlinked)
+        result.drifted_entries += sum(responses[: len(unlinked)])
+
+    return result
+
+
+def _queue_swap_in(
+    keys: tuple[str, ...], pipe: Pipeline, journal: list[_JournaledChange]
+) -> None:
+    for key in keys:
+        pipe.execute_command("FT.SUGLEN", key)
+
+    # Changes applied since the rebuild started may be
+    #   missing from or older than what it read
+    for key, suggestion_id, present in journal:
+        if key not in keys:
+            continue
+
+        if present:
+            pipe.execute_command("FT.SUGADD", f"ac_rebuild:{key}", suggestion_id, 1.0)
+        else:
+            pipe.execute_command("FT.SUGDEL", f"ac_rebuild:{key}", suggestion_id)
+
+    for key in keys:
+        pipe.execute_command("FT.SUGLEN", f"ac_rebuild:{key}")
+
+    # Each RENAME atomically replaces a live key with its rebuilt copy
+    for key in keys:
+        pipe.rename(f"ac_rebuild:{key}", key)
+
+
+def _queue_unlink_stale(
+    keys: tuple[str, ...], pipe: Pipeline, journal: list[_JournaledChange]
+) -> list[str]:
+    # Keys first written to while the rebuild ran aren't stale
+    journaled = {key for key, _, _ in journal}
+    stale = [key for key in keys if key not in journaled]
+    for key in stale:
+        pipe.execute_command("FT.SUGLEN", key)
+
+    if stale:
+        pipe.unlink(*stale)
+
+    return stale
+
+
+async def _run_with_journal[T](
+    queue: Callable[[Pipeline, list[_JournaledChange]], T],
+) -> tuple[T, list[Any]]:
+    """Run what queue adds in a MULTI which is retried if the journal changes.
+
+    Returns
+    -------
+    tuple[T, list[Any]]
+        What queue returned and the response to each command, errors
+        are returned rather than raised as emptied keys can't be renamed.
+    """
+    while True:
+        async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(REBUILD_JOURNAL_KEY)
+                journal = [
+                    _JournaledChange(*orjson.loads(raw))
+                    for raw in await pipe.lrange(REBUILD_JOURNAL_KEY, 0, -1)
+                ]
+                pipe.multi()
+                queued = queue(pipe, journal)
+                return queued, await pipe.execute(raise_on_error=False)
+
+            except WatchError:
+                # A change was applied meanwhile which this needs to see
+                continue
+
+
+async def apply_autocomplete_changes(
+    changes: Iterable[AutocompleteChange], *, batch_size: int = APPLY_BATCH_SIZE
+) -> None:
+    """Add or remove sIDs from autocomplete, batch_size changes per MULTI.
+
+    Changes are applied in the order given, and the prefix cache
+    for every index touched is invalidated in every process.
+    A MULTI holds Redis until it completes, so large syncs are split
+    up rather than blocking every other client while they apply.
+    """
+    # A rebuild starting after this check reads suggestions after
+    #   these changes were saved, so it doesn't need them journaled
+    rebuilding = await constants.REDIS_CLIENT.exists(REBUILD_RUNNING_KEY)
+    for batch in batched(changes, n=batch_size):
+        invalidated: set[str] = set()
+        async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+            for change in batch:
+                for index in change.indexes:
+                    key = f"ac:{change.guild_id}:{index}"
+                    if change.present:
+                        pipe.execute_command("FT.SUGADD", key, change.suggestion_id, 1.0)
+                    else:
+                        pipe.execute_command("FT.SUGDEL", key, change.suggestion_id)
+
+                    if rebuilding:
+                        pipe.rpush(
+                            REBUILD_JOURNAL_KEY,
+                            orjson.dumps((key, change.suggestion_id, change.present)),
+                        )
+
+                    invalidated.add(_prefix_cache_key(change.guild_id, index))
+
+            if not invalidated:
+                continue
+
+            if rebuilding:
+                pipe.expire(REBUILD_JOURNAL_KEY, REBUILD_TTL)
+
+            for key in invalidated:
+                caching.queue_invalidation(pipe, "sid_autocomplete", key)
+
+            await pipe.execute()
 
 
 async def get_sid_autocomplete_for_guild(
     *,
     guild_id: int,
     search: str,
-    index: Literal[
-        "shared_sid_autocomplete_index",
-        "queue_sid_autocomplete_index",
-        "suggestion_sid_autocomplete_index",
-    ],
+    index: AutocompleteIndex,
     max_return: int = 20,
 ) -> list[str]:
-    results = await REDIS_CLIENT.ft(index).sugget(
+    """Returns up to max_return sIDs in this guild starting with search.
+
+    Notes
+    -----
+    Busy guilds are answered from an in process sorted list of
+    their recent sIDs which is refreshed in the background, only
+    falling back to Redis when that list can't answer for certain.
+    """
+    cached = _PREFIX_CACHE.get(_prefix_cache_key(guild_id, index))
+    if (
+        cached is None
+        or time.monotonic() - cached.loaded_at
+        > PREFIX_CACHE_REFRESH_AFTER.total_seconds()
+    ):
+        _schedule_prefix_cache_refresh(guild_id, index)
+
+    if cached is not None:
+        matches = cached.matching(search.lower(), max_return)
+        if matches is not None:
+            return matches
+
+    results = await constants.REDIS_CLIENT.ft(index).sugget(
         f"ac:{guild_id}:{index}", search, num=max_return
     )
     return [r.string for r in results]
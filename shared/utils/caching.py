@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from web import constants
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Pipeline
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+"""The Redis pub/sub channel all processes listen on for cache invalidations"""
+
+_MISSING = object()
+_INVALIDATION_TARGETS: dict[str, LRUTimedCache] = {}
+_LISTENER_TASK: asyncio.Task | None = None
+
+
+class LRUTimedCache[KT, VT]:
+    """A bounded, in-process cache where each entry also expires after a TTL.
+
+    Notes
+    -----
+    Pass the ``generation`` observed before a slow lookup to ``set``
+    so that a value read before its key was invalidated can never be
+    written back over it. Deleting other keys doesn't affect it.
+
+    """
+
+    __slots__ = (
+        "_deleted_at",
+        "_entries",
+        "_stale_before",
+        "generation",
+        "max_size",
+        "ttl",
+    )
+
+    def __init__(self, *, max_size: int, ttl: timedelta) -> None:
+        self._entries: OrderedDict[KT, tuple[float, VT]] = OrderedDict()
+        self.max_size: int = max_size
+        self.ttl: float = ttl.total_seconds()
+        self.generation: int = 0
+        """Bumped by every delete, a snapshot of it orders lookups and deletes."""
+        self._deleted_at: OrderedDict[KT, int] = OrderedDict()
+        # Values fetched before this generation may be stale for any key,
+        #   either everything was cleared or their deletes were forgotten
+        self._stale_before: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: KT) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: KT, default: Any = None) -> VT | Any:
+        try:
+            expires_at, value = self._entries[key]
+        except KeyError:
+            return default
+
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def is_current(self, key: KT, generation: int) -> bool:
+        """Whether key hasn't been invalidated since generation was observed."""
+        invalidated_at = max(self._stale_before, self._deleted_at.get(key, 0))
+        return generation >= invalidated_at
+
+    def set(self, key: KT, value: VT, *, generation: int | None = None) -> None:
+        if generation is not None and not self.is_current(key, generation):
+            # This key was invalidated while the value was being
+            # fetched so it may already be stale, don't store it
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: KT) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+        self._deleted_at[key] = self.generation
+        self._deleted_at.move_to_end(key)
+        while len(self._deleted_at) > self.max_size:
+            # Conservatively treat everything from before the forgotten
+            #   delete as stale rather than letting this grow forever
+            _, forgotten = self._deleted_at.popitem(last=False)
+            self._stale_before = max(self._stale_before, forgotten)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._stale_before = self.generation
+        self._deleted_at.clear()
+        self._entries.clear()
+
+
+def register_invalidation_target(name: str, cache: LRUTimedCache) -> None:
+    """Allow ``cache`` to be invalidated by other processes under ``name``."""
+    _INVALIDATION_TARGETS[name] = cache
+
+
+async def publish_invalidation(name: str, key: int | str) -> None:
+    """Drop ``key`` from the named cache in this and every other process."""
+    cache = _INVALIDATION_TARGETS.get(name)
+    if cache is not None:
+        cache.delete(key)
+
+    await constants.REDIS_CLIENT.publish(
+        INVALIDATION_CHANNEL,
+        orjson.dumps({"cache": name, "key": key}),
+    )
+
+
+def queue_invalidation(pipe: Pipeline, name: str, key: int | str) -> None:
+    """Like ``publish_invalidation`` but sent as part of ``pipe``."""
+    cache = _INVALIDATION_TARGETS.get(name)
+    if cache is not None:
+        cache.delete(key)
+
+    pipe.publish(INVALIDATION_CHANNEL, orjson.dumps({"cache": name, "key": key}))
+
+
+def _apply_invalidation(raw_data: bytes) -> None:
+    data = orjson.loads(raw_data)
+    cache = _INVALIDATION_TARGETS.get(data["cache"])
+    if cache is None:
+        return
+
+    cache.delete(data["key"])
+
+
+async def _listen_for_invalidations() -> None:
+    while True:
+        pubsub = constants.REDIS_CLIENT.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # We may have missed messages while not subscribed
+            for cache in _INVALIDATION_TARGETS.values():
+                cache.clear()
+
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _apply_invalidation(message["data"])
+
+        except RedisConnectionError:
+            logger.warning("Lost connection to redis for cache invalidations")
+            await asyncio.sleep(5)
+
+        finally:
+            await pubsub.aclose()
+
+
+def start_invalidation_listener() -> None:
+    """Start listening for cache invalidations from other processes."""
+    global _LISTENER_TASK  # noqa: PLW0603
+    if _LISTENER_TASK is not None and not _LISTENER_TASK.done():
+        return
+
+    _LISTENER_TASK = asyncio.create_task(_listen_for_invalidations())
+
+
+async def stop_invalidation_listener() -> None:
+    global _LISTENER_TASK  # noqa: PLW0603
+    if _LISTENER_TASK is None:
+        return
+
+    _LISTENER_TASK.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _LISTENER_TASK
+
+    _LISTENER_TASK = None
@@ -0,0 +1,113 @@
+"""Shares Discord's per channel rate limits between every SAQ worker.
+
+hikari tracks rate limit buckets per process and waits them out in
+place, which holds a worker slot for as long as the channel is limited.
+Instead edits reserve a slot in their channel's bucket in Redis first and
+anything which doesn't get one is told how long to wait, so the caller can
+reschedule itself and let other channels use the slot in the meantime.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+import hikari
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_EDIT_LIMIT = 5
+CHANNEL_EDIT_PERIOD = timedelta(seconds=5)
+"""Discord allows roughly 5 message edits per channel every 5 seconds"""
+
+
+def _edit_window_key(channel_id: int, window: int) -> str:
+    return f"discord:channel_edits:{channel_id}:{window}"
+
+
+def _blocked_key(channel_id: int) -> str:
+    return f"discord:channel_blocked:{channel_id}"
+
+
+async def reserve_channel_edit(channel_id: int, *, now: float | None = None) -> float:
+    """Take a slot in the channel's bucket.
+
+    Returns
+    -------
+    float
+        0 if a slot was reserved, otherwise how many seconds to wait
+        before trying again. Callers who are turned away are spread
+        over the following windows rather than all retrying together.
+    """
+    from web.constants import REDIS_CLIENT
+
+    now = time.time() if now is None else now
+    period = CHANNEL_EDIT_PERIOD.total_seconds()
+    window = int(now // period)
+    window_key = _edit_window_key(channel_id, window)
+    async with REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        pipe.get(_blocked_key(channel_id))
+        pipe.incr(window_key)
+        pipe.expire(window_key, CHANNEL_EDIT_PERIOD * 2)
+        blocked_until, reserved, _ = await pipe.execute()
+
+    if blocked_until is not None and float(blocked_until) > now:
+        return float(blocked_until) - now
+
+    if reserved <= CHANNEL_EDIT_LIMIT:
+        return 0
+
+    windows_ahead = (reserved - 1) // CHANNEL_EDIT_LIMIT
+    return (window + windows_ahead) * period - now
+
+
+async def block_channel(
+    channel_id: int, retry_after: float, *, now: float | None = None
+) -> None:
+    """Stop every worker editing in channel_id until retry_after has passed."""
+    from web.constants import REDIS_CLIENT
+
+    now = time.time() if now is None else now
+    await REDIS_CLIENT.set(
+        _blocked_key(channel_id),
+        now + retry_after,
+        ex=max(math.ceil(retry_after), 1),
+    )
+
+
+async def dispatch_channel_edit(
+    channel_id: int,
+    edit: Callable[[], Awaitable[object]],
+    *,
+    now: float | None = None,
+) -> float:
+    """Run edit once the channel has capacity for it.
+
+    Returns
+    -------
+    float
+        0 if edit ran, otherwise how many seconds to wait before
+        retrying. Nothing is awaited on the channel's behalf.
+    """
+    wait = await reserve_channel_edit(channel_id, now=now)
+    if wait > 0:
+        return wait
+
+    try:
+        await edit()
+    except hikari.RateLimitTooLongError as e:
+        # Something outside these buckets used up the channel's limit,
+        #   the edit rest client raises rather than waiting it out
+        logger.debug(
+            "Channel %s was rate limited for %ss",
+            channel_id,
+            e.retry_after,
+            extra={"discord.channel.id": channel_id},
+        )
+        await block_channel(channel_id, e.retry_after, now=now)
+        return e.retry_after
+
+    return 0
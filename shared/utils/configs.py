@@ -1,64 +1,312 @@
+import asyncio
+import copy
+import datetime
 import logging
+from datetime import timedelta
+from typing import Any
 
 import hikari
+import orjson
+from opentelemetry import metrics
+from piccolo.columns import Timestamptz
+from piccolo.querystring import QueryString
+from piccolo.utils.dictionary import make_nested
+from piccolo.utils.objects import make_nested_object
 
 from shared.tables import GuildConfigs, PremiumGuildConfigs, UserConfigs
+from shared.utils import caching
+from web import constants
 
 logger = logging.getLogger(__name__)
 
+GUILD_CONFIG_CACHE: caching.LRUTimedCache[int, dict[str, Any]] = caching.LRUTimedCache(
+    max_size=10_000,
+    ttl=timedelta(minutes=5),
+)
+"""Raw guild config rows (premium nested) keyed by guild id.
 
-async def ensure_guild_config(guild_id: int) -> GuildConfigs:
-    pgc_insert = (
-        await PremiumGuildConfigs.insert(
-            PremiumGuildConfigs(guild_id=guild_id),
-        )
+Rows are stored rather than objects so every caller gets
+its own instance it can safely mutate and save.
+"""
+caching.register_invalidation_target("guild_configs", GUILD_CONFIG_CACHE)
+
+
+def _column_list(
+    table: type[GuildConfigs | PremiumGuildConfigs | UserConfigs], prefix: str = ""
+) -> str:
+    return ", ".join(
+        f'{prefix}"{col._meta.db_column_name}"' for col in table._meta.columns
+    )
+
+
+def _build_guild_config_query(guild_id: int) -> QueryString:
+    """Upsert and fetch a guild config alongside its premium config in one statement."""
+    premium_insert = (
+        PremiumGuildConfigs.insert(PremiumGuildConfigs(guild_id=guild_id))
         .on_conflict(action="DO NOTHING", target=(PremiumGuildConfigs.guild_id,))
         .returning(*PremiumGuildConfigs.all_columns())
     )
-    if not pgc_insert:
-        pgc_insert = (
-            await PremiumGuildConfigs.objects()
-            .first()
-            .where(PremiumGuildConfigs.guild_id == guild_id)
-        )
-    else:
-        # need object for reference reasons
-        pgc_insert = PremiumGuildConfigs(**pgc_insert[0])
-        pgc_insert._exists_in_db = True
-
-    try_insert = (
-        await GuildConfigs.insert(
-            GuildConfigs(guild_id=guild_id, premium=pgc_insert),
+    guild_insert = (
+        GuildConfigs.insert(
+            GuildConfigs(
+                guild_id=guild_id,
+                premium=QueryString('(SELECT "id" FROM premium_row LIMIT 1)'),
+            ),
         )
         .on_conflict(action="DO NOTHING", target=(GuildConfigs.guild_id,))
         .returning(*GuildConfigs.all_columns())
     )
-    if try_insert:
-        # New object
-        logger.debug("Created new GuildConfigs for %s", guild_id)
-
-    return (
-        await GuildConfigs.objects(GuildConfigs.premium)
-        .first()
-        .where(GuildConfigs.guild_id == guild_id)
+    premium_table = PremiumGuildConfigs._meta.get_formatted_tablename()
+    guild_table = GuildConfigs._meta.get_formatted_tablename()
+    premium_columns = _column_list(PremiumGuildConfigs)
+    guild_columns = _column_list(GuildConfigs)
+    premium_as_nested = ", ".join(
+        f'premium."{col._meta.db_column_name}" AS "premium.{col._meta.name}"'
+        for col in PremiumGuildConfigs._meta.columns
+    )
+    # Data modifying CTE's can't see each others writes via the
+    # base tables, so each lookup unions in the RETURNING rows
+    return QueryString(
+        f"""
+        WITH premium_insert AS ({{}}),
+        premium_row AS (
+            SELECT "id" FROM premium_insert
+            UNION ALL
+            SELECT "id" FROM {premium_table} WHERE "guild_id" = {{}}
+        ),
+        guild_insert AS ({{}}),
+        guild_row AS (
+            SELECT {guild_columns} FROM guild_insert
+            UNION ALL
+            SELECT {guild_columns} FROM {guild_table} WHERE "guild_id" = {{}}
+        )
+        SELECT {_column_list(GuildConfigs, "guild.")}, {premium_as_nested}
+        FROM guild_row AS guild
+        JOIN (
+            SELECT {premium_columns} FROM premium_insert
+            UNION ALL
+            SELECT {premium_columns} FROM {premium_table}
+        ) AS premium ON premium."id" = guild."premium"
+        LIMIT 1
+        """,  # noqa: S608
+        premium_insert.querystrings[0],
+        guild_id,
+        guild_insert.querystrings[0],
+        guild_id,
     )
 
 
+async def _resolve_guild_config_row(guild_id: int) -> dict[str, Any]:
+    for _ in range(2):
+        rows = await GuildConfigs.raw("{}", _build_guild_config_query(guild_id))
+        if rows:
+            return make_nested(rows[0])
+
+        # A concurrent first time insert for this guild landed after our
+        # statement snapshot was taken, running again will see it
+        logger.debug("Retrying guild config resolution for %s", guild_id)
+
+    msg = f"Failed to resolve a guild config for {guild_id}"
+    raise ValueError(msg)
+
+
+async def ensure_guild_config(guild_id: int) -> GuildConfigs:
+    row = GUILD_CONFIG_CACHE.get(guild_id)
+    if row is None:
+        generation = GUILD_CONFIG_CACHE.generation
+        row = await _resolve_guild_config_row(guild_id)
+        GUILD_CONFIG_CACHE.set(guild_id, row, generation=generation)
+
+    return make_nested_object(copy.deepcopy(row), GuildConfigs)
+
+
+async def invalidate_guild_config(guild_id: int) -> None:
+    """Drop a guild config from every process's cache."""
+    await caching.publish_invalidation("guild_configs", guild_id)
+
+
+class _UserConfigBatchLoader:
+    """Coalesces concurrent user config lookups into one upsert statement.
+
+    Lookups made in the same event loop iteration share a batch, which is
+    sent once the loop gets back round to it or max_batch_size is reached.
+    """
+
+    def __init__(self, *, max_batch_size: int) -> None:
+        self.max_batch_size: int = max_batch_size
+        self._pending: dict[int, tuple[str, asyncio.Future[dict[str, Any]]]] = {}
+        self._flush_handle: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, user_id: int, locale: str) -> dict[str, Any]:
+        pending = self._pending.get(user_id)
+        if pending is not None:
+            return await asyncio.shield(pending[1])
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        self._pending[user_id] = (locale, future)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(
+        self, batch: dict[int, tuple[str, asyncio.Future[dict[str, Any]]]]
+    ) -> None:
+        try:
+            rows = await self._fetch_or_create(
+                {user_id: locale for user_id, (locale, _) in batch.items()}
+            )
+        except Exception as e:  # noqa: BLE001
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for user_id, (_, future) in batch.items():
+            if future.done():
+                continue
+
+            if user_id in rows:
+                future.set_result(rows[user_id])
+            else:
+                msg = f"Failed to resolve a user config for {user_id}"
+                future.set_exception(ValueError(msg))
+
+    @staticmethod
+    async def _fetch_or_create(locales: dict[int, str]) -> dict[int, dict[str, Any]]:
+        user_insert = (
+            UserConfigs.insert(
+                *[
+                    UserConfigs(user_id=user_id, primary_language_raw=locale)
+                    for user_id, locale in locales.items()
+                ]
+            )
+            .on_conflict(action="DO NOTHING", target=(UserConfigs.user_id,))
+            .returning(*UserConfigs.all_columns())
+        )
+        columns = _column_list(UserConfigs)
+        user_ids = list(locales.keys())
+        rows = await UserConfigs.raw(
+            f"""
+            WITH user_insert AS ({{}})
+            SELECT {columns} FROM user_insert
+            UNION ALL
+            SELECT {columns} FROM {UserConfigs._meta.get_formatted_tablename()}
+            WHERE "user_id" = ANY({{}})
+            """,  # noqa: S608
+            user_insert.querystrings[0],
+            user_ids,
+        )
+        results = {row["user_id"]: row for row in rows}
+        if len(results) != len(user_ids):
+            # A concurrent insert landed after our statement snapshot was taken
+            missing = [user_id for user_id in user_ids if user_id not in results]
+            for row in await UserConfigs.select().where(
+                UserConfigs.user_id.is_in(missing)
+            ):
+                results[row["user_id"]] = row
+
+        logger.debug("Resolved %s UserConfigs in one batch", len(results))
+        return results
+
+
+USER_CONFIG_CACHE: caching.LRUTimedCache[int, dict[str, Any]] = caching.LRUTimedCache(
+    max_size=50_000,
+    ttl=timedelta(minutes=5),
+)
+"""Raw user config rows keyed by user id, backed by a Redis hash per user."""
+caching.register_invalidation_target("user_configs", USER_CONFIG_CACHE)
+USER_CONFIG_REDIS_TTL = timedelta(hours=6)
+_USER_CONFIG_LOADER = _UserConfigBatchLoader(max_batch_size=100)
+_USER_CONFIG_CACHE_LOOKUPS = metrics.get_meter(__name__).create_counter(
+    name="user_config_cache.lookups",
+    description="User config lookups by the cache layer that answered them",
+)
+_TIMESTAMP_COLUMNS: set[str] = {
+    col._meta.name for col in UserConfigs._meta.columns if isinstance(col, Timestamptz)
+}
+
+
+def _user_config_redis_key(user_id: int) -> str:
+    return f"user_config:{user_id}"
+
+
+async def _get_user_config_from_redis(user_id: int) -> dict[str, Any] | None:
+    data = await constants.REDIS_CLIENT.hgetall(_user_config_redis_key(user_id))
+    if not data:
+        return None
+
+    row: dict[str, Any] = {}
+    for raw_key, raw_value in data.items():
+        key = raw_key.decode("utf-8")
+        value = orjson.loads(raw_value)
+        if key in _TIMESTAMP_COLUMNS and value is not None:
+            value = datetime.datetime.fromisoformat(value)
+
+        row[key] = value
+
+    return row
+
+
+async def _store_user_config_in_redis(row: dict[str, Any]) -> None:
+    key = _user_config_redis_key(row["user_id"])
+    async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        # orjson only natively encodes exact datetimes, not subclasses of them
+        pipe.hset(
+            key,
+            mapping={
+                k: orjson.dumps(v, default=datetime.datetime.isoformat)
+                for k, v in row.items()
+            },
+        )
+        pipe.expire(key, USER_CONFIG_REDIS_TTL)
+        await pipe.execute()
+
+
 async def ensure_user_config(
     user_id: int, *, locale: hikari.Locale | str = hikari.Locale.EN_GB
 ) -> UserConfigs:
-    try_insert = (
-        await UserConfigs.insert(
-            UserConfigs(user_id=user_id, primary_language_raw=locale),
-        )
-        .on_conflict(action="DO NOTHING", target=(UserConfigs.user_id,))
-        .returning(*UserConfigs.all_columns())
-    )
-    if try_insert:
-        # New object
-        logger.debug("Created new UserConfig for %s", user_id)
-        obj = UserConfigs(**try_insert[0])
-        obj._exists_in_db = True
-        return obj
-
-    return await UserConfigs.objects().first().where(UserConfigs.user_id == user_id)
+    row = USER_CONFIG_CACHE.get(user_id)
+    if row is not None:
+        _USER_CONFIG_CACHE_LOOKUPS.add(1, {"cache.result": "memory_hit"})
+
+    else:
+        generation = USER_CONFIG_CACHE.generation
+        row = await _get_user_config_from_redis(user_id)
+        if row is not None:
+            _USER_CONFIG_CACHE_LOOKUPS.add(1, {"cache.result": "redis_hit"})
+
+        else:
+            _USER_CONFIG_CACHE_LOOKUPS.add(1, {"cache.result": "miss"})
+            row = await _USER_CONFIG_LOADER.load(user_id, str(locale))
+            if USER_CONFIG_CACHE.is_current(user_id, generation):
+                await _store_user_config_in_redis(row)
+
+        USER_CONFIG_CACHE.set(user_id, row, generation=generation)
+
+    obj = UserConfigs(**row)
+    obj._exists_in_db = True
+    return obj
+
+
+async def write_through_user_config(user_config: UserConfigs) -> None:
+    """Replace the cached copy of a user config after it has been saved."""
+    row = user_config.to_dict()
+    await _store_user_config_in_redis(row)
+    await caching.publish_invalidation("user_configs", user_config.user_id)
+    USER_CONFIG_CACHE.set(user_config.user_id, row)
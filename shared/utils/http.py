@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Literal
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+type HttpClientName = Literal["ntfy", "avatars", "turnstile", "discord_oauth"]
+
+
+@dataclass(frozen=True, slots=True)
+class HttpClientConfig:
+    max_connections: int
+    max_keepalive_connections: int
+    timeout: float = 10
+    keepalive_expiry: float = 60
+
+
+HTTP_CLIENT_CONFIGS: dict[HttpClientName, HttpClientConfig] = {
+    # Each client only talks to a single host so
+    # these limits are effectively per host limits
+    "ntfy": HttpClientConfig(max_connections=5, max_keepalive_connections=2),
+    "avatars": HttpClientConfig(
+        max_connections=50, max_keepalive_connections=20, timeout=5
+    ),
+    "turnstile": HttpClientConfig(max_connections=20, max_keepalive_connections=5),
+    "discord_oauth": HttpClientConfig(max_connections=50, max_keepalive_connections=10),
+}
+_CLIENTS: dict[HttpClientName, httpx.AsyncClient] = {}
+
+
+def get_http_client(name: HttpClientName) -> httpx.AsyncClient:
+    """Returns the shared, pooled client for name.
+
+    Notes
+    -----
+    Clients are created on first use and must not be closed by
+    callers, close_http_clients should be called on shutdown instead.
+    """
+    client = _CLIENTS.get(name)
+    if client is None or client.is_closed:
+        config = HTTP_CLIENT_CONFIGS[name]
+        client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(config.timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        _CLIENTS[name] = client
+
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client, for use in shutdown hooks."""
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:  # noqa: BLE001
+            log.debug("Failed to close a shared http client", exc_info=True)
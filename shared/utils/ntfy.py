@@ -1,19 +1,187 @@
-from typing import Literal
-from bot.tables import InternalErrors
-import logging
+from __future__ import annotations
 
-import httpx
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Literal, TYPE_CHECKING
+import logging
 
+from shared.utils import http
 from web.constants import NTFY_API_KEY, NTFY_URL, NTFY_TOPIC
 
+if TYPE_CHECKING:
+    from bot.tables import InternalErrors
+
 log = logging.getLogger(__name__)
 
+type Priority = Literal[1, 2, 3, 4, 5]
+type _NotificationKey = tuple[str, str | None, str | None]
+"""The title, error name and command name of a notification"""
+
+
+@dataclass(slots=True)
+class _PendingNotification:
+    title: str
+    message: str
+    priority: Priority
+    tags: str | None
+    internal_error_reference: InternalErrors | None
+    occurrences: int = 1
+
+
+class NtfyNotifier:
+    """Sends notifications in the background, collapsing duplicates.
+
+    Notes
+    -----
+    Notifications are keyed by title, error name and command name.
+    The first for a key is sent on the next flush, anything with the
+    same key inside the dedupe window is folded into a single digest
+    sent once the window has passed. At most max_pending keys are
+    held, past that new notifications are dropped.
+
+    Sends which fail are logged and counted in failed rather than
+    retried, as retrying would only add to whatever outage caused them.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: timedelta,
+        dedupe_window: timedelta,
+        max_pending: int,
+    ) -> None:
+        self.flush_interval: float = flush_interval.total_seconds()
+        self.dedupe_window: float = dedupe_window.total_seconds()
+        self.max_pending: int = max_pending
+        self.dropped: int = 0
+        self.failed: int = 0
+        self._pending: dict[_NotificationKey, _PendingNotification] = {}
+        self._last_sent: dict[_NotificationKey, float] = {}
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background sender and send anything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        await self.flush(ignore_window=True)
+
+    def add(
+        self,
+        *,
+        title: str,
+        message: str,
+        priority: Priority = 3,
+        tags: str | None = None,
+        internal_error_reference: InternalErrors | None = None,
+    ) -> bool:
+        """Queue a notification, returns False if it was dropped."""
+        key: _NotificationKey = (
+            title,
+            getattr(internal_error_reference, "error_name", None),
+            getattr(internal_error_reference, "command_name", None),
+        )
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.occurrences += 1
+            return True
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        self._pending[key] = _PendingNotification(
+            title=title,
+            message=message,
+            priority=priority,
+            tags=tags,
+            internal_error_reference=internal_error_reference,
+        )
+        return True
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self, *, ignore_window: bool = False) -> None:
+        """Send everything whose key is outside of the dedupe window."""
+        async with self._lock:
+            now = time.monotonic()
+            for key, pending in list(self._pending.items()):
+                last_sent = self._last_sent.get(key)
+                if (
+                    not ignore_window
+                    and last_sent is not None
+                    and now - last_sent < self.dedupe_window
+                ):
+                    continue
+
+                del self._pending[key]
+                self._last_sent[key] = now
+                message = pending.message
+                if pending.occurrences > 1:
+                    message += (
+                        f"\n\nSeen {pending.occurrences} times "
+                        f"in the last {timedelta(seconds=self.dedupe_window)}"
+                    )
+
+                try:
+                    sent = await send_notification(
+                        title=pending.title,
+                        message=message,
+                        priority=pending.priority,
+                        tags=pending.tags,
+                        internal_error_reference=pending.internal_error_reference,
+                    )
+                except Exception:
+                    sent = False
+                    log.exception("Failed to send a notification")
+
+                if not sent:
+                    self.failed += 1
+
+            # Forget keys which have been quiet for a full window
+            for key, last_sent in list(self._last_sent.items()):
+                if now - last_sent >= self.dedupe_window and key not in self._pending:
+                    del self._last_sent[key]
+
+
+NTFY_NOTIFIER: NtfyNotifier = NtfyNotifier(
+    flush_interval=timedelta(seconds=1),
+    dedupe_window=timedelta(minutes=5),
+    max_pending=1_000,
+)
+"""Used by notify_ethan_of_something once started by a process."""
+
 
 async def notify_ethan_of_something(
     *,
     title: str,
     message: str,
-    priority: Literal[1, 2, 3, 4, 5] = 3,
+    priority: Priority = 3,
     tags: str | None = None,
     internal_error_reference: InternalErrors | None = None,
 ) -> None:
@@ -25,7 +193,7 @@ async def notify_ethan_of_something(
         The notification title.
     message: str
         The message body as markdown
-    priority : Literal[1, 2, 3, 4, 5]
+    priority : Priority
         The priority of the notification.
 
         Defaults to three. Five is max, one is min.
@@ -36,6 +204,42 @@ async def notify_ethan_of_something(
     internal_error_reference: InternalErrors | None
         If present, adds a link to view the error in the dashboard.
 
+    Notes
+    -----
+    Once NTFY_NOTIFIER is started this only queues the
+    notification, so it never waits on ntfy itself.
+
+    """
+    if NTFY_NOTIFIER.is_running:
+        NTFY_NOTIFIER.add(
+            title=title,
+            message=message,
+            priority=priority,
+            tags=tags,
+            internal_error_reference=internal_error_reference,
+        )
+        return
+
+    await send_notification(
+        title=title,
+        message=message,
+        priority=priority,
+        tags=tags,
+        internal_error_reference=internal_error_reference,
+    )
+
+
+async def send_notification(
+    *,
+    title: str,
+    message: str,
+    priority: Priority = 3,
+    tags: str | None = None,
+    internal_error_reference: InternalErrors | None = None,
+) -> bool:
+    """Send a notification to ntfy immediately.
+
+    Returns whether ntfy accepted it.
     """
     actions = []
     if internal_error_reference is not None:
@@ -55,17 +259,19 @@ async def notify_ethan_of_something(
     if tags is not None:
         headers["Tags"] = tags
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            NTFY_URL,
-            headers=headers,
-            json={
-                "topic": NTFY_TOPIC,
-                "Title": title,
-                "message": message,
-                "actions": actions,
-            },
-        )
-        # If this hasnt worked, dont error
-        if resp.status_code != 200:  # noqa: PLR2004
-            log.error("Cannot reach ntfy, received code %s", resp.status_code)
+    resp = await http.get_http_client("ntfy").post(
+        NTFY_URL,
+        headers=headers,
+        json={
+            "topic": NTFY_TOPIC,
+            "Title": title,
+            "message": message,
+            "actions": actions,
+        },
+    )
+    # If this hasnt worked, dont error
+    if resp.status_code != 200:  # noqa: PLR2004
+        log.error("Cannot reach ntfy, received code %s", resp.status_code)
+        return False
+
+    return True
@@ -1,6 +1,82 @@
+import secrets
+import time
+from collections.abc import Collection
+
 import orjson
 import hikari
 from datetime import timedelta
+from redis.exceptions import WatchError
+
+GUILD_COUNTS_KEY = "bot:guilds:counts"
+"""A hash of cluster id to that clusters most recently published guild count"""
+GUILD_COUNT_MAX_AGE = timedelta(minutes=30)
+"""Counts older than this are from clusters which are no longer running"""
+
+
+GUILD_PRESENCE_TTL = timedelta(hours=6)
+"""How long a bot:guilds:is_in key lives without being refreshed by a sweep"""
+
+
+def _cluster_guilds_key(cluster_id: int) -> str:
+    return f"bot:guilds:cluster:{cluster_id}"
+
+
+async def publish_cluster_guilds(cluster_id: int, guild_ids: Collection[int]) -> None:
+    """Replace the set of guilds a cluster is in and publish its count."""
+    from web.constants import REDIS_CLIENT
+
+    members_key = _cluster_guilds_key(cluster_id)
+    async with REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        pipe.delete(members_key)
+        if guild_ids:
+            pipe.sadd(members_key, *guild_ids)
+            pipe.expire(members_key, GUILD_PRESENCE_TTL)
+
+        pipe.hset(
+            GUILD_COUNTS_KEY,
+            str(cluster_id),
+            orjson.dumps({"count": len(guild_ids), "updated_at": time.time()}),
+        )
+        await pipe.execute()
+
+
+async def apply_cluster_guild_changes(
+    cluster_id: int, changes: dict[int, bool], guild_count: int
+) -> None:
+    """Record guilds joining or leaving a cluster in one round trip.
+
+    Parameters
+    ----------
+    cluster_id
+        The cluster these guilds belong to.
+    changes
+        Guild id to True if the bot is now in it, False if it left.
+    guild_count
+        How many guilds the cluster is now in.
+    """
+    from web.constants import REDIS_CLIENT
+
+    members_key = _cluster_guilds_key(cluster_id)
+    async with REDIS_CLIENT.pipeline(transaction=False) as pipe:
+        for guild_id, present in changes.items():
+            if present:
+                pipe.set(
+                    f"bot:guilds:is_in:{guild_id}",
+                    orjson.dumps(guild_id),
+                    ex=GUILD_PRESENCE_TTL,
+                )
+                pipe.sadd(members_key, guild_id)
+            else:
+                pipe.delete(f"bot:guilds:is_in:{guild_id}")
+                pipe.srem(members_key, guild_id)
+
+        pipe.expire(members_key, GUILD_PRESENCE_TTL)
+        pipe.hset(
+            GUILD_COUNTS_KEY,
+            str(cluster_id),
+            orjson.dumps({"count": guild_count, "updated_at": time.time()}),
+        )
+        await pipe.execute()
 
 
 async def get_accurate_guild_count() -> int:
@@ -8,14 +84,17 @@ async def get_accurate_guild_count() -> int:
 
     Notes
     -----
-    While this doesn't block Redis, it takes
-    awhile to return results. 15-45 seconds it seems.
+    This sums the counts each cluster publishes
+    alongside its guild set so is a single round trip.
     """
     from web.constants import REDIS_CLIENT
 
+    oldest_allowed = time.time() - GUILD_COUNT_MAX_AGE.total_seconds()
     total_guilds: int = 0
-    async for _ in REDIS_CLIENT.scan_iter("bot:guilds:is_in:*", count=1000):
-        total_guilds += 1
+    for raw_data in (await REDIS_CLIENT.hgetall(GUILD_COUNTS_KEY)).values():
+        data = orjson.loads(raw_data)
+        if data["updated_at"] >= oldest_allowed:
+            total_guilds += data["count"]
 
     return total_guilds
 
@@ -62,3 +141,49 @@ async def get_cached_interaction_id(link_id: str) -> int | None:
 
     data = await REDIS_CLIENT.get(f"interaction_id:{link_id}")
     return int(data) if data else None
+
+
+async def acquire_lock(key: str, ttl: timedelta) -> str | None:
+    """Take the lock at key, returns the token needed to release it or None if held."""
+    from web.constants import REDIS_CLIENT
+
+    token = secrets.token_hex(16)
+    if not await REDIS_CLIENT.set(key, token, nx=True, ex=ttl):
+        return None
+
+    return token
+
+
+async def holds_lock(key: str, token: str) -> bool:
+    """Whether the lock at key is still held with token, rather than expired."""
+    from web.constants import REDIS_CLIENT
+
+    return await REDIS_CLIENT.get(key) == token.encode()
+
+
+async def release_lock(key: str, token: str) -> bool:
+    """Release the lock at key if it is still held with token.
+
+    Notes
+    -----
+    A lock which expired and was taken by someone else is left alone.
+    This compares and deletes under WATCH rather than in a Lua script.
+
+    """
+    from web.constants import REDIS_CLIENT
+
+    async with REDIS_CLIENT.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(key)
+            if await pipe.get(key) != token.encode():
+                return False
+
+            pipe.multi()
+            pipe.delete(key)
+            await pipe.execute()
+
+        except WatchError:
+            # Changed hands between the get and the delete
+            return False
+
+    return True
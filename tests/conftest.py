@@ -3,7 +3,7 @@ from __future__ import annotations
 from pydantic import BaseModel, ConfigDict
 
 import datetime
-from collections.abc import Sequence, AsyncIterator
+from collections.abc import Awaitable, Callable, Sequence, AsyncIterator
 from pathlib import Path
 from typing import TypeVar, Any, Self, cast
 from unittest import mock
@@ -26,6 +26,8 @@ from piccolo.utils.sync import run_sync
 
 from bot.localisation import Localisation
 from shared.saq.worker import SAQ_QUEUE
+from shared.tables import Suggestions, SuggestionStateEnum
+from shared.utils import configs
 from web import constants as w_constants
 from web.controllers import AuthController, oauth_controller
 from web.tables import APIToken, Users, OAuthEntry, GuildTokens
@@ -46,9 +48,11 @@ def change_test_dir(request, monkeypatch):
 
 
 @pytest.fixture(scope="function", autouse=True)
-async def configure_testing():
+async def configure_testing(redis_client, monkeypatch):
     # Due to the complexity of tables,
     #   tests can only run with a postgres db present
+    # Saving configs publishes cache invalidations, so every
+    #   test gets a fresh fake redis rather than the real client
 
     # Setup DB per test
     with set_env_var(var_name="PICCOLO_CONF", temp_value="piccolo_conf_test"):
@@ -60,6 +64,18 @@ async def configure_testing():
         # Set up DB
         await create_db_tables(*tables)
 
+    # Cached rows would otherwise outlive the DB they came from
+    configs.GUILD_CONFIG_CACHE.clear()
+    configs.USER_CONFIG_CACHE.clear()
+    # Lookups still pending from another test belong to its event loop
+    monkeypatch.setattr(
+        configs,
+        "_USER_CONFIG_LOADER",
+        configs._UserConfigBatchLoader(
+            max_batch_size=configs._USER_CONFIG_LOADER.max_batch_size
+        ),
+    )
+
 
 @pytest.fixture
 def context() -> lightbulb.Context:
@@ -94,16 +110,75 @@ class CustomFakedRedis:
     async def getdel(self, name):
         return self._redis_client.getdel(name)
 
-    async def set(self, name, value, ex=None):
-        return self._redis_client.set(name, value, ex=ex)
+    async def getex(self, name, ex=None):
+        return self._redis_client.getex(name, ex=ex)
+
+    async def set(self, name, value, ex=None, nx=False):
+        return self._redis_client.set(name, value, ex=ex, nx=nx)
 
     async def delete(self, *names):
         return self._redis_client.delete(*names)
 
+    async def exists(self, *names):
+        return self._redis_client.exists(*names)
+
+    async def unlink(self, *names):
+        return self._redis_client.unlink(*names)
+
+    async def scan_iter(self, match=None, count=None):
+        for key in self._redis_client.scan_iter(match, count=count):
+            yield key
+
+    async def publish(self, channel, message):
+        return self._redis_client.publish(channel, message)
+
+    async def hgetall(self, name):
+        return self._redis_client.hgetall(name)
+
+    async def hset(self, name, key=None, value=None, mapping=None):
+        return self._redis_client.hset(name, key, value, mapping=mapping)
+
+    async def expire(self, name, time):
+        return self._redis_client.expire(name, time)
+
+    def pipeline(self, transaction: bool = True):
+        return CustomFakedPipeline(self._redis_client.pipeline(transaction=transaction))
+
     async def flushdb(self, asynchronous: bool = False):
         return self._redis_client.flushdb(asynchronous=asynchronous)
 
 
+class CustomFakedPipeline:
+    """Queues commands synchronously like the real async pipeline."""
+
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+
+    def __getattr__(self, item):
+        attr = getattr(self._pipeline, item)
+        immediate = self._pipeline.watching and not self._pipeline.explicit_transaction
+        if not immediate or item in {"multi", "reset", "unwatch"}:
+            return attr
+
+        # Commands run immediately while watching, like the real client
+        async def run_now(*args, **kwargs):
+            return attr(*args, **kwargs)
+
+        return run_now
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._pipeline.reset()
+
+    async def watch(self, *names):
+        return self._pipeline.watch(*names)
+
+    async def execute(self, raise_on_error=True):
+        return self._pipeline.execute(raise_on_error=raise_on_error)
+
+
 @pytest.fixture(scope="function")
 async def redis_client(monkeypatch) -> aioredis.Redis:
     redis_client = CustomFakedRedis()
@@ -119,6 +194,24 @@ def patch_saq(monkeypatch) -> AsyncMock:
     return saq_enqueue
 
 
+@pytest.fixture(scope="function")
+def create_suggestion() -> Callable[[], Awaitable[Suggestions]]:
+    """Returns a factory for pending suggestions in guild 1 by user 2."""
+
+    async def factory() -> Suggestions:
+        suggestion = Suggestions(
+            suggestion="Test",
+            guild_configuration=await configs.ensure_guild_config(1),
+            user_configuration=await configs.ensure_user_config(2),
+            state_raw=SuggestionStateEnum.PENDING.value,
+            author_display_name="Test",
+        )
+        await suggestion.save()
+        return suggestion
+
+    return factory
+
+
 class AsyncContextManagerMock:
     """Mock for async context managers with nested mocking capabilities."""
 
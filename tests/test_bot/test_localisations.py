@@ -2,7 +2,7 @@ import lightbulb
 import pytest
 
 from bot.exceptions import MissingTranslation
-from bot.localisation import Localisation
+from bot.localisation import CompiledString, Localisation
 
 
 def test_expected_lookup(localisation: Localisation, context: lightbulb.Context):
@@ -53,3 +53,35 @@ def test_templating(localisation: Localisation, context: lightbulb.Context):
         )
         == "1 2 3"
     )
+
+
+def test_compiled_matches_templating(localisation: Localisation):
+    extras = {"SID": "abc-def", "SUGGESTION": "Test", "VOTES": "1"}
+    for locale, translations in localisation.lightbulb_provider.localizations.items():
+        for key, content in translations.items():
+            assert localisation.get_localized_string(
+                key, locale, extras=extras
+            ) == localisation.inject_locale_values(content, extras=extras)
+
+
+def test_compiled_skips_unused_guild_config():
+    class GuildConfig:
+        def to_dict(self):
+            raise AssertionError("Guild config should not have been expanded")
+
+    compiled = CompiledString.compile("Hello $NAME")
+    assert not compiled.uses_guild_config
+    assert (
+        compiled.render(extras={"NAME": "World"}, guild_config=GuildConfig())
+        == "Hello World"
+    )
+
+
+def test_compiled_expands_guild_config():
+    class GuildConfig:
+        def to_dict(self):
+            return {"guild_id": 1}
+
+    compiled = CompiledString.compile("$GUILD_CONFIG_GUILD_ID costs $$5")
+    assert compiled.uses_guild_config
+    assert compiled.render(guild_config=GuildConfig()) == "1 costs $5"
@@ -0,0 +1,40 @@
+from shared.tables import (
+    AutocompleteChanges,
+    AutocompleteSourceEnum,
+    Suggestions,
+    SuggestionStateEnum,
+)
+from shared.piccolo_migrations import shared_2026_10_16t22_31_24_860153 as migration
+from shared.utils import configs
+
+
+async def test_triggers_record_changes():
+    # The triggers only exist in the migration, so run it against the test tables
+    manager = await migration.forwards()
+    await manager.run()
+    guild_config = await configs.ensure_guild_config(1)
+    user_config = await configs.ensure_user_config(2)
+    suggestion = Suggestions(
+        suggestion="Test",
+        guild_configuration=guild_config,
+        user_configuration=user_config,
+        state_raw=SuggestionStateEnum.PENDING.value,
+        author_display_name="Test",
+    )
+    await suggestion.save()
+
+    suggestion.suggestion = "Edited"
+    await suggestion.save()
+
+    suggestion.state_raw = SuggestionStateEnum.CLEARED.value
+    await suggestion.save()
+
+    r_1 = await AutocompleteChanges.fetch_oldest(10)
+    assert [(r.guild_id, r.sID, r.present) for r in r_1] == [
+        (1, suggestion.sID, True),
+        (1, suggestion.sID, False),
+    ]
+    assert {r.source_enum for r in r_1} == {AutocompleteSourceEnum.Suggestion}
+
+    await AutocompleteChanges.delete_consumed([r.id for r in r_1])
+    assert await AutocompleteChanges.fetch_oldest(10) == []
@@ -0,0 +1,43 @@
+from shared.tables import QueuedSuggestions, QueuedSuggestionStateEnum
+from shared.utils import configs
+
+
+async def create_queued_suggestions(count: int) -> list[QueuedSuggestions]:
+    guild_config = await configs.ensure_guild_config(1)
+    user_config = await configs.ensure_user_config(2)
+    rows = []
+    for i in range(count):
+        qs = QueuedSuggestions(
+            suggestion=f"Test {i}",
+            guild_configuration=guild_config,
+            user_configuration=user_config,
+            author_display_name="Test",
+        )
+        await qs.save()
+        rows.append(qs)
+
+    return rows
+
+
+async def test_fetch_adjacent_pending():
+    first, second, third = await create_queued_suggestions(3)
+    second.state = QueuedSuggestionStateEnum.APPROVED
+    await second.save()
+
+    assert await QueuedSuggestions.count_pending_for_guild(1) == 2
+
+    r_1 = await QueuedSuggestions.fetch_adjacent_pending(1, None)
+    assert r_1.id == first.id
+    # Joins are still prefetched
+    assert r_1.guild_configuration.guild_id == 1
+
+    r_2 = await QueuedSuggestions.fetch_adjacent_pending(1, first.id)
+    assert r_2.id == third.id
+    assert await QueuedSuggestions.fetch_adjacent_pending(1, third.id) is None
+
+    r_3 = await QueuedSuggestions.fetch_adjacent_pending(1, None, forwards=False)
+    assert r_3.id == third.id
+    r_4 = await QueuedSuggestions.fetch_adjacent_pending(1, third.id, forwards=False)
+    assert r_4.id == first.id
+
+    assert await QueuedSuggestions.fetch_adjacent_pending(2, None) is None
@@ -0,0 +1,129 @@
+import asyncio
+
+from shared.tables import (
+    Suggestions,
+    SuggestionVotes,
+    SuggestionsVoteTypeEnum,
+)
+
+
+async def test_record_vote_change(create_suggestion):
+    suggestion = await create_suggestion()
+    assert suggestion.up_votes == 0
+    assert suggestion.down_votes == 0
+
+    await suggestion.record_vote_change(added=SuggestionsVoteTypeEnum.UpVote)
+    await suggestion.record_vote_change(added=SuggestionsVoteTypeEnum.UpVote)
+    assert suggestion.up_votes == 2
+    assert suggestion.down_votes == 0
+
+    await suggestion.record_vote_change(
+        added=SuggestionsVoteTypeEnum.DownVote,
+        removed=SuggestionsVoteTypeEnum.UpVote,
+    )
+    assert suggestion.up_votes == 1
+    assert suggestion.down_votes == 1
+
+    r_1 = await Suggestions.objects().get(Suggestions.id == suggestion.id)
+    assert r_1.up_votes == 1
+    assert r_1.down_votes == 1
+
+
+async def test_repair_vote_counts(create_suggestion):
+    suggestion = await create_suggestion()
+    await SuggestionVotes.insert(
+        SuggestionVotes(
+            suggestion=suggestion,
+            user_id=1,
+            vote_type=SuggestionsVoteTypeEnum.UpVote,
+        ),
+        SuggestionVotes(
+            suggestion=suggestion,
+            user_id=2,
+            vote_type=SuggestionsVoteTypeEnum.UpVote,
+        ),
+        SuggestionVotes(
+            suggestion=suggestion,
+            user_id=3,
+            vote_type=SuggestionsVoteTypeEnum.DownVote,
+        ),
+    )
+    # Second suggestion has no votes and must stay untouched
+    await create_suggestion()
+
+    assert await Suggestions.repair_vote_counts(batch_size=1) == 1
+    r_1 = await Suggestions.objects().get(Suggestions.id == suggestion.id)
+    assert r_1.up_votes == 2
+    assert r_1.down_votes == 1
+
+    assert await Suggestions.repair_vote_counts() == 0
+
+
+async def test_repair_waits_for_votes_in_progress(create_suggestion):
+    suggestion = await create_suggestion()
+    # Drifted counters so the repair has something to fix
+    await Suggestions.update({Suggestions.up_votes: 5}).where(
+        Suggestions.id == suggestion.id
+    )
+    counter_updated = asyncio.Event()
+    commit = asyncio.Event()
+
+    async def vote():
+        async with Suggestions._meta.db.transaction():
+            await SuggestionVotes.insert(
+                SuggestionVotes(
+                    suggestion=suggestion,
+                    user_id=1,
+                    vote_type=SuggestionsVoteTypeEnum.UpVote,
+                )
+            )
+            await suggestion.record_vote_change(added=SuggestionsVoteTypeEnum.UpVote)
+            counter_updated.set()
+            await commit.wait()
+
+    voting = asyncio.create_task(vote())
+    await counter_updated.wait()
+    repairing = asyncio.create_task(Suggestions.repair_vote_counts())
+    await asyncio.sleep(0.1)
+    commit.set()
+    await voting
+
+    # Counting from before the vote committed would have undone it
+    assert await repairing == 1
+    r_1 = await Suggestions.objects().get(Suggestions.id == suggestion.id)
+    assert r_1.up_votes == 1
+
+
+async def test_fetch_voter_page(create_suggestion):
+    suggestion = await create_suggestion()
+    await SuggestionVotes.insert(
+        *[
+            SuggestionVotes(
+                suggestion=suggestion,
+                user_id=user_id,
+                vote_type=(
+                    SuggestionsVoteTypeEnum.UpVote
+                    if user_id % 2
+                    else SuggestionsVoteTypeEnum.DownVote
+                ),
+            )
+            for user_id in range(1, 8)
+        ]
+    )
+
+    r_1 = await SuggestionVotes.fetch_voter_page(suggestion.id, limit=3)
+    assert [v.user_id for v in r_1] == [1, 2, 3]
+
+    r_2 = await SuggestionVotes.fetch_voter_page(suggestion.id, after=r_1[-1].id, limit=3)
+    assert [v.user_id for v in r_2] == [4, 5, 6]
+
+    r_3 = await SuggestionVotes.fetch_voter_page(suggestion.id, before=r_2[0].id, limit=2)
+    assert [v.user_id for v in r_3] == [2, 3]
+
+    r_4 = await SuggestionVotes.fetch_voter_page(suggestion.id, from_end=True, limit=2)
+    assert [v.user_id for v in r_4] == [6, 7]
+
+    r_5 = await SuggestionVotes.fetch_voter_page(
+        suggestion.id, vote_type=SuggestionsVoteTypeEnum.UpVote
+    )
+    assert [v.user_id for v in r_5] == [1, 3, 5, 7]
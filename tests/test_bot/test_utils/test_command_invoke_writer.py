@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from bot.tables import CommandInvokes, CommandTypes
+from bot.utils.command_invoke_writer import CommandInvokeWriter
+from shared.utils import configs
+
+
+def create_writer(*, max_queued: int = 100) -> CommandInvokeWriter:
+    return CommandInvokeWriter(
+        flush_interval=timedelta(minutes=1),
+        max_batch_size=2,
+        max_queued=max_queued,
+    )
+
+
+async def create_invoke(user_id: int) -> CommandInvokes:
+    user_config = await configs.ensure_user_config(user_id)
+    return CommandInvokes(
+        action="/test",
+        action_type=CommandTypes.SLASH_COMMAND,
+        user_id=user_config.user_id,
+        user_locale=user_config.primary_language.value,
+    )
+
+
+async def test_flush_writes_in_batches():
+    writer = create_writer()
+    for user_id in range(5):
+        assert writer.add(await create_invoke(user_id)) is True
+
+    assert len(writer) == 5
+    assert await CommandInvokes.count() == 0
+
+    await writer.flush()
+    assert len(writer) == 0
+    assert await CommandInvokes.count() == 5
+
+
+async def test_drops_once_full():
+    writer = create_writer(max_queued=2)
+    assert writer.add(await create_invoke(1)) is True
+    assert writer.add(await create_invoke(2)) is True
+    assert writer.add(await create_invoke(3)) is False
+    assert writer.dropped == 1
+
+    await writer.stop()
+    assert await CommandInvokes.count() == 2
+
+
+async def test_create_saves_without_writer():
+    user_config = await configs.ensure_user_config(1)
+    r_1 = await CommandInvokes.create(
+        user_config=user_config,
+        action="/test",
+        command_type=CommandTypes.SLASH_COMMAND,
+    )
+    assert r_1.id is not None
+    assert await CommandInvokes.count() == 1
+
+
+async def test_failing_batches_are_eventually_dropped(monkeypatch):
+    writer = create_writer()
+    writer.add(await create_invoke(1))
+    writer.add(await create_invoke(2))
+
+    def fail(*_):
+        raise RuntimeError
+
+    with monkeypatch.context() as m:
+        m.setattr(CommandInvokes, "insert", fail)
+        for _ in range(writer.max_flush_attempts - 1):
+            await writer.flush()
+            assert len(writer) == 2  # noqa: PLR2004
+
+        await writer.flush()
+
+    assert len(writer) == 0
+    assert writer.dropped == 2  # noqa: PLR2004
+
+    # Later invocations aren't held up behind the dropped batch
+    writer.add(await create_invoke(3))
+    await writer.flush()
+    assert await CommandInvokes.count() == 1
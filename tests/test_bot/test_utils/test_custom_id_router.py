@@ -0,0 +1,77 @@
+import pytest
+
+from bot.bot import COMPONENT_ROUTER, MODAL_ROUTER
+from bot.utils import CustomIdRouter, ParsedCustomId
+from shared.tables import SuggestionsVoteTypeEnum
+
+
+def test_longest_prefix_wins():
+    router: CustomIdRouter[str] = CustomIdRouter()
+    router.register("v4_queue", "short", parser=ParsedCustomId)
+    router.register("v4_queue:", "long", parser=ParsedCustomId)
+
+    route, parsed = router.resolve("v4_queue:next")
+    assert route.handler == "long"
+    assert parsed.component_key == "next"
+
+    route, parsed = router.resolve("v4_queued")
+    assert route.handler == "short"
+    assert parsed.component_key == "d"
+
+    assert router.resolve("v4_que") is None
+    assert router.resolve("") is None
+
+
+def test_duplicate_prefixes_are_rejected():
+    router: CustomIdRouter[str] = CustomIdRouter()
+    router.register("gcm:", "first", parser=ParsedCustomId, aliases=("legacy",))
+    with pytest.raises(ValueError):
+        router.register("legacy", "second", parser=ParsedCustomId)
+
+
+@pytest.mark.parametrize(
+    ("custom_id", "vote"),
+    [
+        ("v4_suggestions_up_vote:abc-123", SuggestionsVoteTypeEnum.UpVote),
+        ("v4_suggestions_down_vote:abc-123", SuggestionsVoteTypeEnum.DownVote),
+        ("suggestion_up_vote:abc-123", SuggestionsVoteTypeEnum.UpVote),
+        ("suggestion_down_vote|abc-123", SuggestionsVoteTypeEnum.DownVote),
+        ("SuggestionUpVote\t|abc-123", SuggestionsVoteTypeEnum.UpVote),
+        ("SuggestionDownVote\t|abc-123", SuggestionsVoteTypeEnum.DownVote),
+    ],
+)
+def test_vote_formats(custom_id, vote):
+    _, parsed = COMPONENT_ROUTER.resolve(custom_id)
+    assert parsed.component_key == f"suggestion {vote.value}"
+    assert parsed.values == {"suggestion_id": "abc-123", "vote": vote}
+
+
+def test_queue_formats():
+    _, r_1 = COMPONENT_ROUTER.resolve("v4_queue:approve:pid:qs-1:link")
+    assert r_1.component_key == "queue paginator approve"
+    assert r_1.link_id == "link"
+    assert r_1.values["queued_suggestion_id"] == "qs-1"
+
+    _, r_2 = COMPONENT_ROUTER.resolve("v4_queue:next:pid::link")
+    assert r_2.values["queued_suggestion_id"] is None
+
+    _, r_3 = COMPONENT_ROUTER.resolve("v4_queued_suggestion:reject:qs-1")
+    assert r_3.component_key == "queue reject"
+    assert r_3.values == {"queued_suggestion_id": "qs-1", "to_approve": False}
+
+    _, r_4 = COMPONENT_ROUTER.resolve("queue_approve\u200b")
+    assert r_4.component_key == "queue approve"
+    assert r_4.values == {"queued_suggestion_id": None, "to_approve": True}
+
+
+def test_modal_formats():
+    _, r_1 = MODAL_ROUTER.resolve("guild_premium_modal:link:custom_name")
+    assert r_1.component_key == "guild premium custom name modal"
+    assert r_1.link_id == "link"
+    assert r_1.values == {"modal_type": "custom_name"}
+
+    _, r_2 = MODAL_ROUTER.resolve("queue_resolve_modal:link:12")
+    assert r_2.component_key == "queue resolve modal"
+    assert r_2.values == {"suggestion_id": "12"}
+
+    assert MODAL_ROUTER.resolve("unknown_modal:link") is None
@@ -0,0 +1,40 @@
+import hikari
+import pytest
+
+from bot.localisation import Localisation
+from bot.utils import fragments
+
+
+@pytest.fixture(autouse=True)
+def clear_fragments():
+    fragments.clear_fragments()
+    yield
+    fragments.clear_fragments()
+
+
+def test_vote_buttons_are_shared_per_suggestion():
+    row = fragments.vote_buttons("abc")
+    assert fragments.vote_buttons("abc") is row
+    assert fragments.vote_buttons("def") is not row
+    assert [c.custom_id for c in row.components] == [
+        "v4_suggestions_up_vote:abc",
+        "v4_suggestions_down_vote:abc",
+    ]
+
+
+def test_paginated_queue_buttons_are_not_cached(localisation: Localisation):
+    row = fragments.queue_buttons(
+        localisation, hikari.Locale.EN_GB, approve_id="a", reject_id="r"
+    )
+    assert (
+        fragments.queue_buttons(
+            localisation, hikari.Locale.EN_GB, approve_id="a", reject_id="r"
+        )
+        is row
+    )
+    assert (
+        fragments.build_queue_buttons(
+            localisation, hikari.Locale.EN_GB, approve_id="a", reject_id="r"
+        )
+        is not row
+    )
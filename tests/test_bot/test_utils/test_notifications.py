@@ -0,0 +1,100 @@
+from unittest.mock import AsyncMock, Mock
+
+import hikari
+import pytest
+
+from bot.utils import notifications
+from shared.tables import UserConfigs
+
+
+def create_recipients(
+    count: int, locale: hikari.Locale, *, start: int = 1000
+) -> list[UserConfigs]:
+    return [
+        UserConfigs(user_id=start + index, primary_language_raw=locale.value)
+        for index in range(count)
+    ]
+
+
+async def test_renders_once_per_locale(redis_client):
+    rendered: list[hikari.Locale] = []
+
+    async def render(locale: hikari.Locale):
+        rendered.append(locale)
+        return [[locale.value], ["second"]]
+
+    rest = AsyncMock()
+    rest.create_dm_channel.side_effect = lambda user_id: Mock(id=user_id + 1)
+    recipients = create_recipients(20, hikari.Locale.EN_GB)
+    recipients += create_recipients(5, hikari.Locale.FR, start=2000)
+    result = await notifications.fan_out_notification(
+        recipients,
+        render,
+        rest=rest,
+        caller_name="test",
+        pacer=notifications.RequestPacer(10_000),
+    )
+    assert result == notifications.FanOutResult(sent=25)
+    assert sorted(rendered) == sorted([hikari.Locale.EN_GB, hikari.Locale.FR])
+    assert rest.create_message.await_count == 50  # noqa: PLR2004
+    assert rest.create_message.await_args_list[-1].kwargs == {"components": ["second"]}
+
+
+async def test_cached_dm_channels_are_reused(redis_client):
+    await redis_client.set("dm_channel_id:1000", 55)
+
+    async def render(_):
+        return [["hello"]]
+
+    rest = AsyncMock()
+    rest.create_dm_channel.side_effect = lambda user_id: Mock(id=user_id + 1)
+    await notifications.fan_out_notification(
+        create_recipients(2, hikari.Locale.EN_GB),
+        render,
+        rest=rest,
+        caller_name="test",
+        pacer=notifications.RequestPacer(10_000),
+    )
+    rest.create_dm_channel.assert_awaited_once_with(1001)
+    assert {c.args[0] for c in rest.create_message.await_args_list} == {55, 1002}
+    assert await redis_client.get("dm_channel_id:1001") == b"1002"
+
+
+async def test_forbidden_users_dont_stop_delivery(redis_client):
+    async def render(_):
+        return [["hello"]]
+
+    async def create_message(channel_id, *, components):
+        if channel_id == 1001:  # noqa: PLR2004
+            raise hikari.ForbiddenError("test", {}, "test")
+
+    rest = AsyncMock()
+    rest.create_dm_channel.side_effect = lambda user_id: Mock(id=user_id + 1)
+    rest.create_message.side_effect = create_message
+    result = await notifications.fan_out_notification(
+        create_recipients(3, hikari.Locale.EN_GB),
+        render,
+        rest=rest,
+        caller_name="test",
+        pacer=notifications.RequestPacer(10_000),
+    )
+    assert result == notifications.FanOutResult(sent=2, forbidden=1)
+
+
+async def test_unexpected_errors_propagate(redis_client):
+    async def render(_):
+        return [["hello"]]
+
+    rest = AsyncMock()
+    rest.create_dm_channel.side_effect = lambda user_id: Mock(id=user_id + 1)
+    rest.create_message.side_effect = hikari.InternalServerError("test", 500, {}, "test")
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await notifications.fan_out_notification(
+            create_recipients(1, hikari.Locale.EN_GB),
+            render,
+            rest=rest,
+            caller_name="test",
+            pacer=notifications.RequestPacer(10_000),
+        )
+
+    assert exc_info.group_contains(hikari.InternalServerError)
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, Mock
+
+from bot.utils import otel
+from web import constants
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+def test_inline_link_state_round_trip():
+    link_id = otel.encode_inline_link_state({"traceparent": TRACEPARENT})
+    assert link_id is not None
+    assert link_id.startswith(otel.INLINE_LINK_STATE_MARKER)
+    assert len(link_id) == 35
+    assert ":" not in link_id
+
+    assert otel.decode_inline_link_state(link_id) == {"traceparent": TRACEPARENT}
+
+
+async def test_link_state_without_context():
+    link_id = otel.encode_inline_link_state({})
+    assert link_id is not None
+    assert link_id.startswith(otel.EMPTY_LINK_STATE_MARKER)
+    assert len(link_id) == 32
+    # Link ids also key cached interaction ids, so sessions must not share one
+    assert otel.encode_inline_link_state({}) != link_id
+    assert otel.decode_inline_link_state(link_id) is None
+    assert await otel.get_context_from_link_state(link_id) is None
+
+
+def test_inline_link_state_unsupported():
+    assert (
+        otel.encode_inline_link_state(
+            {"traceparent": TRACEPARENT, "tracestate": "vendor=value"}
+        )
+        is None
+    )
+    assert otel.encode_inline_link_state({"traceparent": "01-" + TRACEPARENT[3:]}) is None
+    # Redis backed link ids are left alone
+    assert otel.decode_inline_link_state("V1StGXR8_Z5jdHi6B-myTV1StGXR8_") is None
+
+
+async def test_generate_prefers_inline(monkeypatch):
+    redis = AsyncMock()
+    monkeypatch.setattr(constants, "REDIS_CLIENT", redis)
+    monkeypatch.setattr(
+        constants,
+        "OTEL_PROPAGATOR",
+        Mock(inject=lambda carrier: carrier.update(traceparent=TRACEPARENT)),
+    )
+
+    link_id = await otel.generate_trace_link_state()
+    assert link_id.startswith(otel.INLINE_LINK_STATE_MARKER)
+    assert await otel.get_context_from_link_state(link_id) is not None
+    redis.set.assert_not_called()
+    redis.get.assert_not_called()
+
+
+async def test_generate_falls_back_to_redis(monkeypatch):
+    redis = AsyncMock()
+    monkeypatch.setattr(constants, "REDIS_CLIENT", redis)
+    # A tracestate can't be carried inline
+    monkeypatch.setattr(
+        constants,
+        "OTEL_PROPAGATOR",
+        Mock(
+            inject=lambda carrier: carrier.update(
+                traceparent=TRACEPARENT, tracestate="vendor=value"
+            )
+        ),
+    )
+
+    link_id = await otel.generate_trace_link_state()
+    assert not link_id.startswith(otel.INLINE_LINK_STATE_MARKER)
+    redis.set.assert_awaited_once()
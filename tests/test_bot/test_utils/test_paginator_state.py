@@ -0,0 +1,57 @@
+import orjson
+import pytest
+
+from bot.utils import PaginatorState
+from bot.utils.paginator_state import (
+    StatefulPaginator,
+    delete_paginator_state,
+    load_paginator_state,
+    save_paginator_state,
+)
+
+
+def create_state() -> PaginatorState:
+    return PaginatorState(
+        kind="queue",
+        guild_id=1,
+        user_id=2,
+        locale="en-GB",
+        link_id="~",
+        application_id=3,
+        interaction_token="token",
+        total=2,
+        cursor=1,
+        cursor_sid="abc",
+    )
+
+
+def test_state_round_trip():
+    state = create_state()
+    assert PaginatorState.loads(state.dumps()) == state
+
+
+def test_state_ignores_unknown_fields():
+    state = create_state()
+    raw_data = orjson.dumps({**orjson.loads(state.dumps()), "data": ["abc"]})
+    assert PaginatorState.loads(raw_data) == state
+
+
+async def test_state_survives_in_redis(redis_client):
+    state = create_state()
+    state.page_index = 1
+    await save_paginator_state("pid", state)
+
+    r_1 = await load_paginator_state("pid")
+    assert r_1 == state
+
+    await delete_paginator_state("pid")
+    assert await load_paginator_state("pid") is None
+
+
+def test_paginators_must_handle_pages():
+    class NoPages(StatefulPaginator[str]):
+        kind = "queue"
+        expired_key = "menus.queue_paginator.responses.expired"
+
+    with pytest.raises(TypeError):
+        NoPages(pid="pid", state=create_state(), rest=None)
@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import hikari
+import httpx
+import pytest
+
+from bot.utils import users
+from shared.utils import http
+
+
+async def test_concurrent_lookups_are_coalesced(redis_client, monkeypatch):
+    async def check_user_avatar(user_id, *, rest):
+        await asyncio.sleep(0.01)
+        return "https://cdn.discordapp.com/avatars/1/a.png"
+
+    mock = AsyncMock(side_effect=check_user_avatar)
+    monkeypatch.setattr(users, "_check_user_avatar", mock)
+    results = await asyncio.gather(
+        *[users.fetch_user_avatar(101, rest=AsyncMock()) for _ in range(5)]
+    )
+    assert results == [hikari.URL("https://cdn.discordapp.com/avatars/1/a.png")] * 5
+    assert mock.await_count == 1
+
+
+async def test_missing_avatars_are_cached(redis_client, monkeypatch):
+    mock = AsyncMock(return_value=None)
+    monkeypatch.setattr(users, "_check_user_avatar", mock)
+    assert await users.fetch_user_avatar(102, rest=AsyncMock()) is None
+    assert await redis_client.get("avatars/102") == b""
+
+    users._RESOLVED_AVATARS.clear()
+    assert await users.fetch_user_avatar(102, rest=AsyncMock()) is None
+    assert mock.await_count == 1
+
+
+@pytest.mark.parametrize(("status", "cached"), [(404, True), (429, False), (503, False)])
+async def test_only_missing_avatars_are_negatively_cached(
+    redis_client, monkeypatch, status, cached
+):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda _: httpx.Response(status))
+    )
+    monkeypatch.setattr(http, "get_http_client", lambda _: client)
+    rest = AsyncMock()
+    rest.fetch_user.return_value.display_avatar_url.url = (
+        "https://cdn.discordapp.com/avatars/1/a.png"
+    )
+    assert await users.fetch_user_avatar(103, rest=rest) is None
+    assert (await redis_client.get("avatars/103") is not None) is cached
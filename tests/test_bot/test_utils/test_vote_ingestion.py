@@ -0,0 +1,190 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from bot.utils.vote_ingestion import VoteIngestionBuffer, VoteOutcome
+from shared.tables import (
+    Suggestions,
+    SuggestionVotes,
+    SuggestionsVoteTypeEnum,
+)
+
+# Flushes queue message edits for the suggestions they wrote to
+pytestmark = pytest.mark.usefixtures("patch_saq")
+
+
+def create_buffer() -> VoteIngestionBuffer:
+    return VoteIngestionBuffer(
+        flush_interval=timedelta(minutes=1),
+        max_buffered_votes=100,
+        max_pending_votes=1_000,
+    )
+
+
+async def test_outcomes_use_buffered_state(create_suggestion):
+    suggestion = await create_suggestion()
+    buffer = create_buffer()
+
+    async def vote(user_id: int, vote_type: SuggestionsVoteTypeEnum) -> VoteOutcome:
+        return await buffer.add(
+            suggestion_id=suggestion.id,
+            user_id=user_id,
+            vote=vote_type,
+            voter_display_name=f"<@{user_id}>",
+        )
+
+    assert await vote(1, SuggestionsVoteTypeEnum.UpVote) is VoteOutcome.CREATED
+    assert await vote(1, SuggestionsVoteTypeEnum.UpVote) is VoteOutcome.UNCHANGED
+    assert await vote(1, SuggestionsVoteTypeEnum.DownVote) is VoteOutcome.CHANGED
+    assert await vote(2, SuggestionsVoteTypeEnum.UpVote) is VoteOutcome.CREATED
+    assert len(buffer) == 2
+    assert await SuggestionVotes.count() == 0
+
+    await buffer.flush()
+    assert len(buffer) == 0
+    assert await SuggestionVotes.count() == 2
+    assert await vote(1, SuggestionsVoteTypeEnum.DownVote) is VoteOutcome.UNCHANGED
+    assert await vote(2, SuggestionsVoteTypeEnum.DownVote) is VoteOutcome.CHANGED
+
+    await buffer.flush()
+    r_1 = await Suggestions.objects().get(Suggestions.id == suggestion.id)
+    assert r_1.up_votes == 0
+    assert r_1.down_votes == 2
+
+
+async def test_existing_votes_are_respected(create_suggestion):
+    suggestion = await create_suggestion()
+    await SuggestionVotes.insert(
+        SuggestionVotes(
+            suggestion=suggestion,
+            user_id=1,
+            vote_type=SuggestionsVoteTypeEnum.UpVote,
+            voter_display_name_raw="Existing",
+        )
+    )
+    await suggestion.record_vote_change(added=SuggestionsVoteTypeEnum.UpVote)
+    buffer = create_buffer()
+
+    r_1 = await buffer.add(
+        suggestion_id=suggestion.id,
+        user_id=1,
+        vote=SuggestionsVoteTypeEnum.UpVote,
+        voter_display_name="<@1>",
+    )
+    assert r_1 is VoteOutcome.UNCHANGED
+
+    r_2 = await buffer.add(
+        suggestion_id=suggestion.id,
+        user_id=1,
+        vote=SuggestionsVoteTypeEnum.DownVote,
+        voter_display_name="<@1>",
+    )
+    assert r_2 is VoteOutcome.CHANGED
+
+    await buffer.stop()
+    vote = await SuggestionVotes.objects().get(SuggestionVotes.user_id == 1)
+    assert vote.vote_type_enum is SuggestionsVoteTypeEnum.DownVote
+    assert vote.voter_display_name_raw == "Existing"
+    assert await Suggestions.repair_vote_counts() == 0
+
+
+async def test_only_the_voters_vote_is_looked_up(create_suggestion):
+    suggestion = await create_suggestion()
+    buffer = create_buffer()
+    r_1 = await buffer.add(
+        suggestion_id=suggestion.id,
+        user_id=1,
+        vote=SuggestionsVoteTypeEnum.UpVote,
+        voter_display_name="<@1>",
+    )
+    assert r_1 is VoteOutcome.CREATED
+
+    # Voted outside the buffer after user 1's vote was looked up
+    await SuggestionVotes.insert(
+        SuggestionVotes(
+            suggestion=suggestion,
+            user_id=2,
+            vote_type=SuggestionsVoteTypeEnum.UpVote,
+        )
+    )
+    r_2 = await buffer.add(
+        suggestion_id=suggestion.id,
+        user_id=2,
+        vote=SuggestionsVoteTypeEnum.UpVote,
+        voter_display_name="<@2>",
+    )
+    assert r_2 is VoteOutcome.UNCHANGED
+
+
+async def test_full_buffers_flush_before_acknowledging(create_suggestion):
+    suggestion = await create_suggestion()
+    buffer = VoteIngestionBuffer(
+        flush_interval=timedelta(minutes=1),
+        max_buffered_votes=1,
+        max_pending_votes=3,
+    )
+    for user_id in range(1, 4):
+        await buffer.add(
+            suggestion_id=suggestion.id,
+            user_id=user_id,
+            vote=SuggestionsVoteTypeEnum.UpVote,
+            voter_display_name=f"<@{user_id}>",
+        )
+
+    assert len(buffer) == 0
+    assert await SuggestionVotes.count() == 3  # noqa: PLR2004
+    r_1 = await Suggestions.objects().get(Suggestions.id == suggestion.id)
+    assert r_1.up_votes == 3  # noqa: PLR2004
+
+
+async def test_lookups_are_batched_without_waiting_for_flushes(
+    monkeypatch, create_suggestion
+):
+    suggestion = await create_suggestion()
+    buffer = create_buffer()
+    lookups: list[list[tuple[int, int]]] = []
+    fetch_vote_types = buffer._fetch_vote_types
+
+    async def record_lookup(keys):
+        lookups.append(keys)
+        return await fetch_vote_types(keys)
+
+    monkeypatch.setattr(buffer, "_fetch_vote_types", record_lookup)
+    # As if a slow flush was in progress
+    async with buffer._lock:
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    buffer.add(
+                        suggestion_id=suggestion.id,
+                        user_id=user_id,
+                        vote=SuggestionsVoteTypeEnum.UpVote,
+                        voter_display_name=f"<@{user_id}>",
+                    )
+                    for user_id in range(1, 4)
+                )
+            ),
+            timeout=5,
+        )
+
+    assert outcomes == [VoteOutcome.CREATED] * 3
+    assert len(lookups) == 1
+    assert sorted(lookups[0]) == [(suggestion.id, user_id) for user_id in range(1, 4)]
+
+
+async def test_edits_are_queued_once_votes_are_written(patch_saq, create_suggestion):
+    suggestion = await create_suggestion()
+    buffer = create_buffer()
+    await buffer.add(
+        suggestion_id=suggestion.id,
+        user_id=1,
+        vote=SuggestionsVoteTypeEnum.UpVote,
+        voter_display_name="<@1>",
+    )
+    patch_saq.assert_not_awaited()
+
+    await buffer.flush()
+    patch_saq.assert_awaited_once()
+    assert patch_saq.await_args.kwargs["suggestion_id"] == suggestion.sID
+    assert patch_saq.await_args.kwargs["guild_id"] == 1
@@ -0,0 +1,78 @@
+import re
+from unittest.mock import AsyncMock
+
+from bot.utils import PaginatorState, ViewVotersPaginator
+from bot.utils.voter_paginator import VOTERS_PER_PAGE
+from shared.tables import (
+    Suggestions,
+    SuggestionVotes,
+    SuggestionsVoteTypeEnum,
+)
+
+
+async def add_votes(suggestion: Suggestions, user_ids: range) -> None:
+    await SuggestionVotes.insert(
+        *[
+            SuggestionVotes(
+                suggestion=suggestion,
+                user_id=user_id,
+                vote_type=SuggestionsVoteTypeEnum.UpVote,
+            )
+            for user_id in user_ids
+        ]
+    )
+
+
+def create_paginator(suggestion: Suggestions) -> ViewVotersPaginator:
+    return ViewVotersPaginator(
+        pid="pid",
+        state=PaginatorState(
+            kind="voters",
+            guild_id=1,
+            user_id=2,
+            locale="en-GB",
+            link_id="~",
+            application_id=3,
+            interaction_token="token",
+            sid=suggestion.sID,
+            suggestion_id=suggestion.id,
+        ),
+        rest=AsyncMock(),
+    )
+
+
+def shown_voters(paginator: ViewVotersPaginator) -> list[int]:
+    components = paginator._rest.edit_interaction_response.await_args.kwargs["components"]
+    text = components[1].components[0].content
+    return [int(user_id) for user_id in re.findall(r"<@(\d+)>", text)]
+
+
+async def test_pages_are_counted_from_votes(redis_client, create_suggestion):
+    # The counters on the suggestion were never updated for these votes
+    suggestion = await create_suggestion()
+    await add_votes(suggestion, range(1, VOTERS_PER_PAGE + 6))
+    paginator = create_paginator(suggestion)
+    assert await paginator.start() is not None
+    assert paginator.total_pages == 2  # noqa: PLR2004
+
+    await paginator.previous_page()
+    assert paginator.current_page == 2  # noqa: PLR2004
+    assert len(shown_voters(paginator)) == 5  # noqa: PLR2004
+
+
+async def test_votes_cast_while_paginating_are_shown(redis_client, create_suggestion):
+    suggestion = await create_suggestion()
+    await add_votes(suggestion, range(1, VOTERS_PER_PAGE + 1))
+    paginator = create_paginator(suggestion)
+    await paginator.start()
+    assert paginator.total_pages == 1
+
+    await add_votes(suggestion, range(100, 103))
+    await paginator.next_page()
+    assert paginator.current_page == 2  # noqa: PLR2004
+    assert paginator.total_pages == 2  # noqa: PLR2004
+    assert shown_voters(paginator) == [100, 101, 102]
+
+    await paginator.next_page()
+    assert paginator.current_page == 1
+    assert shown_voters(paginator)[0] == 1
@@ -0,0 +1,72 @@
+import datetime
+
+from bot.tables import (
+    AggregateCommandInvokes,
+    CommandInvokeDailyRollups,
+    CommandInvokes,
+    CommandTypes,
+    RollupDimension,
+)
+from shared.saq.aggregate_command_invokes import compose_week, roll_up_day
+
+WEEK_STARTING = datetime.date(2026, 10, 5)
+
+
+async def create_invoke(
+    day_offset: int, user_id: int, action: str, guild_id: int | None = None
+) -> None:
+    await CommandInvokes(
+        action=action,
+        action_type=(
+            CommandTypes.BUTTON
+            if action == "Suggestion Vote"
+            else CommandTypes.SLASH_COMMAND
+        ),
+        user_id=user_id,
+        user_locale="en_GB",
+        guild_id=guild_id,
+        guild_locale="en_GB" if guild_id else None,
+        created_at=datetime.datetime.combine(
+            WEEK_STARTING + datetime.timedelta(days=day_offset),
+            datetime.time(hour=12),
+            tzinfo=datetime.UTC,
+        ),
+    ).save()
+
+
+async def test_roll_up_day_is_idempotent():
+    await create_invoke(0, 1, "/suggest", guild_id=10)
+    await create_invoke(0, 1, "Suggestion Vote", guild_id=10)
+    await roll_up_day(WEEK_STARTING)
+    await roll_up_day(WEEK_STARTING)
+
+    rows = await CommandInvokeDailyRollups.select().where(
+        CommandInvokeDailyRollups.dimension == RollupDimension.USER
+    )
+    assert len(rows) == 1
+    assert rows[0]["value"] == "1"
+    assert rows[0]["total"] == 2
+
+
+async def test_compose_week_from_days():
+    # User 1 runs a command and votes, user 2 only votes across two days
+    await create_invoke(0, 1, "/suggest", guild_id=10)
+    await create_invoke(1, 1, "Suggestion Vote", guild_id=10)
+    await create_invoke(0, 2, "Suggestion Vote", guild_id=11)
+    await create_invoke(3, 2, "Suggestion Vote", guild_id=11)
+    # Outside the week
+    await create_invoke(7, 3, "/suggest", guild_id=12)
+    for offset in range(8):
+        await roll_up_day(WEEK_STARTING + datetime.timedelta(days=offset))
+
+    r_1: AggregateCommandInvokes = await compose_week(WEEK_STARTING)
+    assert r_1.total_users_seen == 2
+    assert r_1.total_guilds_seen == 2
+    assert r_1.total_voters_seen == 2
+    assert r_1.total_users_who_only_voted == 1
+    assert r_1.actions == {"/suggest": 1, "Suggestion Vote": 3}
+    assert r_1.guild_locales == {"en_GB": 4}
+    assert r_1.data_for_week_starting == datetime.datetime(
+        2026, 10, 5, tzinfo=datetime.UTC
+    )
+    await r_1.save()
@@ -0,0 +1,170 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from shared import utils
+from shared.saq import suggestions
+from shared.saq.suggestions import SuggestionEditFlags
+from shared.tables import (
+    AutocompleteChanges,
+    AutocompleteSourceEnum,
+    QueuedSuggestions,
+    Suggestions,
+    SuggestionStateEnum,
+)
+from shared.utils import configs
+
+SYNC_LOCK_KEY = "saq:sync_autocomplete_changes_is_running"
+
+
+async def test_edits_are_merged_into_one_job(redis_client, patch_saq):
+    await suggestions.queue_suggestion_edit("abc", 1)
+    await suggestions.queue_suggestion_edit(
+        "abc", 1, exclude_buttons=True, as_resolved=True
+    )
+    await suggestions.queue_suggestion_edit("abc", 1)
+    assert patch_saq.await_count == 1
+
+    # The resolve shouldn't be lost just because a vote edit was queued first
+    assert await suggestions.claim_suggestion_edit_flags(
+        "abc", "job_1"
+    ) == SuggestionEditFlags(exclude_buttons=True, as_resolved=True)
+
+    await suggestions.queue_suggestion_edit("abc", 1)
+    assert patch_saq.await_count == 2  # noqa: PLR2004
+    assert (
+        await suggestions.claim_suggestion_edit_flags("abc", "job_2")
+        == SuggestionEditFlags()
+    )
+
+
+async def test_flags_survive_until_the_edit_is_made(redis_client, patch_saq):
+    await suggestions.queue_suggestion_edit("abc", 1, as_resolved=True)
+    flags = await suggestions.claim_suggestion_edit_flags("abc", "job_1")
+    assert flags == SuggestionEditFlags(as_resolved=True)
+    # A retry of the same job still sees what it claimed
+    assert await suggestions.claim_suggestion_edit_flags("abc", "job_1") == flags
+
+    await suggestions.release_suggestion_edit_flags("abc", "job_1")
+    assert (
+        await suggestions.claim_suggestion_edit_flags("abc", "job_1")
+        == SuggestionEditFlags()
+    )
+
+
+async def test_failed_edits_hand_their_flags_back(redis_client, patch_saq, monkeypatch):
+    await suggestions.queue_suggestion_edit("abc", 1, as_resolved=True)
+
+    async def fail(*_, **__):
+        raise RuntimeError
+
+    monkeypatch.setattr(suggestions, "_edit_suggestion_message", fail)
+    with pytest.raises(RuntimeError):
+        await suggestions.edit_suggestion_message(
+            {"job": Mock(key="job_1", timeout=60)}, "abc", 1
+        )
+
+    # The next edit renders with the flags the failed one claimed
+    await suggestions.queue_suggestion_edit("abc", 1)
+    assert patch_saq.await_count == 2  # noqa: PLR2004
+    assert await suggestions.claim_suggestion_edit_flags(
+        "abc", "job_2"
+    ) == SuggestionEditFlags(as_resolved=True)
+
+
+def test_hot_suggestions_wait_longer():
+    assert suggestions.suggestion_edit_delay(1) == suggestions.EDIT_DELAY_COLD
+    assert suggestions.suggestion_edit_delay(3) == timedelta(seconds=3)
+    assert suggestions.suggestion_edit_delay(500) == suggestions.EDIT_DELAY_HOT
+
+
+@pytest.fixture
+def applied_changes(monkeypatch) -> list[utils.AutocompleteChange]:
+    applied: list[utils.AutocompleteChange] = []
+
+    async def apply_autocomplete_changes(changes):
+        applied.extend(changes)
+
+    monkeypatch.setattr(utils, "apply_autocomplete_changes", apply_autocomplete_changes)
+    return applied
+
+
+async def record_change(sid: str, *, present: bool) -> None:
+    await AutocompleteChanges(
+        guild_id=1,
+        sID=sid,
+        source=AutocompleteSourceEnum.Suggestion.value,
+        present=present,
+    ).save()
+
+
+async def test_only_the_latest_change_is_synced(redis_client, applied_changes):
+    await record_change("abc", present=True)
+    await record_change("def", present=True)
+    await record_change("abc", present=False)
+
+    consumed = await suggestions.sync_autocomplete_changes({"job": AsyncMock()})
+    assert consumed == 3  # noqa: PLR2004
+    assert {(c.suggestion_id, c.present) for c in applied_changes} == {
+        ("abc", False),
+        ("def", True),
+    }
+    assert await AutocompleteChanges.fetch_oldest(10) == []
+    assert await redis_client.get(SYNC_LOCK_KEY) is None
+
+
+async def test_sync_waits_for_the_running_sync(redis_client, applied_changes):
+    await record_change("abc", present=True)
+    await redis_client.set(SYNC_LOCK_KEY, "other")
+
+    assert await suggestions.sync_autocomplete_changes({"job": AsyncMock()}) == 0
+    assert applied_changes == []
+    assert len(await AutocompleteChanges.fetch_oldest(10)) == 1
+    # Someone elses lock is left for them to release
+    assert await redis_client.get(SYNC_LOCK_KEY) == b"other"
+
+
+async def test_autocomplete_entries_skip_cleared_suggestions():
+    guild_config = await configs.ensure_guild_config(1)
+    user_config = await configs.ensure_user_config(2)
+    created = []
+    for state in (
+        SuggestionStateEnum.PENDING,
+        SuggestionStateEnum.CLEARED,
+        SuggestionStateEnum.APPROVED,
+    ):
+        suggestion = Suggestions(
+            suggestion="Test",
+            guild_configuration=guild_config,
+            user_configuration=user_config,
+            state_raw=state.value,
+            author_display_name="Test",
+        )
+        await suggestion.save()
+        created.append(suggestion)
+
+    queued = QueuedSuggestions(
+        suggestion="Test",
+        guild_configuration=guild_config,
+        user_configuration=user_config,
+        author_display_name="Test",
+    )
+    await queued.save()
+
+    # A page size of one walks every page
+    entries = [
+        entry async for entry in suggestions._iterate_autocomplete_entries(page_size=1)
+    ]
+    suggestion_indexes = suggestions.AUTOCOMPLETE_INDEXES[
+        AutocompleteSourceEnum.Suggestion
+    ]
+    assert entries == [
+        (1, created[0].sID, suggestion_indexes),
+        (1, created[2].sID, suggestion_indexes),
+        (
+            1,
+            queued.sID,
+            suggestions.AUTOCOMPLETE_INDEXES[AutocompleteSourceEnum.Queued],
+        ),
+    ]
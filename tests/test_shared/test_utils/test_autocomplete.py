@@ -0,0 +1,153 @@
+import pytest
+from redis.client import Pipeline
+
+from shared.utils import autocomplete
+from shared.utils.autocomplete import AutocompleteChange, _CachedSids
+
+_SET_COMMANDS = {"FT.SUGADD": "SADD", "FT.SUGDEL": "SREM", "FT.SUGLEN": "SCARD"}
+
+
+@pytest.fixture
+def suggestion_sets(redis_client, monkeypatch):
+    """Stores suggestion dictionaries as sets as fakeredis has no FT commands."""
+    execute_command = Pipeline.execute_command
+
+    def as_set_command(self, command, *args, **kwargs):
+        if command in _SET_COMMANDS:
+            # Drop FT.SUGADD's score
+            args = args[:2]
+            command = _SET_COMMANDS[command]
+
+        return execute_command(self, command, *args, **kwargs)
+
+    monkeypatch.setattr(Pipeline, "execute_command", as_set_command)
+    # Entries held from other tests would answer instead of redis
+    autocomplete._PREFIX_CACHE.clear()
+
+    async def members(key: str) -> set[str]:
+        async with redis_client.pipeline() as pipe:
+            pipe.smembers(key)
+            (result,) = await pipe.execute()
+
+        return {member.decode() for member in result}
+
+    return members
+
+
+async def apply(*changes: AutocompleteChange) -> None:
+    await autocomplete.apply_autocomplete_changes(changes)
+
+
+def create_cached(*sids: str, complete: bool = True) -> _CachedSids:
+    return _CachedSids(sids=sorted(sids), complete=complete, loaded_at=0)
+
+
+def test_matching_prefix():
+    cached = create_cached("ab-cd", "ab-ef", "ac-01", "b1-23")
+    assert cached.matching("ab", 20) == ["ab-cd", "ab-ef"]
+    assert cached.matching("ab", 1) == ["ab-cd"]
+    assert cached.matching("", 20) == ["ab-cd", "ab-ef", "ac-01", "b1-23"]
+    assert cached.matching("zz", 20) == []
+
+
+def test_matching_incomplete_defers():
+    cached = create_cached("ab-cd", "ab-ef", complete=False)
+    # Other sIDs starting with ab may exist which aren't held
+    assert cached.matching("ab", 20) is None
+    assert cached.matching("ab", 2) == ["ab-cd", "ab-ef"]
+
+
+async def test_rebuild_replaces_drifted_indexes(redis_client, suggestion_sets):
+    await apply(
+        AutocompleteChange(1, "a", ("shared_sid_autocomplete_index",)),
+        AutocompleteChange(2, "x", ("queue_sid_autocomplete_index",)),
+    )
+
+    async def entries():
+        yield 1, "a", ("shared_sid_autocomplete_index",)
+        yield 1, "b", ("shared_sid_autocomplete_index",)
+
+    result = await autocomplete.rebuild_autocomplete_cache(entries(), batch_size=1)
+    assert result == autocomplete.AutocompleteRebuild(
+        written=2, drifted_keys=2, drifted_entries=2
+    )
+    assert await suggestion_sets("ac:1:shared_sid_autocomplete_index") == {"a", "b"}
+    # Guild 2 has nothing left to suggest
+    assert not await redis_client.exists("ac:2:queue_sid_autocomplete_index")
+    assert not await redis_client.exists(
+        autocomplete.REBUILD_RUNNING_KEY, autocomplete.REBUILD_JOURNAL_KEY
+    )
+
+
+async def test_rebuild_keeps_changes_made_while_it_runs(redis_client, suggestion_sets):
+    async def entries():
+        yield 1, "a", ("shared_sid_autocomplete_index",)
+        yield 1, "b", ("shared_sid_autocomplete_index",)
+        # Applied after a and b were read but before they were written
+        await apply(
+            AutocompleteChange(1, "a", ("shared_sid_autocomplete_index",), False),
+            AutocompleteChange(1, "c", ("shared_sid_autocomplete_index",)),
+            AutocompleteChange(3, "d", ("queue_sid_autocomplete_index",)),
+        )
+
+    result = await autocomplete.rebuild_autocomplete_cache(entries())
+    assert result.written == 2  # noqa: PLR2004
+    assert await suggestion_sets("ac:1:shared_sid_autocomplete_index") == {"b", "c"}
+    # Written to for the first time while the rebuild ran
+    assert await suggestion_sets("ac:3:queue_sid_autocomplete_index") == {"d"}
+
+    # Once finished changes aren't journaled anymore
+    await apply(AutocompleteChange(1, "e", ("shared_sid_autocomplete_index",)))
+    assert not await redis_client.exists(autocomplete.REBUILD_JOURNAL_KEY)
+
+
+async def test_changes_are_applied_in_batches(redis_client, suggestion_sets, monkeypatch):
+    pipelines = 0
+    pipeline = redis_client.pipeline
+
+    def count_pipelines(*args, **kwargs):
+        nonlocal pipelines
+        pipelines += 1
+        return pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(redis_client, "pipeline", count_pipelines)
+    indexes = ("shared_sid_autocomplete_index", "queue_sid_autocomplete_index")
+    await autocomplete.apply_autocomplete_changes(
+        [
+            AutocompleteChange(1, "a", indexes),
+            AutocompleteChange(1, "b", indexes),
+            AutocompleteChange(1, "c", indexes),
+            # In a later batch than the add it undoes
+            AutocompleteChange(1, "a", indexes, present=False),
+            AutocompleteChange(2, "d", indexes[:1]),
+        ],
+        batch_size=2,
+    )
+    assert pipelines == 3  # noqa: PLR2004
+    for index in indexes:
+        assert await suggestion_sets(f"ac:1:{index}") == {"b", "c"}
+    assert await suggestion_sets("ac:2:shared_sid_autocomplete_index") == {"d"}
+
+
+async def test_applying_changes_invalidates_the_prefix_cache(
+    redis_client, suggestion_sets
+):
+    for guild_id in (1, 2):
+        autocomplete._PREFIX_CACHE.set(
+            autocomplete._prefix_cache_key(guild_id, "shared_sid_autocomplete_index"),
+            create_cached("a"),
+        )
+
+    await apply(AutocompleteChange(1, "b", ("shared_sid_autocomplete_index",)))
+    assert (
+        autocomplete._PREFIX_CACHE.get(
+            autocomplete._prefix_cache_key(1, "shared_sid_autocomplete_index")
+        )
+        is None
+    )
+    assert (
+        autocomplete._PREFIX_CACHE.get(
+            autocomplete._prefix_cache_key(2, "shared_sid_autocomplete_index")
+        )
+        is not None
+    )
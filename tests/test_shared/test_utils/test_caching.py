@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from shared.utils.caching import LRUTimedCache
+
+
+def test_lru_eviction():
+    cache: LRUTimedCache[int, str] = LRUTimedCache(max_size=2, ttl=timedelta(minutes=1))
+    cache.set(1, "one")
+    cache.set(2, "two")
+    assert cache.get(1) == "one"
+
+    # 2 is now the least recently used
+    cache.set(3, "three")
+    assert 2 not in cache
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+    assert len(cache) == 2
+
+
+def test_ttl_expiry():
+    cache: LRUTimedCache[int, str] = LRUTimedCache(max_size=2, ttl=timedelta(seconds=5))
+    with freeze_time("2025-01-20 00:00:00") as frozen:
+        cache.set(1, "one")
+        assert cache.get(1) == "one"
+
+        frozen.tick(timedelta(seconds=6))
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+
+def test_stale_generation_is_not_stored():
+    cache: LRUTimedCache[int, str] = LRUTimedCache(max_size=2, ttl=timedelta(minutes=1))
+    generation = cache.generation
+    cache.delete(1)
+    cache.set(1, "stale", generation=generation)
+    assert 1 not in cache
+
+    cache.set(1, "fresh", generation=cache.generation)
+    assert cache.get(1) == "fresh"
+
+
+def test_other_keys_deletes_dont_discard_lookups():
+    cache: LRUTimedCache[int, str] = LRUTimedCache(max_size=2, ttl=timedelta(minutes=1))
+    generation = cache.generation
+    cache.delete(2)
+    cache.set(1, "one", generation=generation)
+    assert cache.get(1) == "one"
+
+    # Too many deletes to remember, anything from before them may be stale
+    generation = cache.generation
+    for key in range(3, 6):
+        cache.delete(key)
+    cache.set(6, "six", generation=generation)
+    assert 6 not in cache
+
+    generation = cache.generation
+    cache.clear()
+    cache.set(1, "one", generation=generation)
+    assert 1 not in cache
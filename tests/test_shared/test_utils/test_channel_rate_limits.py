@@ -0,0 +1,98 @@
+import heapq
+from collections import defaultdict
+
+import hikari
+from hikari.internal import routes
+
+from shared.utils import channel_rate_limits
+from shared.utils.channel_rate_limits import CHANNEL_EDIT_LIMIT, CHANNEL_EDIT_PERIOD
+
+START = 1_700_000_000.0
+PERIOD = CHANNEL_EDIT_PERIOD.total_seconds()
+
+
+def too_many_requests(
+    channel_id: int, retry_after: float
+) -> hikari.RateLimitTooLongError:
+    # What the edit rest client raises given its max_rate_limit
+    return hikari.RateLimitTooLongError(
+        route=routes.PATCH_CHANNEL_MESSAGE.compile(channel=channel_id, message=1),
+        is_global=False,
+        retry_after=retry_after,
+        max_retry_after=1,
+        reset_at=0,
+        limit=CHANNEL_EDIT_LIMIT,
+        period=PERIOD,
+    )
+
+
+class FakeDiscord:
+    """Enforces a per channel bucket on a simulated clock, 429ing when it's empty."""
+
+    def __init__(self) -> None:
+        self.now: float = START
+        self.edits: dict[int, list[float]] = defaultdict(list)
+        self.rate_limited: int = 0
+        self._buckets: dict[int, tuple[float, int]] = {}
+
+    async def edit_message(self, channel_id: int) -> None:
+        reset_at, used = self._buckets.get(channel_id, (0, 0))
+        if self.now >= reset_at:
+            reset_at, used = self.now + PERIOD, 0
+
+        if used >= CHANNEL_EDIT_LIMIT:
+            self.rate_limited += 1
+            raise too_many_requests(channel_id, reset_at - self.now)
+
+        self._buckets[channel_id] = (reset_at, used + 1)
+        self.edits[channel_id].append(self.now)
+
+
+async def simulate(
+    discord: FakeDiscord, edits: list[tuple[float, int]]
+) -> dict[int, list[float]]:
+    """Dispatch each (at, channel_id) edit, rescheduling any that are told to wait."""
+    pending = [
+        (START + at, index, channel_id) for index, (at, channel_id) in enumerate(edits)
+    ]
+    heapq.heapify(pending)
+    attempts = 0
+    while pending:
+        at, index, channel_id = heapq.heappop(pending)
+        attempts += 1
+        assert attempts < len(edits) * 10, "Edits never completed"
+        discord.now = at
+        wait = await channel_rate_limits.dispatch_channel_edit(
+            channel_id,
+            lambda channel_id=channel_id: discord.edit_message(channel_id),
+            now=at,
+        )
+        if wait > 0:
+            heapq.heappush(pending, (at + wait, index, channel_id))
+
+    return discord.edits
+
+
+async def test_hot_channels_dont_delay_cold_ones(redis_client):
+    discord = FakeDiscord()
+    edits = [(0.0, 1)] * 30 + [(0.1, 2)]
+    completed = await simulate(discord, edits)
+
+    assert len(completed[1]) == 30  # noqa: PLR2004
+    assert completed[2] == [START + 0.1]
+    # Never more than the limit inside any one period
+    for index in range(len(completed[1]) - CHANNEL_EDIT_LIMIT):
+        assert completed[1][index + CHANNEL_EDIT_LIMIT] - completed[1][index] >= PERIOD
+    assert discord.rate_limited == 0
+
+
+async def test_429s_block_the_channel_for_every_worker(redis_client):
+    discord = FakeDiscord()
+    # Another process used up the channel's bucket
+    discord.edits[1] = [START] * CHANNEL_EDIT_LIMIT
+    discord._buckets[1] = (START + PERIOD, CHANNEL_EDIT_LIMIT)
+
+    completed = await simulate(discord, [(1.0, 1), (1.5, 1)])
+    assert discord.rate_limited == 1
+    # The second edit waited on the block rather than hitting discord again
+    assert completed[1][CHANNEL_EDIT_LIMIT:] == [START + PERIOD] * 2
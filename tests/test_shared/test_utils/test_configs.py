@@ -0,0 +1,73 @@
+import asyncio
+
+import hikari
+
+from shared.tables import GuildConfigs, PremiumGuildConfigs, UserConfigs
+from shared.utils import configs
+
+
+async def test_ensure_guild_config_creates_once():
+    r_1 = await configs.ensure_guild_config(12345)
+    assert r_1.guild_id == 12345
+    assert r_1.premium.guild_id == 12345
+    assert await GuildConfigs.count() == 1
+    assert await PremiumGuildConfigs.count() == 1
+
+    configs.GUILD_CONFIG_CACHE.clear()
+    r_2 = await configs.ensure_guild_config(12345)
+    assert r_2.id == r_1.id
+    assert r_2.premium.id == r_1.premium.id
+    assert await GuildConfigs.count() == 1
+    assert await PremiumGuildConfigs.count() == 1
+
+
+async def test_cached_guild_config_is_a_copy():
+    r_1 = await configs.ensure_guild_config(12345)
+    r_1.blocked_users.append(1)
+
+    r_2 = await configs.ensure_guild_config(12345)
+    assert r_2.blocked_users == []
+
+
+async def test_save_invalidates_cached_guild_config(redis_client):
+    r_1 = await configs.ensure_guild_config(12345)
+    r_1.keep_logs = True
+    await r_1.save()
+    assert (await configs.ensure_guild_config(12345)).keep_logs is True
+
+    # Chaining off save still works and still invalidates
+    r_1.premium.cooldown_amount = 5
+    await r_1.premium.save().run()
+    assert (await configs.ensure_guild_config(12345)).premium.cooldown_amount == 5
+
+
+async def test_ensure_user_config_batches_concurrent_creates(redis_client):
+    r_1, r_2, r_3 = await asyncio.gather(
+        configs.ensure_user_config(1),
+        configs.ensure_user_config(2, locale=hikari.Locale.DE),
+        configs.ensure_user_config(1),
+    )
+    assert r_1.id == r_3.id
+    assert r_2.primary_language == hikari.Locale.DE
+    assert await UserConfigs.count() == 2
+
+
+async def test_ensure_user_config_falls_back_to_redis(redis_client):
+    r_1 = await configs.ensure_user_config(12345)
+    assert await redis_client.hgetall("user_config:12345")
+
+    configs.USER_CONFIG_CACHE.clear()
+    r_2 = await configs.ensure_user_config(12345)
+    assert r_2.id == r_1.id
+    assert r_2.created_at == r_1.created_at
+    assert r_2.primary_language == hikari.Locale.EN_GB
+
+
+async def test_save_writes_through_user_config(redis_client):
+    r_1 = await configs.ensure_user_config(12345)
+    r_1.ping_on_thread_creation = False
+    await r_1.save()
+    assert (await configs.ensure_user_config(12345)).ping_on_thread_creation is False
+
+    configs.USER_CONFIG_CACHE.clear()
+    assert (await configs.ensure_user_config(12345)).ping_on_thread_creation is False
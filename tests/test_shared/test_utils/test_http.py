@@ -0,0 +1,12 @@
+from shared.utils import http
+
+
+async def test_clients_are_shared_until_closed():
+    client = http.get_http_client("ntfy")
+    assert http.get_http_client("ntfy") is client
+    assert http.get_http_client("avatars") is not client
+
+    await http.close_http_clients()
+    assert client.is_closed
+    assert http.get_http_client("ntfy") is not client
+    await http.close_http_clients()
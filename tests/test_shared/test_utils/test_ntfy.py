@@ -0,0 +1,121 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+
+from shared.utils import http, ntfy
+
+
+@pytest.fixture(scope="function")
+async def ntfy_server(monkeypatch) -> list[dict]:
+    """A stand in for ntfy which records every notification."""
+    received: list[dict] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        received.append(orjson.loads(request.content))
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    monkeypatch.setattr(ntfy, "NTFY_URL", "http://ntfy.test/")
+    monkeypatch.setattr(http, "get_http_client", lambda _: client)
+    yield received
+    await client.aclose()
+
+
+def create_notifier(max_pending: int = 100) -> ntfy.NtfyNotifier:
+    return ntfy.NtfyNotifier(
+        flush_interval=timedelta(minutes=1),
+        dedupe_window=timedelta(minutes=5),
+        max_pending=max_pending,
+    )
+
+
+def create_error(error_name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        error_name=error_name,
+        command_name="/suggest",
+        url="https://dashboard.suggestions.gg/errors/abc",
+    )
+
+
+async def test_duplicates_become_a_digest(ntfy_server):
+    notifier = create_notifier()
+    for _ in range(3):
+        notifier.add(title="Unknown Error", message="Boom")
+
+    await notifier.flush()
+    assert notifier.failed == 0
+    assert len(ntfy_server) == 1
+    assert ntfy_server[0]["message"].endswith("Seen 3 times in the last 0:05:00")
+
+    # Still inside the window so these wait for a digest
+    notifier.add(title="Unknown Error", message="Boom")
+    notifier.add(title="Unknown Error", message="Boom")
+    await notifier.flush()
+    assert len(ntfy_server) == 1
+
+    await notifier.flush(ignore_window=True)
+    assert len(ntfy_server) == 2  # noqa: PLR2004
+    assert ntfy_server[1]["message"].endswith("Seen 2 times in the last 0:05:00")
+
+
+async def test_dedupe_key_includes_error(ntfy_server):
+    notifier = create_notifier()
+    notifier.add(
+        title="Unknown Error",
+        message="Boom",
+        internal_error_reference=create_error("ValueError"),
+    )
+    notifier.add(
+        title="Unknown Error",
+        message="Boom",
+        internal_error_reference=create_error("KeyError"),
+    )
+    await notifier.flush()
+    assert notifier.failed == 0
+    assert [n["message"] for n in ntfy_server] == ["Boom", "Boom"]
+
+
+async def test_queue_is_bounded(ntfy_server):
+    notifier = create_notifier(max_pending=2)
+    assert notifier.add(title="One", message="1")
+    assert notifier.add(title="Two", message="2")
+    assert not notifier.add(title="Three", message="3")
+    # Duplicates of something already queued still count
+    assert notifier.add(title="One", message="1")
+    assert notifier.dropped == 1
+
+    await notifier.flush()
+    assert notifier.failed == 0
+    assert [n["Title"] for n in ntfy_server] == ["One", "Two"]
+
+
+async def test_notify_does_not_wait_on_ntfy(ntfy_server, monkeypatch):
+    notifier = create_notifier()
+    monkeypatch.setattr(ntfy, "NTFY_NOTIFIER", notifier)
+    notifier.start()
+
+    await ntfy.notify_ethan_of_something(title="Queued", message="Later")
+    assert ntfy_server == []
+    assert len(notifier) == 1
+
+    await notifier.stop()
+    assert notifier.failed == 0
+    assert [n["Title"] for n in ntfy_server] == ["Queued"]
+
+
+@pytest.mark.parametrize("status", [429, 500])
+async def test_failed_sends_are_counted(monkeypatch, status):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda _: httpx.Response(status))
+    )
+    monkeypatch.setattr(ntfy, "NTFY_URL", "http://ntfy.test/")
+    monkeypatch.setattr(http, "get_http_client", lambda _: client)
+    notifier = create_notifier()
+    notifier.add(title="Unknown Error", message="Boom")
+    notifier.add(title="Other Error", message="Boom")
+    await notifier.flush()
+    assert notifier.failed == 2  # noqa: PLR2004
+    assert len(notifier) == 0
@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from shared.utils import (
+    acquire_lock,
+    apply_cluster_guild_changes,
+    get_accurate_guild_count,
+    publish_cluster_guilds,
+    holds_lock,
+    release_lock,
+)
+
+
+async def test_guild_count_sums_clusters(redis_client):
+    assert await get_accurate_guild_count() == 0
+
+    await publish_cluster_guilds(1, [1, 2, 3])
+    await publish_cluster_guilds(2, [4, 5])
+    assert await get_accurate_guild_count() == 5
+
+    # Republishing replaces rather than adds to a clusters count
+    await publish_cluster_guilds(2, [4])
+    assert await get_accurate_guild_count() == 4
+
+
+async def test_guild_count_ignores_stale_clusters(redis_client):
+    with freeze_time("2025-01-20 00:00:00") as frozen:
+        await publish_cluster_guilds(1, [1, 2, 3])
+        frozen.tick(timedelta(minutes=20))
+        await publish_cluster_guilds(2, [4, 5])
+        frozen.tick(timedelta(minutes=15))
+        assert await get_accurate_guild_count() == 2
+
+
+async def test_apply_cluster_guild_changes(redis_client):
+    await publish_cluster_guilds(1, [1, 2])
+    await apply_cluster_guild_changes(1, {2: False, 3: True}, 2)
+    assert await get_accurate_guild_count() == 2
+    assert await redis_client.get("bot:guilds:is_in:2") is None
+    assert await redis_client.get("bot:guilds:is_in:3") == b"3"
+
+
+async def test_locks_are_only_released_by_their_holder(redis_client):
+    token = await acquire_lock("lock", timedelta(minutes=1))
+    assert token is not None
+    assert await acquire_lock("lock", timedelta(minutes=1)) is None
+
+    # Pretend ours expired and someone else took it
+    await redis_client.set("lock", "other")
+    assert not await holds_lock("lock", token)
+    assert not await release_lock("lock", token)
+    assert await redis_client.get("lock") == b"other"
+
+    await redis_client.delete("lock")
+    token = await acquire_lock("lock", timedelta(minutes=1))
+    assert await holds_lock("lock", token)
+    assert await release_lock("lock", token)
+    assert await redis_client.get("lock") is None
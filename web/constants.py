@@ -199,6 +199,9 @@ BOT_USER_ID = (
 BOT_TOKEN = get_secret("BOT_TOKEN", infisical_client)
 BOT_INVITE_URL = f"https://discord.com/oauth2/authorize?client_id={BOT_USER_ID}&permissions=395137379328&integration_type=0&scope=bot+applications.commands"
 DISCORD_REST_CLIENT = hikari.RESTApp()
+# Suggestion edits reschedule themselves when a channel is rate limited
+# so this client raises rather than sleeping on long limits in place
+DISCORD_EDIT_REST_CLIENT = hikari.RESTApp(max_rate_limit=1)
 
 # CloudFlare R2
 CF_R2_ACCESS_KEY = get_secret("CF_R2_ACCESS_KEY", infisical_client)
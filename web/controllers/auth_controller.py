@@ -16,6 +16,7 @@ from piccolo_api.mfa.authenticator.tables import AuthenticatorSecret
 from piccolo_api.session_auth.tables import SessionsBase
 from tenacity import retry, stop_after_attempt, wait_random, retry_if_not_exception_type
 
+from shared.utils import http
 from web import constants
 from web.middleware import EnsureAuth
 from web.tables import MagicLinks, Users, AuthenticationAttempts, OAuthEntry
@@ -94,30 +95,29 @@ class AuthController(Controller):
             data["remoteip"] = user_ip
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp: httpx.Response = await client.post(
-                    "https://challenges.cloudflare.com/turnstile/v0/siteverify",
-                    json=data,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                if (
-                    data["hostname"] not in constants.SERVING_DOMAIN
-                    and constants.IS_PRODUCTION
-                ):
-                    log.warning(
-                        "Someone found a way to get CF tokens from %s on ip %s",
-                        data["hostname"],
-                        user_ip,
-                    )
-                    return False
-
-                log.debug(
-                    "Cloudflare Turnstile response for IP %s",
+            resp: httpx.Response = await http.get_http_client("turnstile").post(
+                "https://challenges.cloudflare.com/turnstile/v0/siteverify",
+                json=data,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            if (
+                data["hostname"] not in constants.SERVING_DOMAIN
+                and constants.IS_PRODUCTION
+            ):
+                log.warning(
+                    "Someone found a way to get CF tokens from %s on ip %s",
+                    data["hostname"],
                     user_ip,
-                    extra={"CF_data": data},
                 )
-                return data["success"]
+                return False
+
+            log.debug(
+                "Cloudflare Turnstile response for IP %s",
+                user_ip,
+                extra={"CF_data": data},
+            )
+            return data["success"]
         except (httpx.HTTPError, KeyError) as e:
             log.error(
                 "Cloudflare Turnstile broke",
@@ -1,10 +1,13 @@
 import logging
 import secrets
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from datetime import timedelta
 from typing import Annotated, Any, cast
 
 import commons
 import hikari
+import httpx
 import orjson
 from httpx_oauth.clients.discord import DiscordOAuth2
 from httpx_oauth.exceptions import GetProfileError
@@ -14,6 +17,7 @@ from litestar.params import Parameter, Body
 from litestar.response import Template, Redirect
 from pydantic import BaseModel, Field, model_validator
 
+from shared.utils import http
 from web import constants
 from web.controllers import AuthController
 from web.middleware import EnsureAuth
@@ -27,6 +31,11 @@ CACHE_TYPES = bool | dict | int | list
 
 # noinspection PyMethodMayBeStatic
 class DiscordOAuth(DiscordOAuth2):
+    @asynccontextmanager
+    async def get_httpx_client(self) -> AsyncGenerator[httpx.AsyncClient]:
+        # Reuse pooled connections rather than a new client per request
+        yield http.get_http_client("discord_oauth")
+
     async def cache_set(
         self,
         cache_key: str,